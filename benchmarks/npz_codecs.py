@@ -0,0 +1,99 @@
+"""Compare npz codecs for FMesh storage: write time, read time and file size.
+
+Usage::
+
+    python benchmarks/npz_codecs.py [meshtal or npz files...]
+
+By default the meshes from tests/data are used.
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+import numpy as np
+
+from mckit_meshes.fmesh import FMesh, read_meshtal
+from mckit_meshes.utils import ignore_existing_file_strategy
+from mckit_meshes.utils.npz import NpzCodec
+
+DATA = Path(__file__).parents[1] / "tests" / "data"
+
+VARIANTS = [
+    (NpzCodec.none, None, np.float64),
+    (NpzCodec.zlib, 1, np.float64),
+    (NpzCodec.zlib, 6, np.float64),
+    (NpzCodec.zlib, 9, np.float64),
+    (NpzCodec.zlib, 6, np.float32),
+    (NpzCodec.zlib, 6, np.float16),
+    (NpzCodec.bz2, 9, np.float64),
+    (NpzCodec.lzma, None, np.float64),
+    (NpzCodec.zstd, 3, np.float64),
+    (NpzCodec.zstd, 3, np.float32),
+    (NpzCodec.zstd, 19, np.float64),
+]
+
+REPEAT = 5
+
+
+def load_meshes(paths: list[Path]) -> list[FMesh]:
+    meshes = []
+    for path in paths:
+        if path.suffix == ".m":
+            with path.open() as fid:
+                meshes.extend(read_meshtal(fid))
+        else:
+            meshes.append(FMesh.load(path))
+    return meshes
+
+
+def best_time(func) -> float:
+    result = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        result = min(result, time.perf_counter() - start)
+    return result
+
+
+def main() -> None:
+    paths = [Path(p) for p in sys.argv[1:]] or sorted(DATA.glob("*.m"))
+    meshes = load_meshes(paths)
+    print(f"{len(meshes)} meshes, {sum(m.data.size for m in meshes)} values")
+    print(f"{'codec':>6} {'level':>5} {'errors':>8}", end="")
+    print(f" {'write, ms':>10} {'read, ms':>9} {'size, KiB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for codec, level, errors_dtype in VARIANTS:
+            if not codec.is_available:
+                continue
+            files = [Path(tmp, f"{i}.npz") for i in range(len(meshes))]
+
+            def write(files=files, codec=codec, level=level, errors_dtype=errors_dtype):
+                for mesh, path in zip(meshes, files, strict=True):
+                    mesh.save_2_npz(
+                        path,
+                        ignore_existing_file_strategy,
+                        codec=codec,
+                        level=level,
+                        errors_dtype=errors_dtype,
+                    )
+
+            def read(files=files):
+                for path in files:
+                    FMesh.load_npz(path)
+
+            write_time = best_time(write)
+            read_time = best_time(read)
+            size = sum(p.stat().st_size for p in files)
+            print(
+                f"{codec.name:>6} {level or '-':>5} {np.dtype(errors_dtype).name:>8}"
+                f" {1e3 * write_time:10.1f} {1e3 * read_time:9.1f} {size / 1024:10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
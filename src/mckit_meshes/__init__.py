@@ -5,6 +5,7 @@ from __future__ import annotations
 from mckit_meshes.fmesh import FMesh, read_meshtal
 from mckit_meshes.m_file_iterator import m_file_iterator
 from mckit_meshes.mesh.geometry_spec import CartesianGeometrySpec, CylinderGeometrySpec
+from mckit_meshes.meshtal_index import MeshtalIndex, index_meshtal
 from mckit_meshes.particle_kind import ParticleKind
 from mckit_meshes.version import __version__
 from mckit_meshes.wgtmesh import WgtMesh, make_geometry_spec
@@ -13,9 +14,11 @@ __all__ = [
     "CartesianGeometrySpec",
     "CylinderGeometrySpec",
     "FMesh",
+    "MeshtalIndex",
     "ParticleKind",
     "WgtMesh",
     "__version__",
+    "index_meshtal",
     "m_file_iterator",
     "make_geometry_spec",
     "read_meshtal",
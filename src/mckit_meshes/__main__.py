@@ -24,6 +24,7 @@ from mckit_meshes.cli.merge_weights import merge_weights as do_merge_weights
 from mckit_meshes.cli.mesh2npz import mesh2npz as do_mesh2npz
 from mckit_meshes.cli.mesh2wgt import mesh2wgt as do_mesh2wgt
 from mckit_meshes.cli.normalize_weights import normalize_weights as do_normalize_weights
+from mckit_meshes.cli.npz2chunked import npz2chunked as do_npz2chunked
 from mckit_meshes.cli.npz2vtk import npz2vtk as do_npz2vtk
 from mckit_meshes.cli.split_mesh_file import split as do_split
 from mckit_meshes.cli.wgt_drop_ebins import wgt_drop_ebins as do_wgt_drop_ebins
@@ -57,7 +58,13 @@ class Common:
 
 
 @app.command
-def mesh2npz(*mesh_tallies: types.ResolvedExistingFile, common: Common | None = None) -> None:
+def mesh2npz(
+    *mesh_tallies: types.ResolvedExistingFile,
+    tally: Annotated[list[int] | None, Parameter(name=["--tally", "-t"])] = None,
+    jobs: Annotated[int, Parameter(name=["--jobs", "-j"])] = 1,
+    uncompressed: bool = False,
+    common: Common | None = None,
+) -> None:
     """Convert mesh files to npz files.
 
     By default output folder (prefix) is "npz".
@@ -67,22 +74,35 @@ def mesh2npz(*mesh_tallies: types.ResolvedExistingFile, common: Common | None =
     ----------
     mesh_tallies
         mesh tally files to process (default: *.m)
+    tally
+        mesh tally numbers to convert (default: all)
+    jobs
+        number of processes to convert the tallies in parallel, 0 - use all CPUs (default: 1)
+    uncompressed
+        save to .fmesh directories with .npy files, which can be loaded lazily as memory maps
     """
     if common is None:
         common = Common(prefix=Path("npz"))
     if common.prefix is None:
         common.prefix = Path("npz")
-    do_mesh2npz(*mesh_tallies, prefix=common.prefix, override=common.override)
+    do_mesh2npz(
+        *mesh_tallies,
+        prefix=common.prefix,
+        override=common.override,
+        tallies=tally,
+        jobs=jobs,
+        uncompressed=uncompressed,
+    )
 
 
 @app.command
-def npz2vtk(*npz_files: types.ResolvedExistingFile, common: Common | None = None) -> None:
+def npz2vtk(*npz_files: types.ResolvedExistingPath, common: Common | None = None) -> None:
     """Convert npz files to VTK files.
 
     Parameters
     ----------
     npz_files
-        .npz files with compressed meshes
+        .npz files with compressed meshes, .fmesh or .chunks directories
     """
     if common is None:
         common = Common(prefix=Path("vtk"))
@@ -92,9 +112,31 @@ def npz2vtk(*npz_files: types.ResolvedExistingFile, common: Common | None = None
 
 
 @app.command
-def add(
+def npz2chunked(
     *npz_files: types.ResolvedExistingFile,
-    out: Annotated[types.ResolvedFile | None, Parameter(name=["--out", "-o"])] = None,
+    chunks: Annotated[tuple[int, int, int, int], Parameter(name=["--chunks"])] = (1, 64, 64, 64),
+    common: Common | None = None,
+) -> None:
+    """Convert npz files to chunked storage to read parts of meshes without full loading.
+
+    Parameters
+    ----------
+    npz_files
+        .npz files with compressed meshes
+    chunks
+        chunk shape over energy, i, j and k bins
+    """
+    if common is None:
+        common = Common(prefix=Path("chunks"))
+    if common.prefix is None:
+        common.prefix = Path("chunks")
+    do_npz2chunked(*npz_files, prefix=common.prefix, chunks=chunks, override=common.override)
+
+
+@app.command
+def add(
+    *npz_files: types.ResolvedExistingPath,
+    out: Annotated[types.ResolvedPath | None, Parameter(name=["--out", "-o"])] = None,
     comment: Annotated[str | None, Parameter(name=["--comment", "-c"])] = None,
     number: Annotated[int, Parameter(name=["--number", "-n"])] = 1,
     common: Common | None = None,
@@ -106,7 +148,8 @@ def add(
     out
         output file for created meshtally,
         if not specified, then it's constructed
-        from the input files stems
+        from the input files stems,
+        use suffix ".fmesh" to save uncompressed .npy directory
     comment, optional
         comment for meshtally, default the comment from the first mesh
     number, optional
@@ -135,7 +178,7 @@ def split(meshtally_file: types.ResolvedExistingFile, *, common: Common | None =
 def invwgt(
     wgtfile: types.ResolvedExistingPath,
     *,
-    out: Annotated[types.ResolvedFile | None, Parameter(name=["--out", "-o"])] = None,
+    out: Annotated[types.ResolvedPath | None, Parameter(name=["--out", "-o"])] = None,
     normalization_point: Annotated[
         str, Parameter(name=["--normalization-point", "-n"])
     ] = "610, 0, 57",
@@ -156,14 +199,15 @@ def invwgt(
     Parameters
     ----------
     out
-        output file, default - computed from input file name and saved in current directory
+        output file, default - computed from input file name and saved in current directory,
+        use suffix ".npz" or ".wgtmesh" to save in binary format
     normalization_point
         Point where to set weight to `normalization_value`
         (default ITER magnetic axis intersection with PY=0: "610, 0, 57")
     normalization_value
         value to be at `normalization point`
     wgtfile
-        Weights file to invert
+        Weights file to invert: WWINP, npz file or .wgtmesh directory
     """
     if common is None:
         common = Common()
@@ -178,9 +222,10 @@ def invwgt(
 
 @app.command
 def merge_weights(
-    *wwinp_files: types.ResolvedExistingFile,
+    *wwinp_files: types.ResolvedExistingPath,
     out: Path,
     merge_spec: Path,
+    jobs: Annotated[int, Parameter(name=["--jobs", "-j"])] = 1,
     common: Common | None = None,
 ) -> None:
     """Merge MCNP weight window meshes.
@@ -188,15 +233,20 @@ def merge_weights(
     Parameters
     ----------
     wwin_files
-        weight files to merge
+        weight files to merge: WWINP, npz files or .wgtmesh directories
     out
-        An output file for merge result
+        An output file for merge result,
+        use suffix ".npz" or ".wgtmesh" to save in binary format
     merge_spec
         A merge specification file
+    jobs
+        number of processes to load the files in parallel, 0 - use all CPUs (default: 1)
     """
     if common is None:
         common = Common()
-    do_merge_weights(*wwinp_files, out=out, merge_spec=merge_spec, override=common.override)
+    do_merge_weights(
+        *wwinp_files, out=out, merge_spec=merge_spec, override=common.override, jobs=jobs
+    )
 
 
 @app.command
@@ -204,10 +254,10 @@ def mesh2wgt(
     mesh_file: types.ResolvedExistingFile,
     *,
     out: Annotated[
-        types.ResolvedFile | None,
+        types.ResolvedPath | None,
         Parameter(
             name=["--out", "-o"],
-            help="Output file"
+            help="Output file, use suffix .npz or .wgtmesh to save in binary format"
             "[default - compute from mesh_file name and store in current directory]",
         ),
     ] = None,
@@ -250,7 +300,7 @@ def mesh2wgt(
 @app.command
 def normalize_weights(
     weight_file: types.ResolvedExistingPath,
-    out: Annotated[types.ResolvedFile | None, Parameter(name=["--out", "-o"])] = None,
+    out: Annotated[types.ResolvedPath | None, Parameter(name=["--out", "-o"])] = None,
     normalization_point: str = "610, 0, 57",
     normalization_value: float = 1 / 3,
     energy_bin: int = 1,
@@ -261,9 +311,9 @@ def normalize_weights(
     Parameters
     ----------
     weight_file
-        weights file
+        weights file: WWINP, npz file or .wgtmesh directory
     out
-        output file, optional
+        output file, optional, use suffix ".npz" or ".wgtmesh" to save in binary format
     normalization_point, optional
         coordinates to normalize the weights at, by default "610, 0, 57"
     normalization_value, optional
@@ -298,9 +348,9 @@ def wgt_drop_ebins(
     Parameters
     ----------
     wgtfile
-        input weights file
+        input weights file: WWINP, npz file or .wgtmesh directory
     output
-        output weights file
+        output weights file, use suffix ".npz" or ".wgtmesh" to save in binary format
     min_energy
         Min energy upper boundary.
     part
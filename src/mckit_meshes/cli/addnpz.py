@@ -35,14 +35,14 @@ def add(
     Parameters
     ----------
     out
-        output file
+        output file, if the suffix is ".fmesh", then the mesh is saved as .npy directory
     comment
         comment for a new fmesh npz file,
         if not provided, then the comment from the first mesh is used
     number
         ... to assign to resulting mesh
     npz_files
-        files to process, optional
+        npz files or .npy directories (see :py:meth:`FMesh.save_2_npy_dir`) to process, optional
     override
         define behaviour when output file, exists, default - rise FileExistsError.
     """
@@ -64,12 +64,13 @@ def add(
         tot_errors = None
         for npz in npz_files:
             with start_action(action_type="adding mesh", mesh=npz):
-                mesh = fmesh.FMesh.load_npz(npz)
+                # the values are read after the geometry check
+                mesh = fmesh.FMesh.load(npz, lazy=True)
                 if _sum is None:
                     _sum = mesh
-                    data = _sum.data
+                    data = np.array(_sum.data)  # the loaded arrays can be read only memory maps
                     errors = np.power(_sum.errors * _sum.data, 2)
-                    totals = _sum.totals
+                    totals = None if _sum.totals is None else np.array(_sum.totals)
                     if totals is not None and _sum.totals_err is not None:
                         tot_errors = np.power(_sum.totals_err * _sum.totals, 2)
                 else:
@@ -104,7 +105,7 @@ def add(
         )
 
         with start_action(action_type="save mesh") as logger:
-            new_mesh.save_2_npz(
+            new_mesh.save(
                 out,
                 check_existing_file_strategy=file_exists_strategy,
             )
@@ -8,15 +8,16 @@ import numpy as np
 
 from eliot import start_action
 
-from mckit_meshes.wgtmesh import WgtMesh
+from mckit_meshes.utils import ignore_existing_file_strategy
+from mckit_meshes.wwinp_cache import load_wwinp
 
 if TYPE_CHECKING:
-    from mckit_meshes.wgtmesh import Point
+    from mckit_meshes.wgtmesh import Point, WgtMesh
 
 
 def load(path: Path) -> WgtMesh:
-    with start_action(action_type="load weights", input=path), path.open("r") as fid:
-        return WgtMesh.read(fid)
+    with start_action(action_type="load weights", input=path):
+        return load_wwinp(path)
 
 
 def invert(mesh: WgtMesh, normalization_point: Point, normalization_value=1.0) -> WgtMesh:
@@ -36,8 +37,7 @@ def check_output_exists(path: Path, *, override: bool) -> Path:
 
 
 def save(mesh: WgtMesh, path: Path) -> None:
-    with path.open("wt") as stream:
-        mesh.write(stream)
+    mesh.save(path, ignore_existing_file_strategy)
 
 
 def invwgt(
@@ -3,15 +3,28 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 import logging
+import os
+import time
 
-from mckit_meshes.wgtmesh import MergeSpec, WgtMesh
+from collections import deque
+from functools import partial
+from multiprocessing import Pool
+
+from mckit_meshes.utils import ignore_existing_file_strategy
+from mckit_meshes.wgtmesh import MergeSpec, WeightsMerger, WgtMesh
+from mckit_meshes.wwinp_cache import WwinpCache, load_wwinp
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Mapping
+    from collections.abc import Iterable, Iterator, Mapping
+    from multiprocessing.pool import AsyncResult
     from pathlib import Path
 
 __LOG = logging.getLogger("mckit_meshes.merge_weights")
 
+_ENCODING = "cp1251"
+
+_load = partial(load_wwinp, encoding=_ENCODING)
+
 
 def load_merge_descriptor(merge_descriptor_file: Path) -> Mapping[str, int]:
     def convert(line: str) -> tuple[str, int]:
@@ -30,17 +43,86 @@ def load_merge_descriptor(merge_descriptor_file: Path) -> Mapping[str, int]:
 
 
 def create_working_merge_spec(
-    merge_descriptor: Mapping[str, int], wgt_mesh_files: Iterable[Path]
-) -> Iterable[MergeSpec]:
-    def make_merge_spec(wgt_mesh_file: Path) -> MergeSpec:
-        with wgt_mesh_file.open("rt", encoding="cp1251") as io:
-            wgt_mesh: WgtMesh = WgtMesh.read(io)
-            __LOG.info(f"Loaded weight mesh from {wgt_mesh_file}")
-        _id = wgt_mesh_file.stem
-        _nps = merge_descriptor[_id]
-        return MergeSpec(wgt_mesh, _nps)
+    merge_descriptor: Mapping[str, int], wgt_mesh_files: Iterable[Path], jobs: int = 1
+) -> Iterator[MergeSpec]:
+    """Load weight meshes lazily, one by one, in the order of `wgt_mesh_files`.
 
-    return map(make_merge_spec, wgt_mesh_files)
+    On parallel loading at most one task per process is outstanding, so only
+    a few loaded meshes are waiting for merging, however fast the loading is.
+    The meshes stored in binary format and the WWINP files found in the cache
+    are loaded in the calling process as memory maps. If the cache is configured,
+    the processes store the parsed meshes in the cache instead of sending them back.
+
+    Parameters
+    ----------
+    merge_descriptor
+        weighting factors by file stems
+    wgt_mesh_files
+        files to load
+    jobs
+        number of processes to load the files in parallel, 0 - use all CPUs
+
+    Yields
+    ------
+    The loaded meshes with weighting factors.
+    """
+    files = list(wgt_mesh_files)
+    processes = min(jobs or os.cpu_count() or 1, len(files))
+    if processes <= 1:
+        meshes: Iterable[WgtMesh] = map(_load, files)
+        yield from _make_merge_specs(merge_descriptor, files, meshes)
+        return
+    __LOG.info("Loading %d weight meshes with %d processes", len(files), processes)
+    cache = WwinpCache.from_env()
+    with Pool(processes=processes) as pool:
+        window: deque[tuple[Path, AsyncResult[WgtMesh | None] | None]] = deque()
+        outstanding = 0
+
+        def next_mesh() -> WgtMesh:
+            nonlocal outstanding
+            path, task = window.popleft()
+            if task is None:
+                return _load(path)
+            outstanding -= 1
+            mesh = task.get()
+            return _load(path) if mesh is None else mesh
+
+        def iter_meshes() -> Iterator[WgtMesh]:
+            nonlocal outstanding
+            for path in files:
+                if WgtMesh.is_binary_storage(path) or (cache is not None and cache.contains(path)):
+                    window.append((path, None))
+                    continue
+                while outstanding >= processes:
+                    yield next_mesh()
+                window.append((path, pool.apply_async(_parse, (path,))))
+                outstanding += 1
+            while window:
+                yield next_mesh()
+
+        yield from _make_merge_specs(merge_descriptor, files, iter_meshes())
+
+
+def _parse(path: Path) -> WgtMesh | None:
+    """Parse a WWINP file in a worker process.
+
+    Returns
+    -------
+    The mesh or None, if it's stored in the cache.
+    """
+    cache = WwinpCache.from_env()
+    if cache is None:
+        return _load(path)
+    cache.load(path, _ENCODING)
+    return None
+
+
+def _make_merge_specs(
+    merge_descriptor: Mapping[str, int], files: list[Path], meshes: Iterable[WgtMesh]
+) -> Iterator[MergeSpec]:
+    for wgt_mesh_file, wgt_mesh in zip(files, meshes, strict=True):
+        __LOG.info(f"Loaded weight mesh from {wgt_mesh_file}")
+        yield MergeSpec(wgt_mesh, merge_descriptor[wgt_mesh_file.stem])
 
 
 def check_merge_descriptor_is_complete(
@@ -57,6 +139,7 @@ def merge_weights(
     out: Path,
     merge_spec: Path,
     override: bool = False,
+    jobs: int = 1,
 ) -> None:
     """Merge MCNP weight window meshes.
 
@@ -65,11 +148,13 @@ def merge_weights(
     wwinp_files
         files to merge
     out
-        file to save the merge result
+        file to save the merge result, see :py:meth:`WgtMesh.save` on output formats
     merge_spec
         file with merge specification
     override
         ignore if output files already exist
+    jobs
+        number of processes to load the files in parallel, 0 - use all CPUs
 
     Algorithm
     ---------
@@ -92,18 +177,33 @@ def merge_weights(
     a specification file, which contains pairs of basename of files and factors.
     The specification file may contain comment lines and trailing comments
     starting with '#'. The empty lines are ignored.
+
+    The meshes are added to the merge result as soon as they are loaded,
+    so only a few meshes are kept in memory at a time.
     """
     if out.exists() and not override:
         raise ValueError(f"File {out} already exists. Remove it or use --override option.")
     files = list(wwinp_files)
     merge_descriptor = load_merge_descriptor(merge_spec)
     check_merge_descriptor_is_complete(merge_descriptor, files)
-    merge_spec_list = list(create_working_merge_spec(merge_descriptor, files))
-    result = WgtMesh.merge(*merge_spec_list)
-    out.parent.mkdir(parents=True, exist_ok=True)
-    with out.open("wt") as io:
-        result.wm.write(io)
-        __LOG.info(f"Merged weight file is saved to {out}")
+    start = time.perf_counter()
+    merger = WeightsMerger()
+    voxels = 0
+    for wm, nps in create_working_merge_spec(merge_descriptor, files, jobs):
+        merger.add(wm, nps)
+        voxels += sum(w.size for w in wm.weights)
+    result = merger.result()
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    __LOG.info(
+        "Merged %d files, %d voxels in %.2f s: %.2f files/s, %.3g voxels/s",
+        merger.count,
+        voxels,
+        elapsed,
+        merger.count / elapsed,
+        voxels / elapsed,
+    )
+    result.wm.save(out, ignore_existing_file_strategy)
+    __LOG.info(f"Merged weight file is saved to {out}")
     spec_file = out.with_suffix(".merge_spec.csv")
     with spec_file.open("wt") as io:
         print(f"{out.stem} {result.nps}", file=io)
@@ -3,14 +3,20 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from logging import FileHandler, getLogger
 from pathlib import Path
 
 from eliot import start_action
 
 from mckit_meshes import fmesh
+from mckit_meshes.meshtal_index import index_meshtal
 from mckit_meshes.utils import get_override_strategy, revise_files
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
 __LOG = getLogger("mckit_meshes.fmesh")
 
 
@@ -18,20 +24,66 @@ def mesh2npz(
     *mesh_tallies: Path,
     prefix: Path,
     override: bool = False,
+    tallies: Sequence[int] | None = None,
+    jobs: int = 1,
+    uncompressed: bool = False,
 ) -> None:
-    """Convert MCNP meshtal file to a number of npz files, one for each mesh tally."""
+    """Convert MCNP meshtal file to a number of npz files, one for each mesh tally.
+
+    Parameters
+    ----------
+    mesh_tallies
+        meshtal files to convert
+    prefix
+        output folder
+    override
+        override existing output files
+    tallies
+        convert only these mesh tallies, default - all
+    jobs
+        number of processes to convert tallies of all the files in parallel,
+        0 - use all CPUs
+    uncompressed
+        save meshes to .npy directories, which can be loaded lazily as memory maps
+    """
     __LOG.addHandler(FileHandler("meshes.log", encoding="utf8"))
     mesh_tallies = revise_files("m", *mesh_tallies)
     single_input = len(mesh_tallies) == 1
     prefix = Path(prefix)
+    name_select = frozenset(tallies).__contains__ if tallies else None
+    strategy = get_override_strategy(override=override)
+    suffix = fmesh.FMesh.NPY_DIR_SUFFIX if uncompressed else ""
+    sources = []
     for m in mesh_tallies:
         with start_action(action_type="processing .m-file"):
             __LOG.info("meshtally_file: %s", m)
             p = prefix if single_input else prefix / m.stem
             p.mkdir(parents=True, exist_ok=True)
-            with m.open() as stream:
-                fmesh.m_2_npz(
-                    stream,
+            index = index_meshtal(m)
+            if not index.names:
+                __LOG.warning("No mesh tallies found in %s, skipping", m)
+                continue
+            if tallies:
+                missing = set(tallies).difference(index.names)
+                if missing:
+                    __LOG.warning("Mesh tallies %s are not found in %s", sorted(missing), m)
+            if jobs == 1:
+                fmesh.m_file_2_npz(
+                    m,
                     prefix=p,
-                    check_existing_file_strategy=get_override_strategy(override=override),
+                    name_select=name_select,
+                    suffix=suffix,
+                    check_existing_file_strategy=strategy,
+                    index=index,
                 )
+            else:
+                sources.append((m, p, index))
+    if sources:
+        with start_action(action_type="converting .m-files in parallel", jobs=jobs):
+            fmesh.m_files_2_npz(
+                sources,
+                name_select=name_select,
+                suffix=suffix,
+                check_existing_file_strategy=strategy,
+                jobs=jobs,
+            )
@@ -8,6 +8,7 @@ import numpy as np
 
 from mckit_meshes.fmesh import read_meshtal
 from mckit_meshes.mesh.geometry_spec import CylinderGeometrySpec
+from mckit_meshes.meshtal_index import index_meshtal
 from mckit_meshes.utils import get_override_strategy
 from mckit_meshes.wgtmesh import WgtMesh, make_geometry_spec
 
@@ -31,20 +32,18 @@ def convert_mesh_to_weights(
         norm_factor = 2.0 / (beta + 1) / _weights.max()
         return _weights * norm_factor
 
+    index = index_meshtal(path)
+    if mesh_no is None:
+        if len(index) != 1:
+            raise ValueError(
+                f"Meshtal file {path} contains more than one mesh."
+                " Please specify the mesh number using option --mesh."
+            )
+    elif mesh_no not in index:
+        raise ValueError(f"Mesh {mesh_no} is not found in {path}")
     with path.open("r") as fid:
-        meshes = read_meshtal(fid)
-        if mesh_no is None:
-            if len(meshes) != 1:
-                raise ValueError(
-                    f"Meshtal file {path} contains more than one mesh."
-                    " Please specify the mesh number using option --mesh."
-                )
-        else:
-            meshes = list(filter(lambda m: m.name == mesh_no, meshes))
-            lm = len(meshes)
-            if lm == 0:
-                raise ValueError(f"Mesh {mesh_no} is not found in {path}")
-            assert lm == 1
+        meshes = read_meshtal(fid, lambda name: mesh_no is None or name == mesh_no, index=index)
+        assert len(meshes) == 1
         mesh: FMesh = meshes[0]
         energies = [mesh.e]
         weights = [get_weights(mesh)]
@@ -91,6 +90,4 @@ def mesh2wgt(
     wgtmesh = convert_mesh_to_weights(mesh_file, mesh_no=mesh, beta=beta, soft=soft)
     if out is None:
         out = Path(mesh_file.name).with_suffix(".wwinp")
-    out = get_override_strategy(override=override)(out)
-    with out.open("wt") as stream:
-        wgtmesh.write(stream)
+    wgtmesh.save(out, get_override_strategy(override=override))
@@ -11,13 +11,13 @@ import numpy as np
 
 from eliot import start_action
 
-from mckit_meshes.utils import get_override_strategy
-from mckit_meshes.wgtmesh import WgtMesh
+from mckit_meshes.utils import get_override_strategy, ignore_existing_file_strategy
+from mckit_meshes.wwinp_cache import load_wwinp
 
 if TYPE_CHECKING:
     from pathlib import Path
 
-    from mckit_meshes.wgtmesh import Point
+    from mckit_meshes.wgtmesh import Point, WgtMesh
 
 
 def do_normalize_weights(
@@ -27,8 +27,7 @@ def do_normalize_weights(
     normalization_value: float = 1 / 3,
     energy_bin: int = -1,
 ) -> WgtMesh:
-    with path.open("r") as fid:
-        wgtmesh = WgtMesh.read(fid)
+    wgtmesh = load_wwinp(path)
     local_normalisation_point = wgtmesh.geometry_spec.local_coordinates(normalization_point)
     return wgtmesh.normalize(local_normalisation_point, normalization_value, energy_bin)
 
@@ -54,6 +53,5 @@ def normalize_weights(
             normalization_value=normalization_value,
             energy_bin=energy_bin,
         )
-        with out.open("wt") as stream:
-            wgtmesh.write(stream)
+        wgtmesh.save(out, ignore_existing_file_strategy)
         logger.add_success_fields(output=out)
@@ -0,0 +1,39 @@
+"""Convert npz files to chunked FMesh storage."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from eliot import start_action
+
+from mckit_meshes import fmesh
+from mckit_meshes.utils import get_override_strategy, revise_files
+
+
+def npz2chunked(
+    *npz_files: Path,
+    prefix: str | Path,
+    chunks: tuple[int, int, int, int] = fmesh.FMesh.DEFAULT_CHUNKS,
+    override: bool = False,
+) -> None:
+    """Convert npz files to directories with FMesh arrays in compressed chunks.
+
+    Parameters
+    ----------
+        npz_files
+            files to process, optional
+        prefix
+            output directory
+        chunks
+            chunk shape (energy, i, j, k)
+        override
+            define behaviour when output file, exists, default - rise FileExistsError.
+    """
+    npz_files = revise_files("npz", *npz_files)
+    prefix = Path(prefix)
+    file_exists_strategy = get_override_strategy(override=override)
+    for npz in npz_files:
+        with start_action(action_type="processing", _npz_file=npz) as logger:
+            prefix.mkdir(parents=True, exist_ok=True)
+            out = fmesh.npz_2_chunked(npz, prefix / npz.stem, file_exists_strategy, chunks=chunks)
+            logger.add_success_fields(saved_to=out)
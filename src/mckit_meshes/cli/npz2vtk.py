@@ -18,7 +18,8 @@ def npz2vtk(*npz_files: Path, prefix: str | Path, override: bool = False) -> Non
         prefix
             output directory
         npz_files
-            files to process, optional
+            npz files or .npy directories (see :py:meth:`FMesh.save_2_npy_dir`)
+            to process, optional
         override
             define behaviour when output file, exists, default - rise FileExistsError.
     """
@@ -28,7 +29,7 @@ def npz2vtk(*npz_files: Path, prefix: str | Path, override: bool = False) -> Non
     for npz in npz_files:
         with start_action(action_type="processing", _npz_file=npz) as logger:
             prefix.mkdir(parents=True, exist_ok=True)
-            mesh = fmesh.FMesh.load_npz(npz)
+            mesh = fmesh.FMesh.load(npz)
             vtk_file_stem = f"{prefix / npz.stem}"
             vtk_file_name = (
                 vtk_file_stem + ".vtr"
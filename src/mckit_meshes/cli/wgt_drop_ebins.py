@@ -2,12 +2,14 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from mckit_meshes.utils import get_override_strategy
-from mckit_meshes.wgtmesh import WgtMesh
+from mckit_meshes.utils import get_override_strategy, ignore_existing_file_strategy
+from mckit_meshes.wwinp_cache import load_wwinp
 
 if TYPE_CHECKING:
     from pathlib import Path
 
+    from mckit_meshes.wgtmesh import WgtMesh
+
 
 def load(path: Path) -> WgtMesh:
     """Load weight mesh file.
@@ -15,28 +17,26 @@ def load(path: Path) -> WgtMesh:
     Parameters
     ----------
     path
-        to the weight file
+        to the weight file: WWINP, npz or .npy directory
 
     Returns
     -------
     The loaded weight mesh object.
     """
-    with path.open("r") as fid:
-        return WgtMesh.read(fid)
+    return load_wwinp(path)
 
 
 def save(mesh: WgtMesh, path: Path) -> None:
-    """Save weight mesh object ot file.
+    """Save weight mesh object to file.
 
     Parameters
     ----------
     mesh
         weight mesh object
     path
-        where to save to
+        where to save to, the format depends on suffix, see :py:meth:`WgtMesh.save`
     """
-    with path.open("wt") as stream:
-        mesh.write(stream)
+    mesh.save(path, ignore_existing_file_strategy)
 
 
 def wgt_drop_ebins(*, override: bool, output, min_energy: float, part: int, wgtfile: Path) -> None:
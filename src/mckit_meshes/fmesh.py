@@ -5,13 +5,22 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Literal, TextIO, cast
+from typing import TYPE_CHECKING, BinaryIO, Final, Literal, NamedTuple, TextIO, cast
 
 import logging
-
+import mmap
+import os
+import shutil
+import traceback
+
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
 from multiprocessing import Pool
 from pathlib import Path
 from textwrap import dedent
+from zipfile import BadZipFile
 
 import numpy as np
 
@@ -20,32 +29,191 @@ from toolz.itertoolz import concatv
 
 import mckit_meshes.mesh.geometry_spec as gc
 
+from mckit_meshes.meshtal_index import index_meshtal
 from mckit_meshes.particle_kind import ParticleKind as Kind
 from mckit_meshes.utils import raise_error_when_file_exists_strategy, rebin
+from mckit_meshes.utils.chunked_array import DEFAULT_COMPRESSION_LEVEL, ChunkedArray
+from mckit_meshes.utils.npz import NpzCodec, save_npz
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Generator, Iterable
+    from collections.abc import Callable, Generator, Iterable, Iterator, Sequence
 
-    from numpy.typing import ArrayLike, NDArray
+    from numpy.lib.npyio import NpzFile
+    from numpy.typing import ArrayLike, DTypeLike, NDArray
 
+    from mckit_meshes.meshtal_index import MeshtalIndex, TallyOffsets
+    from mckit_meshes.utils.rebin import RebinPlan
     from mckit_meshes.wgtmesh import GeometrySpec
 
 __LOG = logging.getLogger("mckit_meshes.fmesh")
 
+MeshtalEngine = Literal["numpy", "python"]
+"""Parser engine for meshtal value blocks.
+
+- "numpy" - decode a whole value block at once with vectorized NumPy routines,
+- "python" - parse the values line by line (slow, but the most tolerant fallback).
+"""
+
+_NEW_LINE: Final = ord("\n")
+_BLANKS: Final = b" \t\r\n"
+_TRAILING_BLANKS: Final = np.frombuffer(_BLANKS[:-1], dtype=np.uint8)
+_MESH_TALLY_NUMBER: Final = "Mesh Tally Number"
+_FIELDS_WIDTH: Final = 24
+"""Width of the last two fields in mesh lines: value and relative error, 12 chars each."""
+
+_READ_CHUNK_LINES: Final = 2**16
+"""Lines to read from a text stream at once."""
+
+_DECODE_CHUNK_SIZE: Final = 2**22
+"""Bytes of value lines to decode at once, limits memory used for temporary arrays."""
+
+_WRITE_CHUNK_ROWS: Final = 2**16
+"""Rows of mesh values to format at once on writing meshtal file."""
+
+_EXACT_POWERS_OF_TEN: Final = np.array([float(10**k) for k in range(23)])
+"""Powers of ten exactly representable as float64."""
+
+
+class _NpyDirectory(Mapping[str, "NDArray"]):
+    """Read only mapping of array names to .npy files in a directory."""
+
+    def __init__(self, path: Path, mmap_mode: Literal["r", "c"] | None) -> None:
+        self._path = path
+        self._mmap_mode = mmap_mode
+
+    def __contains__(self, key: object) -> bool:
+        return (self._path / f"{key}.npy").is_file()
+
+    def __getitem__(self, key: str) -> NDArray:
+        try:
+            return np.load(self._path / f"{key}.npy", mmap_mode=self._mmap_mode)
+        except FileNotFoundError as ex:
+            raise KeyError(key) from ex
+
+    def __iter__(self) -> Iterator[str]:
+        return (p.stem for p in self._path.glob("*.npy"))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+_CHUNKED_KEYS: Final = ("data", "errors", "totals", "totals_err")
 
-def _expand_args(args):
-    """Adapter to invoke rebin.
+
+class FMeshHeader(NamedTuple):
+    """FMesh description without the values.
+
+    See :py:meth:`FMesh.load_header`.
+    """
+
+    name: int
+    """Mesh tally number."""
+
+    kind: int
+    """Particle kind or a generic number."""
+
+    geometry_spec: gc.CartesianGeometrySpec | gc.CylinderGeometrySpec
+    """Spatial bins specification."""
+
+    ebins: NDArray
+    """Energy bins."""
+
+    comment: str | None
+    """Mesh tally comment."""
+
+    @property
+    def data_shape(self) -> tuple[int, int, int, int]:
+        """Shape of the mesh values (E, I, J, K)."""
+        return (self.ebins.size - 1, *self.geometry_spec.bins_shape)
+
+
+def _read_stored_header(data: Mapping[str, NDArray], source: str | Path) -> FMeshHeader:
+    """Read FMesh description from stored arrays, considering the format version.
 
     Parameters
     ----------
-    args
-        what to rebin and how
+    data
+        the arrays by names
+    source
+        where the arrays are loaded from, for error messages
+
+    Returns
+    -------
+    FMesh name, kind, geometry, energy bins and comment.
+
+    Raises
+    ------
+    FMesh.FMeshError
+        if the format version is not supported.
+    """
+    meta = data["meta"]
+    mark = meta[0]
+    assert mark == FMesh.NPZ_MARK, f"Incompatible file format {source}"
+    version = meta[1]
+    name, kind = meta[2:4]
+    if version < 1:
+        raise FMesh.FMeshError(f"Invalid version {version} for FMesh file")
+    e = data["E"]
+    x = data["X"]
+    y = data["Y"]
+    z = data["Z"]
+    comment = None
+    origin = None
+    axis = None
+    if version >= 2:
+        if "comment" in data:
+            comment = data["comment"]
+            comment = comment.item()
+            assert comment
+        if version >= 3:
+            if "origin" in data:
+                assert "axis" in data
+                origin = data["origin"]
+                axis = data["axis"]
+                assert origin.size == 3
+                assert axis.size == 3
+            if version >= 4:
+                pass
+            else:
+                kind = int(kind) + 1
+    if origin is None:
+        geometry_spec = gc.CartesianGeometrySpec(x, y, z)
+    else:
+        if axis is None:
+            raise ValueError
+        geometry_spec = gc.CylinderGeometrySpec(x, y, z, origin=origin, axs=axis)
+    return FMeshHeader(int(name), int(kind), geometry_spec, e, comment)
+
+
+def _read_npy_shape(fid: BinaryIO) -> tuple[int, ...]:
+    version = np.lib.format.read_magic(fid)
+    if version == (1, 0):
+        shape, _, _ = np.lib.format.read_array_header_1_0(fid)
+    else:
+        shape, _, _ = np.lib.format.read_array_header_2_0(fid)
+    return tuple(shape)
+
+
+def _npy_file_shape(path: Path) -> tuple[int, ...]:
+    with path.open("rb") as fid:
+        return _read_npy_shape(fid)
+
+
+def _npz_member_shape(npz: NpzFile, key: str) -> tuple[int, ...]:
+    with npz.zip.open(f"{key}.npy") as fid:
+        return _read_npy_shape(fid)
+
+
+def _theta_period(geometry_spec: gc.AbstractGeometrySpec) -> float | None:
+    """Get Theta period for a cylinder mesh covering a whole revolution.
 
     Returns
     -------
-    Rebinned result
+    One revolution or None, if Theta bins cannot wrap around.
     """
-    return rebin.rebin_nd(*args)
+    if geometry_spec.cylinder and np.isclose(geometry_spec.kbins[-1] - geometry_spec.kbins[0], 1.0):
+        return 1.0
+    return None
 
 
 class FMesh:
@@ -58,8 +226,21 @@ class FMesh:
     NPZ_MARK = np.int16(5445)
     """Signature to be stored in the of meta entry in a npz file."""
 
-    NPZ_FORMAT = np.int16(4)
-    """Identifies version of format of data stored in npz file."""
+    NPZ_FORMAT = np.int16(5)
+    """Identifies version of format of data stored in npz file.
+
+    Since version 5 the meta entry also contains the compression codec and level,
+    and item size of the relative errors.
+    """
+
+    NPY_DIR_SUFFIX = ".fmesh"
+    """Suffix of directories with FMesh arrays stored uncompressed in separate .npy files."""
+
+    CHUNKED_DIR_SUFFIX = ".chunks"
+    """Suffix of directories with FMesh arrays stored in compressed chunks."""
+
+    DEFAULT_CHUNKS = (1, 64, 64, 64)
+    """Default chunk shape (energy, i, j, k) for chunked storage."""
 
     class FMeshError(RuntimeError):
         """FMesh class specific exception."""
@@ -105,6 +286,37 @@ class FMesh:
         comment
             Comment from a meshtal file (content of FC card in MCNP model).
         """
+        self._set_header(name, kind, geometry_spec, ebins, comment)
+        self._set_values(data, errors, totals, totals_err)
+
+    @classmethod
+    def _lazy(cls, header: FMeshHeader, load: Callable[[], FMesh]) -> FMesh:
+        """Create FMesh object, which loads the values on the first access.
+
+        Parameters
+        ----------
+        header
+            the mesh description
+        load
+            loads the whole mesh, the values are taken from the result
+
+        Returns
+        -------
+        The new FMesh object without values.
+        """
+        mesh = cls.__new__(cls)
+        mesh._set_header(*header)
+        mesh._load = load
+        return mesh
+
+    def _set_header(
+        self,
+        name: int,
+        kind: int | Kind,
+        geometry_spec: gc.AbstractGeometrySpec,
+        ebins: ArrayLike,
+        comment: str | None,
+    ) -> None:
         self.name = int(name)
         self.kind = Kind(kind)  # may be not a particle kind, when this is a sum of heating
 
@@ -116,19 +328,29 @@ class FMesh:
         self.bins["Y"] = self._y = geometry_spec.jbins
         self.bins["Z"] = self._z = geometry_spec.kbins
         self.bins["E"] = self._e = np.asarray(ebins)
-        self.data = np.asarray(data, dtype=float)
-        self.errors = np.asarray(errors, dtype=float)
+        self._comment = comment
+        self._load: Callable[[], FMesh] | None = None
+
+    def _set_values(
+        self,
+        data: ArrayLike,
+        errors: ArrayLike,
+        totals: ArrayLike | None,
+        totals_err: ArrayLike | None,
+    ) -> None:
+        self._data = np.asarray(data, dtype=float)
+        self._errors = np.asarray(errors, dtype=float)
         if self._e.size > 2:
             if totals is None:
                 if totals_err is not None:
                     raise ValueError("totals are omitted but totals_err are provided")
-                self._totals: NDArray[np.floating] | None = np.sum(self.data, axis=0)
+                self._totals: NDArray[np.floating] | None = np.sum(self._data, axis=0)
                 non_zero = self._totals > 0.0
                 self._totals_err: NDArray[np.floating] | None = np.zeros_like(
                     self._totals, dtype=float
                 )
                 self._totals_err[non_zero] = (
-                    np.sqrt(np.sum((self.errors * self.data) ** 2, axis=0))[non_zero]
+                    np.sqrt(np.sum((self._errors * self._data) ** 2, axis=0))[non_zero]
                     / self._totals[non_zero]
                 )
             else:
@@ -139,9 +361,37 @@ class FMesh:
         else:
             self._totals = None
             self._totals_err = None
-        self._comment = comment
         self.check_attributes()
 
+    def _materialize(self) -> None:
+        """Load the values of lazily loaded mesh, if not loaded yet."""
+        if self._load is not None:
+            load, self._load = self._load, None
+            loaded = load()
+            self._set_values(loaded.data, loaded.errors, loaded.totals, loaded.totals_err)
+
+    @property
+    def is_loaded(self) -> bool:
+        """Check if the values are in memory (or memory mapped).
+
+        Returns
+        -------
+        False, if the mesh is loaded lazily and the values are not accessed yet.
+        """
+        return self._load is None
+
+    @property
+    def data(self) -> NDArray:
+        """Data values at centers of mesh cells, shape (E, I, J, K)."""
+        self._materialize()
+        return self._data
+
+    @property
+    def errors(self) -> NDArray:
+        """Relative errors of the data values."""
+        self._materialize()
+        return self._errors
+
     @property
     def e(self) -> np.ndarray:
         """Energy bins."""
@@ -187,11 +437,13 @@ class FMesh:
     @property
     def totals(self) -> NDArray | None:
         """Total values over energy."""
+        self._materialize()
         return self._totals
 
     @property
     def totals_err(self) -> NDArray | None:
         """Relative errors of total values over energy."""
+        self._materialize()
         return self._totals_err
 
     @property
@@ -419,15 +671,15 @@ class FMesh:
         -------
         totals, total_err for the specified coordinates
         """
-        if self._totals is None:
+        if self.totals is None:
             return None
-        if self._totals_err is None:
+        if self.totals_err is None:
             msg = "No totals, but totals_err is specified"
             raise ValueError(msg)
         found_x, found_y, found_z = self.select_indexes(x=x, y=y, z=z)
         totals, rel_error = (
-            self._totals[found_x, found_y, found_z],
-            self._totals_err[found_x, found_y, found_z],
+            self.totals[found_x, found_y, found_z],
+            self.totals_err[found_x, found_y, found_z],
         )
         return totals, rel_error
 
@@ -435,6 +687,10 @@ class FMesh:
         self,
         filename: Path,
         check_existing_file_strategy=raise_error_when_file_exists_strategy,
+        *,
+        codec: NpzCodec = NpzCodec.zlib,
+        level: int | None = None,
+        errors_dtype: DTypeLike = np.float64,
     ) -> None:
         """Write this object to numpy npz file.
 
@@ -447,15 +703,194 @@ class FMesh:
             already have one. By default, the name of file is the tally name.
         check_existing_file_strategy
             what to do if an output file already exists
+        codec
+            compression method, see :py:meth:`NpzCodec.available`
+        level
+            compression level, default - :py:attr:`NpzCodec.default_level`
+        errors_dtype
+            float type to store relative errors, use np.float32 or np.float16
+            to reduce the file size for the cost of precision loss
         """
         if filename.suffix != ".npz":
             filename = filename.with_suffix(".npz")
 
         check_existing_file_strategy(filename)
 
-        kwd = {
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        if level is None:
+            level = codec.default_level
+        arrays = self._storage_arrays(codec, level, errors_dtype)
+        save_npz(
+            filename,
+            {k: v for k, v in arrays.items() if v is not None},
+            codec=codec,
+            level=level,
+        )
+
+    def save_2_npy_dir(
+        self,
+        dirname: Path,
+        check_existing_file_strategy=raise_error_when_file_exists_strategy,
+    ) -> None:
+        """Write this object to a directory of uncompressed .npy files.
+
+        The arrays are stored with the same names and "meta" handshake as in npz file,
+        but can be loaded lazily as memory maps, see :py:meth:`load_npy_dir`.
+        The "meta" file is written the last, so an incomplete directory is not loadable.
+
+        Parameters
+        ----------
+        dirname
+            Directory to save to, the suffix :py:attr:`NPY_DIR_SUFFIX` is appended,
+            if not present.
+        check_existing_file_strategy
+            what to do if the output directory already exists
+        """
+        if dirname.suffix != FMesh.NPY_DIR_SUFFIX:
+            dirname = dirname.with_suffix(FMesh.NPY_DIR_SUFFIX)
+
+        check_existing_file_strategy(dirname)
+
+        dirname.mkdir(parents=True, exist_ok=True)
+        (dirname / "meta.npy").unlink(missing_ok=True)
+        arrays = self._storage_arrays()
+        meta = arrays.pop("meta")
+        for key, value in arrays.items():
+            path = dirname / f"{key}.npy"
+            if value is None:
+                path.unlink(missing_ok=True)
+            else:
+                np.save(path, value)
+        np.save(dirname / "meta.npy", meta)
+
+    def save_2_chunked(
+        self,
+        dirname: Path,
+        check_existing_file_strategy=raise_error_when_file_exists_strategy,
+        *,
+        chunks: tuple[int, int, int, int] = DEFAULT_CHUNKS,
+        level: int = DEFAULT_COMPRESSION_LEVEL,
+    ) -> None:
+        """Write this object to a directory with the arrays in compressed chunks.
+
+        The small arrays are stored as in :py:meth:`save_2_npy_dir`.
+        The `data` and `errors` are split into chunks over (energy, i, j, k),
+        the `totals` - over (i, j, k), each chunk is compressed separately.
+        Use :py:class:`ChunkedFMesh` to read only the required chunks.
+
+        Parameters
+        ----------
+        dirname
+            Directory to save to, the suffix :py:attr:`CHUNKED_DIR_SUFFIX` is appended,
+            if not present.
+        check_existing_file_strategy
+            what to do if the output directory already exists
+        chunks
+            chunk shape
+        level
+            zlib compression level
+        """
+        if dirname.suffix != FMesh.CHUNKED_DIR_SUFFIX:
+            dirname = dirname.with_suffix(FMesh.CHUNKED_DIR_SUFFIX)
+
+        check_existing_file_strategy(dirname)
+
+        dirname.mkdir(parents=True, exist_ok=True)
+        (dirname / "meta.npy").unlink(missing_ok=True)
+        arrays = self._storage_arrays(NpzCodec.zlib, level)
+        meta = arrays.pop("meta")
+        for key in _CHUNKED_KEYS:
+            value = arrays.pop(key)
+            path = dirname / key
+            if path.exists():
+                shutil.rmtree(path)
+            if value is not None:
+                ChunkedArray.create(path, value, chunks[-value.ndim :], level=level)
+        for key, value in arrays.items():
+            np.save(dirname / f"{key}.npy", value)
+        np.save(dirname / "meta.npy", meta)
+
+    def save(
+        self,
+        path: Path,
+        check_existing_file_strategy=raise_error_when_file_exists_strategy,
+        *,
+        codec: NpzCodec = NpzCodec.zlib,
+        level: int | None = None,
+        errors_dtype: DTypeLike = np.float64,
+    ) -> None:
+        """Save to npz file, .npy or chunked directory depending on `path` suffix.
+
+        See :py:attr:`NPY_DIR_SUFFIX` and :py:attr:`CHUNKED_DIR_SUFFIX`.
+
+        Parameters
+        ----------
+        path
+            where to save
+        check_existing_file_strategy
+            what to do if the output already exists
+        codec
+            see :py:meth:`save_2_npz`, used only for npz files
+        level
+            ... the same
+        errors_dtype
+            ... the same
+        """
+        if path.suffix == FMesh.NPY_DIR_SUFFIX:
+            self.save_2_npy_dir(path, check_existing_file_strategy)
+        elif path.suffix == FMesh.CHUNKED_DIR_SUFFIX:
+            self.save_2_chunked(path, check_existing_file_strategy)
+        else:
+            self.save_2_npz(
+                path,
+                check_existing_file_strategy,
+                codec=codec,
+                level=level,
+                errors_dtype=errors_dtype,
+            )
+
+    def _storage_arrays(
+        self,
+        codec: NpzCodec = NpzCodec.none,
+        level: int = 0,
+        errors_dtype: DTypeLike = np.float64,
+    ) -> dict[str, NDArray | None]:
+        """Collect arrays to store this object in npz file or .npy directory.
+
+        Parameters
+        ----------
+        codec
+            compression method to record in the metadata
+        level
+            ... and compression level
+        errors_dtype
+            float type to store relative errors
+
+        Returns
+        -------
+        The arrays by names.
+
+        Raises
+        ------
+        ValueError
+            if `errors_dtype` is not a float type.
+        """
+        errors_dtype = np.dtype(errors_dtype)
+        if errors_dtype.kind != "f":
+            msg = f"Relative errors can be stored only as floats, {errors_dtype} is specified"
+            raise ValueError(msg)
+        totals_err = self.totals_err
+        arrays: dict[str, NDArray | None] = {
             "meta": np.array(
-                [FMesh.NPZ_MARK, FMesh.NPZ_FORMAT, self.name, self.kind],
+                [
+                    FMesh.NPZ_MARK,
+                    FMesh.NPZ_FORMAT,
+                    self.name,
+                    self.kind,
+                    codec,
+                    level,
+                    errors_dtype.itemsize,
+                ],
                 dtype=np.uint32,
             ),
             "E": self.e,
@@ -463,95 +898,183 @@ class FMesh:
             "Y": self.jbins,
             "Z": self.kbins,
             "data": self.data,
-            "errors": self.errors,
+            "errors": self.errors.astype(errors_dtype, copy=False),
             "totals": self.totals,
-            "totals_err": self.totals_err,
+            "totals_err": None
+            if totals_err is None
+            else totals_err.astype(errors_dtype, copy=False),
         }
         if self.comment:
-            kwd["comment"] = np.array(self.comment)
+            arrays["comment"] = np.array(self.comment)
         if self.is_cylinder:
-            kwd["origin"] = np.array(self._geometry_spec.origin)
-            kwd["axis"] = np.array(self._geometry_spec.axs)
-
-        filename.parent.mkdir(parents=True, exist_ok=True)
-        # TODO @dvp: the following uses pickles to save object, this works, but it's not good
-        np.savez_compressed(str(filename), **kwd)
+            arrays["origin"] = np.array(self._geometry_spec.origin)
+            arrays["axis"] = np.array(self._geometry_spec.axs)
+        return arrays
 
     @classmethod
-    def load_npz(cls, _file: str | Path) -> FMesh:
+    def load_npz(cls, _file: str | Path, *, lazy: bool = False) -> FMesh:
         """Load Fmesh object from the binary file.
 
         Parameters
         ----------
         _file
             npz-file to load from.
+        lazy
+            load only the header, the values are loaded on the first access
 
         Returns
         -------
         The loaded FMesh object.
         """
+        if lazy:
+            path = Path(_file)
+            return cls._lazy(cls.load_header(path), partial(cls.load_npz, path))
         if isinstance(_file, Path):
             _file = str(_file)
         with np.load(_file) as data:
-            meta = data["meta"]
-            mark = meta[0]
-            assert mark == FMesh.NPZ_MARK, f"Incompatible file format {_file}"
-            version = meta[1]
-            name, kind = meta[2:4]
-            if version >= 1:
-                e = data["E"]
-                x = data["X"]
-                y = data["Y"]
-                z = data["Z"]
-                d = data["data"]
-                r = data["errors"]
-                if e.size > 2:
-                    try:
-                        totals = data["totals"]
-                        totals_err = data["totals_err"]
-                    except KeyError:
-                        totals = None
-                        totals_err = None
-                else:
-                    totals = None
-                    totals_err = None
-                comment = None
-                origin = None
-                axis = None
-                if version >= 2:
-                    if "comment" in data:
-                        comment = data["comment"]
-                        comment = comment.item()
-                        assert comment
-                    if version >= 3:
-                        if "origin" in data:
-                            assert "axis" in data
-                            origin = data["origin"]
-                            axis = data["axis"]
-                            assert origin.size == 3
-                            assert axis.size == 3
-                        if version >= 4:
-                            pass
-                        else:
-                            kind = int(kind) + 1
-                if origin is None:
-                    geometry_spec = gc.CartesianGeometrySpec(x, y, z)
+            return cls._from_storage(data, _file)
+
+    @classmethod
+    def load_npy_dir(cls, dirname: Path, mmap_mode: Literal["r", "c"] | None = "r") -> FMesh:
+        """Load Fmesh object from a directory of .npy files.
+
+        Parameters
+        ----------
+        dirname
+            directory created with :py:meth:`save_2_npy_dir`
+        mmap_mode
+            mode to map the arrays to memory: "r" - read only, "c" - copy on write,
+            None - load to memory
+
+        Returns
+        -------
+        The loaded FMesh object, the `data`, `errors` and `totals` are memory maps
+        unless `mmap_mode` is None.
+
+        Raises
+        ------
+        FMesh.FMeshError
+            if the directory doesn't contain "meta" entry.
+        """
+        storage = _NpyDirectory(dirname, mmap_mode)
+        if "meta" not in storage:
+            raise FMesh.FMeshError(f"No FMesh metadata found in {dirname}")
+        return cls._from_storage(storage, dirname)
+
+    @classmethod
+    def load(
+        cls,
+        path: Path,
+        mmap_mode: Literal["r", "c"] | None = "r",
+        *,
+        lazy: bool = False,
+    ) -> FMesh:
+        """Load FMesh object from npz file or .npy directory.
+
+        Parameters
+        ----------
+        path
+            npz file or directory created with :py:meth:`save_2_npy_dir`
+            or :py:meth:`save_2_chunked`
+        mmap_mode
+            see :py:meth:`load_npy_dir`, not used for npz files
+        lazy
+            load only the header, the values are loaded on the first access
+
+        Returns
+        -------
+        The loaded FMesh object.
+        """
+        if lazy:
+            return cls._lazy(cls.load_header(path), partial(cls.load, path, mmap_mode))
+        if path.is_dir():
+            if ChunkedFMesh.is_chunked_dir(path):
+                return ChunkedFMesh(path).load()
+            return cls.load_npy_dir(path, mmap_mode)
+        return cls.load_npz(path)
+
+    @classmethod
+    def load_header(cls, path: Path) -> FMeshHeader:
+        """Load FMesh description without the values.
+
+        Only the metadata, bins and comment are read. The shapes of the values
+        are checked against the bins reading only the array headers.
+
+        Parameters
+        ----------
+        path
+            npz file, .npy or chunked directory, see :py:meth:`load`
+
+        Returns
+        -------
+        The mesh description.
+
+        Raises
+        ------
+        FMesh.FMeshError
+            if there's no metadata, or the values are absent or don't correspond to the bins.
+        """
+        try:
+            if path.is_dir():
+                storage = _NpyDirectory(path, None)
+                if "meta" not in storage:
+                    raise FMesh.FMeshError(f"No FMesh metadata found in {path}")
+                header = _read_stored_header(storage, path)
+                if ChunkedFMesh.is_chunked_dir(path):
+                    shapes = [ChunkedArray.open(path / key).shape for key in ("data", "errors")]
                 else:
-                    if axis is None:
-                        raise ValueError
-                    geometry_spec = gc.CylinderGeometrySpec(x, y, z, origin=origin, axs=axis)
-                return cls(
-                    name,
-                    kind,
-                    geometry_spec,
-                    e,
-                    d,
-                    r,
-                    totals,
-                    totals_err,
-                    comment=comment,
+                    shapes = [_npy_file_shape(path / f"{key}.npy") for key in ("data", "errors")]
+            else:
+                with np.load(path) as data:
+                    header = _read_stored_header(data, path)
+                    shapes = [_npz_member_shape(data, key) for key in ("data", "errors")]
+        except (OSError, KeyError, ValueError, BadZipFile) as ex:
+            raise FMesh.FMeshError(f"Cannot read FMesh from {path}: {ex}") from ex
+        for shape in shapes:
+            if shape != header.data_shape:
+                msg = (
+                    f"Values shape {shape} doesn't correspond to bins {header.data_shape} in {path}"
                 )
-            raise FMesh.FMeshError(f"Invalid version {version} for FMesh file")
+                raise FMesh.FMeshError(msg)
+        return header
+
+    @classmethod
+    def _from_storage(cls, data: Mapping[str, NDArray], source: str | Path) -> FMesh:
+        """Create FMesh object from stored arrays.
+
+        Parameters
+        ----------
+        data
+            the arrays by names
+        source
+            where the arrays are loaded from, for error messages
+
+        Returns
+        -------
+        The loaded FMesh object.
+        """
+        header = _read_stored_header(data, source)
+        if header.ebins.size > 2:
+            try:
+                totals = data["totals"]
+                totals_err = data["totals_err"]
+            except KeyError:
+                totals = None
+                totals_err = None
+        else:
+            totals = None
+            totals_err = None
+        return cls(
+            header.name,
+            header.kind,
+            header.geometry_spec,
+            header.ebins,
+            data["data"],
+            data["errors"],
+            totals,
+            totals_err,
+            comment=header.comment,
+        )
 
     def save2vtk(self, filename: str | None = None, data_name: str | None = None) -> str:
         """Save this fmesh data to vtk file.
@@ -613,34 +1136,10 @@ class FMesh:
         y = 0.5 * (self.jbins[1:] + self.jbins[:-1])
         z = 0.5 * (self.kbins[1:] + self.kbins[:-1])
         print(header, file=stream)
-        print(
-            f"{'R' if self.is_cylinder else 'X'} direction:",
-            file=stream,
-            end="",
-        )
-        for f in np.nditer(self.ibins):
-            print(f" {f}", file=stream, end="")
-        print(file=stream)
-        print(
-            f"{('Z' if self.is_cylinder else 'Y')} direction:",
-            file=stream,
-            end="",
-        )
-        for f in np.nditer(self.jbins):
-            print(f" {f}", file=stream, end="")
-        print(file=stream)
-        print(
-            "{} direction:".format("Theta" if self.is_cylinder else "Z"),
-            file=stream,
-            end="",
-        )
-        for f in np.nditer(self.kbins):
-            print(f" {f}", file=stream, end="")
-        print(file=stream)
-        print("Energy bin boundaries:", file=stream, end="")
-        for f in np.nditer(self.e):
-            print(f" {f}", file=stream, end="")
-        print("\n", file=stream)
+        labels = ("R", "Z", "Theta") if self.is_cylinder else ("X", "Y", "Z")
+        for label, bins in zip(labels, (self.ibins, self.jbins, self.kbins), strict=True):
+            print(f"{label} direction:", *bins, file=stream)
+        print("Energy bin boundaries:", *self.e, end="\n\n", file=stream)
         if self.is_cylinder:
             print(
                 "   Energy         R         Z         Th    Result     Rel Error",
@@ -651,32 +1150,24 @@ class FMesh:
                 "   Energy         X         Y         Z     Result     Rel Error",
                 file=stream,
             )
-
-        for ie in range(e.size):
-            for ix in range(x.size):
-                for iy in range(y.size):
-                    for iz in range(z.size):
-                        value = self.data[ie, ix, iy, iz]
-                        err = self.errors[ie, ix, iy, iz]
-                        row = (
-                            f" {e[ie]:10.3e}{x[ix]:10.3f}{y[iy]:10.3f}{z[iz]:10.3f}"
-                            f" {value:11.5e} {err:11.5e}"
-                        )
-                        print(row, file=stream)
-
-        if self._totals:
-            if self._totals_err is None:
+        yz = [f"{yi:10.3f}{zi:10.3f}" for yi in y for zi in z]
+        _write_rows(
+            stream,
+            [f" {ei:10.3e}{xi:10.3f}" for ei in e for xi in x],
+            yz,
+            self.data,
+            self.errors,
+        )
+        if self.totals is not None:
+            if self.totals_err is None:
                 raise ValueError
-            for ix in range(x.size):
-                for iy in range(y.size):
-                    for iz in range(z.size):
-                        value = self._totals[ix, iy, iz]
-                        err = self._totals_err[ix, iy, iz]
-                        row = (
-                            f"   Total   {x[ix]:10.3f}{y[iy]:10.3f}{z[iz]:10.3f}"
-                            f" {value:11.5e} {err:11.5e}"
-                        )
-                        print(row, file=stream)
+            _write_rows(
+                stream,
+                [f"   Total   {xi:10.3f}" for xi in x],
+                yz,
+                self.totals,
+                self.totals_err,
+            )
 
     def total_by_energy(self, new_name: int = 0) -> FMesh:
         """Integrate over energy bins.
@@ -691,11 +1182,11 @@ class FMesh:
         The new FMesh object with only one energy bin.
         """
         e = np.array([self.e[0], self.e[-1]])
-        if self._totals:
-            if not self._totals_err:
+        if self.totals is not None:
+            if self.totals_err is None:
                 raise ValueError
-            data = self._totals[np.newaxis, ...]
-            errors = self._totals_err[np.newaxis, ...]
+            data = self.totals[np.newaxis, ...]
+            errors = self.totals_err[np.newaxis, ...]
         else:
             data = self.data.sum(axis=0)
             errors = np.sqrt(np.pow(self.data * self.errors, 2).sum(axis=0))
@@ -715,6 +1206,11 @@ class FMesh:
     ) -> FMesh:
         """Select subset of e-voxels within given geometry and energy limits.
 
+        For a cylinder mesh x, y and z stand for R, Z and Theta.
+        If the mesh covers a whole revolution, the Theta range may cross
+        the revolution end: `zmax` above 1 or less than `zmin`, for example,
+        ``zmin=0.9, zmax=0.1`` selects the sector around the Theta origin.
+
         Parameters
         ----------
         emin
@@ -740,44 +1236,37 @@ class FMesh:
         -------
         A new FMesh with reduced bins.
         """
-        trim_spec = list(
-            rebin.trim_spec_composer(
-                [self.e, self.ibins, self.jbins, self.kbins],
-                [emin, xmin, ymin, zmin],
-                [emax, xmax, ymax, zmax],
-            ),
-        )
-        new_bins_list, new_data = rebin.shrink_nd(self.data, iter(trim_spec), assume_sorted=True)
-        _, new_errors = rebin.shrink_nd(self.errors, iter(trim_spec), assume_sorted=True)
+        period = _theta_period(self._geometry_spec)
 
-        assert all(np.array_equal(a, b) for a, b in zip(new_bins_list, _, strict=False))
-
-        if new_bins_list is None:
-            raise ValueError
+        def shrink_array(a: NDArray) -> tuple[list[NDArray], NDArray]:
+            new_kbins, a = rebin.shrink_1d(
+                a, self.kbins, zmin, zmax, a.ndim - 1, assume_sorted=True, period=period
+            )
+            skip = 4 - a.ndim  # the totals have no energy axis
+            trim_spec = rebin.trim_spec_composer(
+                [self.e, self.ibins, self.jbins][skip:],
+                [emin, xmin, ymin][skip:],
+                [emax, xmax, ymax][skip:],
+            )
+            new_bins_list, a = rebin.shrink_nd(a, iter(list(trim_spec)), assume_sorted=True)
+            if new_bins_list is None:
+                raise ValueError
+            return [*new_bins_list, new_kbins], a
 
+        new_bins_list, new_data = shrink_array(self.data)
+        _, new_errors = shrink_array(self.errors)
         new_ebins, new_xbins, new_ybins, new_zbins = new_bins_list
-        if self.totals is None:
+        if self.totals is None or self.totals_err is None:
             new_totals = None
             new_totals_err = None
         else:
-            totals_trim_spec = list(
-                rebin.trim_spec_composer(
-                    [self.ibins, self.jbins, self.kbins],
-                    [xmin, ymin, zmin],
-                    [xmax, ymax, zmax],
-                ),
-            )
-            _, new_totals = rebin.shrink_nd(self.totals, iter(totals_trim_spec), assume_sorted=True)
-            _, new_totals_err = rebin.shrink_nd(
-                self.totals_err,
-                iter(totals_trim_spec),
-                assume_sorted=True,
-            )
+            _, new_totals = shrink_array(self.totals)
+            _, new_totals_err = shrink_array(self.totals_err)
 
         return FMesh(
             new_name,
             self.kind,
-            gc.CartesianGeometrySpec(new_xbins, new_ybins, new_zbins),
+            self._geometry_spec.with_bins(new_xbins, new_ybins, new_zbins),
             new_ebins,
             new_data,
             new_errors,
@@ -792,65 +1281,67 @@ class FMesh:
         new_z: np.ndarray,
         new_name=-1,
         extra_process_threshold: int = 1000000,
+        *,
+        jobs: int = 0,
     ) -> FMesh:
         """Extract data for a new spatial grid.
 
+        Large meshes are rebinned in a thread pool energy bin by energy bin:
+        the data and errors of a bin are rebinned in the same task and
+        the results are written directly to the new arrays.
+        See :py:meth:`rebin_single` on cylinder meshes.
+
         Parameters
         ----------
         new_x
-            A new binning over X axis.
+            A new binning over X (or R) axis.
         new_y
-            A new binning over Y axis.
+            A new binning over Y (or Z) axis.
         new_z
-            A new binning over Z axis.
+            A new binning over Z (or Theta) axis.
         new_name
             A name for the rebinned mesh to be created. (Default value = -1)
         extra_process_threshold
-            At which size of data use multiple Python processes
+            At which size of data rebin the energy bins in parallel
+        jobs
+            number of threads, 0 - use all CPUs
 
         Returns
         -------
         New FMesh object with the rebinned data.
         """
-        assert not self.is_cylinder, "Not implemented for cylinder meshes"
-
-        if self.data.size < extra_process_threshold:
+        data, errors = self.data, self.errors
+        energy_bins = data.shape[0]
+        workers = min(jobs or os.cpu_count() or 1, energy_bins)
+        if data.size < extra_process_threshold or workers <= 1:
             return self.rebin_single(new_x, new_y, new_z, new_name)
 
-        # To avoid huge memory allocations, iterate over energy with external processes
-        pool = Pool(processes=4)
-        data_rebin_spec = list(
-            rebin.rebin_spec_composer(
-                [self.ibins, self.jbins, self.kbins],
-                [new_x, new_y, new_z],
-                axes=[0, 1, 2],
-            ),
-        )
+        new_geometry_spec = self._geometry_spec.with_bins(new_x, new_y, new_z)
+        plan = self._rebin_plan(new_geometry_spec)
+        new_data = np.empty((energy_bins, *plan.new_shape), dtype=float)
+        new_errors = np.empty_like(new_data)
 
-        def iter_over_e(data):
-            for i in range(self.e.size - 1):
-                yield data[i], data_rebin_spec, True
+        def rebin_energy_bin(i: int) -> None:
+            new_data[i] = plan.apply(data[i])
+            new_errors[i] = plan.apply(data[i] * errors[i])
+            new_errors[i] /= new_data[i]
 
-        new_data = np.stack(
-            pool.map(_expand_args, iter_over_e(self.data)),
-            axis=0,
-        )  # : ignore[PD013]
-        t = self.data * self.errors
-        new_errors = np.stack(pool.map(_expand_args, iter_over_e(t)), axis=0)  # : ignore[PD013]
-        new_errors /= new_data
+        # NumPy releases GIL, so the threads work in parallel without copying the data
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for _ in executor.map(rebin_energy_bin, range(energy_bins)):
+                pass
         if self.totals is None:
             new_totals = None
             new_totals_err = None
         else:
-            new_totals = rebin.rebin_nd(self.totals, data_rebin_spec, assume_sorted=True)
-            t = self.totals * self.totals_err
-            new_totals_err = rebin.rebin_nd(t, data_rebin_spec, assume_sorted=True)
+            new_totals = plan.apply(self.totals)
+            new_totals_err = plan.apply(self.totals * self.totals_err)
             new_totals_err /= new_totals
 
         return FMesh(
             new_name,
             self.kind,
-            gc.CartesianGeometrySpec(new_x, new_y, new_z),
+            new_geometry_spec,
             self.e,
             new_data,
             new_errors,
@@ -867,14 +1358,23 @@ class FMesh:
     ) -> FMesh:
         """Create FMesh object corresponding to this one by fluxes, but over new mesh.
 
+        The rebinning plan is cached, so it's computed only once for all the meshes
+        on the same grid, see :py:meth:`rebin.RebinPlan.cached`.
+
+        The integrals over volume are conserved. For a cylinder mesh the values
+        are rebinned over R squared, which is proportional to annular volumes.
+        If the mesh covers a whole revolution, the new Theta bins may cross
+        the revolution end, for example, [0.9, 1.0, 1.1] specifies
+        two bins around the Theta origin.
+
         Parameters
         ----------
         new_x
-            A new binning over X axis.
+            A new binning over X (or R) axis.
         new_y
-            A new binning over Y axis.
+            A new binning over Y (or Z) axis.
         new_z
-            A new binning over Z axis.
+            A new binning over Z (or Theta) axis.
         new_name
             name for the rebinned mesh to be created.
 
@@ -882,39 +1382,23 @@ class FMesh:
         -------
         New FMesh object with the rebinned data.
         """
-        assert not self.is_cylinder, "Not implemented for cylinder meshes"
-
-        data_rebin_spec = list(
-            rebin.rebin_spec_composer(
-                [self.ibins, self.jbins, self.kbins],
-                [new_x, new_y, new_z],
-                axes=[1, 2, 3],
-            ),
-        )
-        new_data = rebin.rebin_nd(self.data, iter(data_rebin_spec), assume_sorted=True)
-        t = self.data * self.errors
-        new_errors = rebin.rebin_nd(t, iter(data_rebin_spec), assume_sorted=True)
+        new_geometry_spec = self._geometry_spec.with_bins(new_x, new_y, new_z)
+        plan = self._rebin_plan(new_geometry_spec)
+        new_data = plan.apply(self.data)
+        new_errors = plan.apply(self.data * self.errors)
         new_errors /= new_data
         if self.totals is None:
             new_totals = None
             new_totals_err = None
         else:
-            totals_rebin_spec = list(
-                rebin.rebin_spec_composer(
-                    [self.ibins, self.jbins, self.kbins],
-                    [new_x, new_y, new_z],
-                    axes=[0, 1, 2],
-                ),
-            )
-            new_totals = rebin.rebin_nd(self.totals, iter(totals_rebin_spec), assume_sorted=True)
-            t = self.totals * self.totals_err
-            new_totals_err = rebin.rebin_nd(t, iter(totals_rebin_spec), assume_sorted=True)
+            new_totals = plan.apply(self.totals)
+            new_totals_err = plan.apply(self.totals * self.totals_err)
             new_totals_err /= new_totals
 
         return FMesh(
             new_name,
             self.kind,
-            gc.CartesianGeometrySpec(new_x, new_y, new_z),
+            new_geometry_spec,
             self.e,
             new_data,
             new_errors,
@@ -922,6 +1406,24 @@ class FMesh:
             new_totals_err,
         )
 
+    def _rebin_plan(self, new_geometry_spec: gc.AbstractGeometrySpec) -> RebinPlan:
+        # Both the specifications have validated bins, so don't check them again.
+        new_x, new_y, new_z = (
+            new_geometry_spec.ibins,
+            new_geometry_spec.jbins,
+            new_geometry_spec.kbins,
+        )
+        if self.is_cylinder:
+            return rebin.RebinPlan.cached(
+                [np.square(self.ibins), self.jbins, self.kbins],
+                [np.square(new_x), new_y, new_z],
+                periods=[None, None, _theta_period(self._geometry_spec)],
+                assume_sorted=True,
+            )
+        return rebin.RebinPlan.cached(
+            [self.ibins, self.jbins, self.kbins], [new_x, new_y, new_z], assume_sorted=True
+        )
+
     def format_cylinder_origin_and_axis_label(self) -> str:
         """Format the first string for cylinder mesh."""
         if self.is_cylinder:
@@ -943,7 +1445,7 @@ class FMesh:
             and np.array_equal(self.errors, other.errors)
             and self.comment == other.comment
         )
-        if res and self.totals and other.totals:
+        if res and self.totals is not None and other.totals is not None:
             if self.totals_err is None or other.totals_err is None:
                 raise ValueError
             res = cast(
@@ -987,38 +1489,388 @@ class FMesh:
         )
 
 
-# noinspection PyTypeChecker,PyProtectedMember
-def merge_tallies(
-    name: int,
-    kind: int,
-    *tally_weight: tuple[FMesh, float],
-    comment: str | None = None,
-) -> FMesh:
-    """Make superposition of tallies with specific weights.
-
-    Parameters
-    ----------
-    name
-        Name of new fmesh tally.
-    kind
-        Type of new fmesh tally. It can be -1 (or any arbitrary integer).
-    tally_weight
-        List of tally-weight pairs (tuples). tally is FMesh instance. weight is float.
-    comment
-        A comment to assign to the new mesh tally
+class ChunkedFMesh:
+    """FMesh stored in compressed chunks and read lazily.
 
-    Returns
-    -------
-    The merged FMesh.
+    Only the chunks, touched by the selection methods, are read and decompressed.
+    See :py:meth:`FMesh.save_2_chunked`.
     """
-    result_data = None
-    errors = None
-    geometry_spec = None
-    ebins = None
-    for t, w in tally_weight:
-        if result_data is None:
-            result_data = t.data * w
-            errors = (t.errors * t.data * w) ** 2
+
+    def __init__(self, path: Path) -> None:
+        """Open a directory created with :py:meth:`FMesh.save_2_chunked`.
+
+        Parameters
+        ----------
+        path
+            the directory
+
+        Raises
+        ------
+        FMesh.FMeshError
+            if the directory doesn't contain FMesh metadata.
+        """
+        storage = _NpyDirectory(path, None)
+        if "meta" not in storage:
+            raise FMesh.FMeshError(f"No FMesh metadata found in {path}")
+        self.path = path
+        self._header = _read_stored_header(storage, path)
+        self.data = ChunkedArray.open(path / "data")
+        self.errors = ChunkedArray.open(path / "errors")
+        if self.e.size > 2 and (path / "totals").is_dir():
+            self.totals: ChunkedArray | None = ChunkedArray.open(path / "totals")
+            self.totals_err: ChunkedArray | None = ChunkedArray.open(path / "totals_err")
+        else:
+            self.totals = self.totals_err = None
+
+    @staticmethod
+    def is_chunked_dir(path: Path) -> bool:
+        """Check if a directory is created with :py:meth:`FMesh.save_2_chunked`.
+
+        Parameters
+        ----------
+        path
+            directory to check
+
+        Returns
+        -------
+        True, if the directory contains chunked FMesh.
+        """
+        return (path / "data").is_dir() and (path / "meta.npy").is_file()
+
+    @property
+    def name(self) -> int:
+        """Mesh tally number."""
+        return self._header.name
+
+    @property
+    def kind(self) -> Kind:
+        """Particle kind."""
+        return Kind(self._header.kind)
+
+    @property
+    def comment(self) -> str | None:
+        """Mesh tally comment."""
+        return self._header.comment
+
+    @property
+    def geometry_spec(self) -> gc.CartesianGeometrySpec | gc.CylinderGeometrySpec:
+        """Spatial bins specification."""
+        return self._header.geometry_spec
+
+    @property
+    def e(self) -> NDArray:
+        """Energy bins."""
+        return self._header.ebins
+
+    @property
+    def ibins(self) -> NDArray:
+        """Bins along the first spatial axis (X or R)."""
+        return self.geometry_spec.ibins
+
+    @property
+    def jbins(self) -> NDArray:
+        """Bins along the second spatial axis (Y or Z)."""
+        return self.geometry_spec.jbins
+
+    @property
+    def kbins(self) -> NDArray:
+        """Bins along the third spatial axis (Z or Theta)."""
+        return self.geometry_spec.kbins
+
+    def load(self) -> FMesh:
+        """Read all the chunks.
+
+        Returns
+        -------
+        The FMesh object in memory.
+        """
+        header = self._header
+        return FMesh(
+            header.name,
+            header.kind,
+            header.geometry_spec,
+            header.ebins,
+            self.data[...],
+            self.errors[...],
+            None if self.totals is None else self.totals[...],
+            None if self.totals_err is None else self.totals_err[...],
+            comment=header.comment,
+        )
+
+    def select_indexes(
+        self,
+        *,
+        x: ArrayLike | None = None,
+        y: ArrayLike | None = None,
+        z: ArrayLike | None = None,
+    ) -> tuple[int | slice | np.ndarray, int | slice | np.ndarray, int | slice | np.ndarray]:
+        """Select indexes in spatial bins corresponding to given coordinates.
+
+        See :py:meth:`FMesh.select_indexes`.
+
+        Parameters
+        ----------
+        x
+            (Default value = None)
+        y
+            (Default value = None)
+        z
+            (Default value = None)
+
+        Returns
+        -------
+        tuple of indexes along the coordinates
+        """
+        return self.geometry_spec.select_indexes(i_values=x, j_values=y, k_values=z)
+
+    def get_spectrum(
+        self,
+        x: float,
+        y: float,
+        z: float,
+    ) -> tuple[ArrayLike, ArrayLike, ArrayLike] | None:
+        """Get energy spectrum at the specified point reading only the chunks along energy.
+
+        See :py:meth:`FMesh.get_spectrum`.
+
+        Parameters
+        ----------
+        x
+            X, Y and Z coordinate of the point where energy spectrum is required.
+        y
+            ...
+        z
+            ...
+
+        Returns
+        -------
+        ebins, data, err or None, if the point is out of the mesh
+        """
+        indexes = []
+        for bins, value in zip((self.ibins, self.jbins, self.kbins), (x, y, z), strict=True):
+            index = np.searchsorted(bins, value) - 1
+            if index < 0 or index >= bins.size - 1:
+                return None
+            indexes.append(int(index))
+        i, j, k = indexes
+        return self.e, self.data[:, i, j, k], self.errors[:, i, j, k]
+
+    def get_totals(
+        self,
+        *,
+        x: ArrayLike | None = None,
+        y: ArrayLike | None = None,
+        z: ArrayLike | None = None,
+    ) -> tuple[np.ndarray, np.ndarray] | None:
+        """Get total values for specified grid points reading only the touched chunks.
+
+        See :py:meth:`FMesh.get_totals`.
+
+        Parameters
+        ----------
+        x
+            (Default value = None)
+        y
+            (Default value = None)
+        z
+            (Default value = None)
+
+        Returns
+        -------
+        totals, total_err for the specified coordinates
+        """
+        if self.totals is None or self.totals_err is None:
+            return None
+        key = self.select_indexes(x=x, y=y, z=z)
+        return self.totals.select(key), self.totals_err.select(key)
+
+    def shrink(
+        self,
+        *,
+        emin=None,
+        emax=None,
+        xmin=None,
+        xmax=None,
+        ymin=None,
+        ymax=None,
+        zmin=None,
+        zmax=None,
+        new_name=-1,
+    ) -> FMesh:
+        """Select subset of e-voxels within given geometry and energy limits.
+
+        Reads only the chunks overlapping the selected sub-box.
+        See :py:meth:`FMesh.shrink`, on cylinder meshes as well.
+
+        Parameters
+        ----------
+        emin
+            min energy
+        emax
+            max enegry
+        xmin
+            (Default value = None)
+        xmax
+            (Default value = None)
+        ymin
+            (Default value = None)
+        ymax
+            (Default value = None)
+        zmin
+            (Default value = None)
+        zmax
+            (Default value = None)
+        new_name
+            name for mesh to be created, default -1.
+
+        Returns
+        -------
+        A new FMesh with reduced bins.
+        """
+        new_bins = []
+        selection = []
+        period = _theta_period(self.geometry_spec)
+        for bins, low, high, axis_period in zip(
+            (self.e, self.ibins, self.jbins, self.kbins),
+            (emin, xmin, ymin, zmin),
+            (emax, xmax, ymax, zmax),
+            (None, None, None, period),
+            strict=True,
+        ):
+            # Shrink indexes instead of values to find the selection.
+            shrunk_bins, indexes = rebin.shrink_1d(
+                np.arange(bins.size - 1), bins, low, high, assume_sorted=True, period=axis_period
+            )
+            new_bins.append(shrunk_bins)
+            # Theta range crossing the revolution end is selected in two parts.
+            parts = np.split(indexes, np.flatnonzero(np.diff(indexes) != 1) + 1)
+            selection.append([slice(part[0], part[-1] + 1) for part in parts])
+        new_ebins, new_xbins, new_ybins, new_zbins = new_bins
+        *box, theta_parts = selection
+
+        def select(a: ChunkedArray) -> NDArray:
+            key = tuple(parts[0] for parts in box[4 - a.ndim :])
+            chunks = [a[(*key, part)] for part in theta_parts]
+            return chunks[0] if len(chunks) == 1 else np.concatenate(chunks, axis=-1)
+
+        if self.totals is None or self.totals_err is None:
+            new_totals = None
+            new_totals_err = None
+        else:
+            new_totals = select(self.totals)
+            new_totals_err = select(self.totals_err)
+        return FMesh(
+            new_name,
+            self.kind,
+            self.geometry_spec.with_bins(new_xbins, new_ybins, new_zbins),
+            new_ebins,
+            select(self.data),
+            select(self.errors),
+            new_totals,
+            new_totals_err,
+        )
+
+
+def npz_2_chunked(
+    npz: Path,
+    out: Path | None = None,
+    check_existing_file_strategy=raise_error_when_file_exists_strategy,
+    *,
+    chunks: tuple[int, int, int, int] = FMesh.DEFAULT_CHUNKS,
+    level: int = DEFAULT_COMPRESSION_LEVEL,
+) -> Path:
+    """Convert FMesh npz file to chunked storage.
+
+    Parameters
+    ----------
+    npz
+        file to convert
+    out
+        output directory, default - `npz` with suffix :py:attr:`FMesh.CHUNKED_DIR_SUFFIX`
+    check_existing_file_strategy
+        what to do if the output directory already exists
+    chunks
+        chunk shape (energy, i, j, k)
+    level
+        zlib compression level
+
+    Returns
+    -------
+    The output directory.
+    """
+    if out is None:
+        out = npz
+    out = out.with_suffix(FMesh.CHUNKED_DIR_SUFFIX)
+    FMesh.load_npz(npz).save_2_chunked(
+        out, check_existing_file_strategy, chunks=chunks, level=level
+    )
+    return out
+
+
+# noinspection PyTypeChecker,PyProtectedMember
+def iter_fmesh_headers(
+    paths: Iterable[Path], *, skip_invalid: bool = False
+) -> Iterator[tuple[Path, FMeshHeader]]:
+    """Read descriptions of stored meshes without loading the values.
+
+    Parameters
+    ----------
+    paths
+        npz files, .npy or chunked directories
+    skip_invalid
+        log and skip the files, which cannot be read, otherwise raise
+
+    Yields
+    ------
+    The paths with the corresponding mesh descriptions.
+
+    Raises
+    ------
+    FMesh.FMeshError
+        if a file cannot be read and `skip_invalid` is False.
+    """
+    for path in paths:
+        try:
+            header = FMesh.load_header(path)
+        except FMesh.FMeshError as ex:
+            if not skip_invalid:
+                raise
+            __LOG.warning("Skipping %s: %s", path, ex)
+        else:
+            yield path, header
+
+
+def merge_tallies(
+    name: int,
+    kind: int,
+    *tally_weight: tuple[FMesh, float],
+    comment: str | None = None,
+) -> FMesh:
+    """Make superposition of tallies with specific weights.
+
+    Parameters
+    ----------
+    name
+        Name of new fmesh tally.
+    kind
+        Type of new fmesh tally. It can be -1 (or any arbitrary integer).
+    tally_weight
+        List of tally-weight pairs (tuples). tally is FMesh instance. weight is float.
+    comment
+        A comment to assign to the new mesh tally
+
+    Returns
+    -------
+    The merged FMesh.
+    """
+    result_data = None
+    errors = None
+    geometry_spec = None
+    ebins = None
+    for t, w in tally_weight:
+        if result_data is None:
+            result_data = t.data * w
+            errors = (t.errors * t.data * w) ** 2
             geometry_spec = t._geometry_spec
             ebins = t.e
         else:
@@ -1048,219 +1900,705 @@ def merge_tallies(
     )
 
 
-def read_meshtal(stream: TextIO, select=None, mesh_file_info=None) -> list[FMesh]:
-    """Read fmesh tallies from a stream.
+def read_meshtal(
+    stream: TextIO,
+    select=None,
+    mesh_file_info=None,
+    *,
+    engine: MeshtalEngine = "numpy",
+    index: MeshtalIndex | None = None,
+) -> list[FMesh]:
+    """Read fmesh tallies from a stream.
+
+    Parameters
+    ----------
+    stream
+        The text stream to read.
+    select
+        Selects the meshes actually to process (Default value = None)
+    mesh_file_info
+        object to collect information from m-file header (Default value = None)
+    engine
+        parser engine for value blocks, see :py:data:`MeshtalEngine`
+    index
+        byte offsets of the tallies in the `stream`, see :py:func:`iter_meshtal`
+
+    Returns
+    -------
+    The list of individual fmesh tally.
+    """
+    nps = _read_nps(stream, index)
+    if mesh_file_info is not None:
+        mesh_file_info.nps = nps
+    return list(iter_meshtal(stream, select, engine=engine, index=index))
+
+
+def _read_nps(stream: TextIO, index: MeshtalIndex | None) -> int:
+    """Read number of histories from meshtal file header.
+
+    Parameters
+    ----------
+    stream
+        The text stream positioned at the file start.
+    index
+        if given, take NPS from the index and don't read the stream
+
+    Returns
+    -------
+    Number of histories.
+    """
+    if index is not None:
+        return index.nps
+    next(stream)  # TODO dvp check if we need to store problem time stamp
+    next(stream)  # TODO dvp check if we need to store problem title
+    line = next(stream)
+    return int(float(line.strip().split("=")[1]))
+
+
+def _iterate_bins(stream, _n):
+    """Parse line with mesh values.
+
+    Parameters
+    ----------
+    stream
+        stream of strings
+    _n
+        number of items
+    _with_ebins
+        are ebins specified
+
+    Yields
+    ------
+    pairs value - error
+    """
+    for _ in range(_n):
+        __line = next(stream).strip()
+        _line = __line[-24:]  # space of minus, 11 chars - value, space or minus, 11 chars error
+        _value = float(_line[:-12])
+        _error = float(_line[-12:])
+        if _value < 0.0 or _error < 0.0:
+            __LOG.warning("Negative values in mesh, line: %s", __line)
+            _value = _error = 0.0
+        yield _value
+        yield _error
+
+
+def _parse_e_fields(columns: Sequence[NDArray[np.uint8]]) -> NDArray[np.float64]:
+    """Convert fixed width fields like " 1.23456E-03" to floats.
+
+    MCNP prints mesh values with Fortran format 1PE12.5. The digits of such fields
+    are decoded with vectorized integer arithmetic. The result is exactly the same
+    as from :py:func:`float`: both the mantissa and the power of ten are exact
+    float numbers, so the only rounding is on the final multiplication or division.
+    The fields of other layout and with large exponents are converted with generic
+    NumPy string conversion.
+
+    Parameters
+    ----------
+    columns
+        12 arrays of the same size: i-th array contains i-th bytes of the fields
+
+    Returns
+    -------
+    Array of floats.
+    """
+    sign, d0, dot, d1, d2, d3, d4, d5, e, exponent_sign, e0, e1 = columns
+    digits = [x - np.uint8(48) for x in (d0, d1, d2, d3, d4, d5, e0, e1)]
+    valid = (sign == ord(" ")) | (sign == ord("-"))
+    valid &= dot == ord(".")
+    valid &= (e | np.uint8(0x20)) == ord("e")
+    valid &= (exponent_sign == ord("+")) | (exponent_sign == ord("-"))
+    for d in digits:
+        valid &= d <= 9
+    m0, m1, m2, m3, m4, m5, x0, x1 = digits
+    mantissa = ((((m0 * 10.0 + m1) * 10.0 + m2) * 10.0 + m3) * 10.0 + m4) * 10.0 + m5
+    exponent = x0 * np.int16(10) + x1
+    shift = np.where(exponent_sign == ord("-"), -exponent, exponent) - np.int16(5)
+    distance = np.abs(shift)
+    valid &= distance < _EXACT_POWERS_OF_TEN.size
+    scale = _EXACT_POWERS_OF_TEN[np.minimum(distance, _EXACT_POWERS_OF_TEN.size - 1)]
+    result = np.where(shift < 0, mantissa / scale, mantissa * scale)
+    np.negative(result, out=result, where=sign == ord("-"))
+    invalid = ~valid
+    if invalid.any():
+        fields = np.stack([c[invalid] for c in columns], axis=-1)
+        result[invalid] = fields.view("S12").ravel().astype(float)
+    return result
+
+
+def _decode_value_lines(
+    buffer: bytes | memoryview,
+    lines_number: int,
+    *,
+    fix_negatives: bool = True,
+    out: tuple[NDArray[np.float64], NDArray[np.float64]] | None = None,
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Decode the last two columns of meshtal value lines.
+
+    The lines are taken as fixed width from their ends: space or minus, 11 chars - value,
+    space or minus, 11 chars - relative error.
+
+    The buffer is processed by chunks of about :py:data:`_DECODE_CHUNK_SIZE` bytes,
+    so the memory used for temporary arrays doesn't depend on the buffer size.
+
+    Parameters
+    ----------
+    buffer
+        text of exactly `lines_number` lines, the last newline is optional
+    lines_number
+        the expected number of lines
+    fix_negatives
+        log and zero entries with negative values as on line by line parsing
+    out
+        preallocated 1D arrays of size `lines_number` to store values and errors,
+        for example, :py:class:`numpy.memmap`, default - allocate new arrays
+
+    Returns
+    -------
+    Arrays of values and relative errors (`out`, if given).
+
+    Raises
+    ------
+    FMesh.FMeshError
+        if the number of lines in the `buffer` differs from `lines_number`.
+    """
+    raw = np.frombuffer(buffer, dtype=np.uint8)
+    if out is None:
+        out = np.empty(lines_number, dtype=float), np.empty(lines_number, dtype=float)
+    values, errors = out
+    pos = line = 0
+    chunk_size = _DECODE_CHUNK_SIZE
+    while pos < raw.size:
+        stop = min(pos + chunk_size, raw.size)
+        ends = np.flatnonzero(raw[pos:stop] == _NEW_LINE)
+        ends += pos
+        if stop == raw.size and raw[-1] != _NEW_LINE:
+            ends = np.append(ends, raw.size)
+        if not ends.size:  # a line longer than the chunk
+            chunk_size *= 2
+            continue
+        if line + ends.size > lines_number:
+            line += np.count_nonzero(raw[pos:] == _NEW_LINE) + (raw[-1] != _NEW_LINE)
+            break
+        chunk = slice(line, line + ends.size)
+        _decode_lines_chunk(
+            raw,
+            pos,
+            ends,
+            values=values[chunk],
+            errors=errors[chunk],
+            fix_negatives=fix_negatives,
+        )
+        line += ends.size
+        pos = ends[-1] + 1
+    if line != lines_number:
+        msg = f"Expected {lines_number} lines with mesh values, found {line}"
+        raise FMesh.FMeshError(msg)
+    return values, errors
+
+
+def _decode_lines_chunk(
+    raw: NDArray[np.uint8],
+    start: int,
+    ends: NDArray[np.intp],
+    *,
+    values: NDArray[np.float64],
+    errors: NDArray[np.float64],
+    fix_negatives: bool,
+) -> None:
+    """Decode lines from a chunk of text.
+
+    Parameters
+    ----------
+    raw
+        the text
+    start
+        the first line start
+    ends
+        the lines ends, excluding new line characters
+    values, errors
+        output arrays of size `ends.size`
+    fix_negatives
+        log and zero entries with negative values
+
+    Raises
+    ------
+    FMesh.FMeshError
+        if a line is too short to contain the value and error fields.
+    """
+    new_lines = ends
+    starts = np.concatenate(([start], new_lines[:-1] + 1))
+    while True:
+        trailing = (ends > starts) & np.isin(raw[ends - 1], _TRAILING_BLANKS)
+        if not trailing.any():
+            break
+        ends = ends - trailing
+    short = ends - starts < _FIELDS_WIDTH
+    if short.any():
+        i = np.flatnonzero(short)[0]
+        line = bytes(raw[starts[i] : new_lines[i]]).decode(errors="replace").rstrip()
+        msg = f"Too short line with mesh values: {line!r}"
+        raise FMesh.FMeshError(msg)
+    lines_number = ends.size
+    line_length = new_lines[0] + 1 - start
+    if np.array_equal(ends, ends[0] + line_length * np.arange(lines_number)):
+        # All the lines are of the same length, as usual for MCNP output: copy strided rows.
+        fields = np.array(
+            np.lib.stride_tricks.as_strided(
+                raw[ends[0] - _FIELDS_WIDTH :],
+                shape=(lines_number, _FIELDS_WIDTH),
+                strides=(line_length, 1),
+                writeable=False,
+            )
+        )
+    else:
+        fields = raw[ends[:, np.newaxis] + np.arange(-_FIELDS_WIDTH, 0)]
+    columns = np.ascontiguousarray(fields.T)
+    half = _FIELDS_WIDTH // 2
+    values[:] = _parse_e_fields(columns[:half])
+    errors[:] = _parse_e_fields(columns[half:])
+    if not fix_negatives:
+        return
+    negative = (values < 0.0) | (errors < 0.0)
+    if negative.any():
+        for i in np.flatnonzero(negative):
+            line = bytes(raw[starts[i] : ends[i]]).decode().strip()
+            __LOG.warning("Negative values in mesh, line: %s", line)
+        values[negative] = 0.0
+        errors[negative] = 0.0
+
+
+def _read_value_lines(
+    stream: Iterable[str], lines_number: int, *, totals: bool = False
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Read `lines_number` lines from a text stream and decode them by chunks.
+
+    Parameters
+    ----------
+    stream
+        sequence or stream of strings
+    lines_number
+        number of lines to read
+    totals
+        the lines are "Total" lines
+
+    Returns
+    -------
+    Arrays of values and relative errors.
+    """
+    values, errors = np.empty(lines_number, dtype=float), np.empty(lines_number, dtype=float)
+    for start in range(0, lines_number, _READ_CHUNK_LINES):
+        stop = min(start + _READ_CHUNK_LINES, lines_number)
+        text = "".join(islice(stream, stop - start)).encode()
+        if totals:
+            assert text.count(b"Total") == stop - start
+        _decode_value_lines(
+            text,
+            stop - start,
+            # TODO dvp: check for negative values in an MCNP meshtal file
+            fix_negatives=not totals,
+            out=(values[start:stop], errors[start:stop]),
+        )
+    return values, errors
+
+
+# noinspection PyTypeChecker
+def iter_meshtal(
+    fid: TextIO,
+    name_select: Callable[[int], bool] | None = None,
+    tally_select: Callable[[FMesh], bool] | None = None,
+    *,
+    engine: MeshtalEngine = "numpy",
+    index: MeshtalIndex | None = None,
+) -> Generator[FMesh]:
+    """Iterate fmesh tallies from stream.
+
+    Parameters
+    ----------
+    fid
+        A stream to read meshes from.
+    name_select
+        A function returning True, if tally name is acceptable,
+        otherwise skips tally reading and parsing
+    tally_select
+        A function returning True, if total tally content is acceptable
+    engine
+        parser engine for value blocks, see :py:data:`MeshtalEngine`
+    index
+        byte offsets of the tallies in the file `fid` is opened on, if given,
+        the selected tallies are read seeking directly to their headers,
+        the others are not even scanned; the meshtal files are ASCII,
+        so the byte offsets are valid positions for text streams
+
+    Yields
+    ------
+    Mesh tallies filtered.
+    """
+    if index is not None:
+        for entry in index.select(name_select):
+            fid.seek(entry.header)
+            fid.readline()
+            res = _read_mesh(fid, entry.name, engine)
+            if not tally_select or tally_select(res):
+                yield res
+            else:
+                __LOG.debug("Skipping mesh tally %s", entry.name)
+        return
+    try:
+        while True:
+            # Skip first two comment lines ms version and model title
+            # noinspection PyUnresolvedReferences
+            name = _find_next_mesh_name(fid)
+            if not name_select or name_select(name):
+                res = _read_mesh(fid, name, engine)
+                if not tally_select or tally_select(res):
+                    yield res
+                else:
+                    __LOG.debug("Skipping mesh tally %s", name)
+    except EOFError:
+        pass
+
+
+def iter_meshtal_mmap(
+    path: Path,
+    name_select: Callable[[int], bool] | None = None,
+    tally_select: Callable[[FMesh], bool] | None = None,
+    *,
+    index: MeshtalIndex | None = None,
+    npy_dir: Path | None = None,
+) -> Generator[FMesh]:
+    """Iterate fmesh tallies from a memory mapped meshtal file.
+
+    The value blocks are decoded directly from the mapped bytes,
+    only the short tally descriptions are decoded to text.
+    So, the memory used is about the size of the arrays produced, not the file size.
+
+    Parameters
+    ----------
+    path
+        meshtal file
+    name_select
+        A function returning True, if tally name is acceptable,
+        otherwise the tally is not even read
+    tally_select
+        A function returning True, if total tally content is acceptable
+    index
+        byte offsets of the tallies in the file, default - use :py:func:`index_meshtal`
+    npy_dir
+        if given, the mesh arrays are decoded directly to .npy files in this directory
+        ("<name>-data.npy", "<name>-errors.npy" and so on) and the meshes yielded
+        are backed by the files mapped to memory; use this for tallies larger than RAM
+
+    Yields
+    ------
+    Mesh tallies filtered.
+    """
+    if path.stat().st_size == 0:  # cannot be memory mapped, as iter_meshtal yields nothing
+        return
+    if index is None:
+        index = index_meshtal(path)
+    with path.open("rb") as fid, mmap.mmap(fid.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for entry in index.select(name_select):
+            res = _read_mesh_from_buffer(mm, entry, npy_dir)
+            if not tally_select or tally_select(res):
+                yield res
+            else:
+                __LOG.debug("Skipping mesh tally %s", entry.name)
+
+
+def _read_mesh_from_buffer(
+    mm: mmap.mmap, entry: TallyOffsets, npy_dir: Path | None = None
+) -> FMesh:
+    """Parse a mesh tally from a memory mapped meshtal file.
+
+    Parameters
+    ----------
+    mm
+        meshtal file content
+    entry
+        the mesh tally offsets
+    npy_dir
+        directory to store the mesh arrays as .npy files mapped to memory,
+        see :py:func:`iter_meshtal_mmap`
+
+    Returns
+    -------
+    The parsed mesh tally.
+    """
+    description = mm[entry.header : entry.values].decode().splitlines()
+    header = _read_mesh_header(iter(description[1:]), entry.name)
+    spatial_shape = header.geometry_spec.bins_shape
+    shape = (header.ebins.size - 1, *spatial_shape)
+    values_end = _rstrip_blanks(mm, entry.values, entry.totals)
+    totals_end = _rstrip_blanks(mm, entry.totals, entry.end)
+    with memoryview(mm) as view:
+        try:
+            data = _allocate_values(npy_dir, entry.name, "data", shape)
+            errors = _allocate_values(npy_dir, entry.name, "errors", shape)
+            _decode_value_lines(
+                view[entry.values : values_end],
+                data.size,
+                out=(data.reshape(-1), errors.reshape(-1)),
+            )
+            if header.ebins.size > 2:  # Totals are not output if there's only one energy bin
+                totals = _allocate_values(npy_dir, entry.name, "totals", spatial_shape)
+                totals_err = _allocate_values(npy_dir, entry.name, "totals_err", spatial_shape)
+                _decode_value_lines(
+                    view[entry.totals : totals_end],
+                    totals.size,
+                    fix_negatives=False,
+                    out=(totals.reshape(-1), totals_err.reshape(-1)),
+                )
+                totals_items = totals, totals_err
+            else:
+                totals_items = None
+        except Exception as ex:
+            # The traceback frames refer the mapped memory and prevent the file closing.
+            traceback.clear_frames(ex.__traceback__)
+            raise
+    return _make_mesh(entry.name, header, (data, errors), totals_items)
+
+
+def _allocate_values(
+    npy_dir: Path | None, name: int, part: str, shape: tuple[int, ...]
+) -> NDArray[np.float64]:
+    """Allocate an array for mesh values in memory or in a .npy file mapped to memory.
+
+    Parameters
+    ----------
+    npy_dir
+        directory for .npy files, if None - allocate in memory
+    name
+        mesh tally number
+    part
+        what the array is for: "data", "errors", "totals" or "totals_err"
+    shape
+        the array shape
+
+    Returns
+    -------
+    Uninitialized array.
+    """
+    if npy_dir is None:
+        return np.empty(shape, dtype=float)
+    return np.lib.format.open_memmap(
+        npy_dir / f"{name}-{part}.npy", mode="w+", dtype=float, shape=shape
+    )
+
+
+def _rstrip_blanks(mm: mmap.mmap, start: int, end: int) -> int:
+    """Exclude trailing blank lines from a block of lines.
 
     Parameters
     ----------
-    stream
-        The text stream to read.
-    select
-        Selects the meshes actually to process (Default value = None)
-    mesh_file_info
-        object to collect information from m-file header (Default value = None)
+    mm
+        meshtal file content
+    start, end
+        the block boundaries
 
     Returns
     -------
-    The list of individual fmesh tally.
+    The end of the last non-blank character in the block.
     """
-    next(stream)  # TODO dvp check if we need to store problem time stamp
-    next(stream)  # TODO dvp check if we need to store problem title
-    line = next(stream)
-    nps = int(float(line.strip().split("=")[1]))
-    if mesh_file_info is not None:
-        mesh_file_info.nps = nps
-    return list(iter_meshtal(stream, select))
+    while start < end and mm[end - 1] in _BLANKS:
+        end -= 1
+    return end
 
 
-def _iterate_bins(stream, _n):
-    """Parse line with mesh values.
+class _MeshHeader(NamedTuple):
+    kind: Kind
+    comment: str | None
+    geometry_spec: GeometrySpec
+    ebins: NDArray[np.float64]
+
+
+def _read_mesh_header(fid: Iterator[str], name: int) -> _MeshHeader:
+    """Parse a mesh tally description up to the values title line inclusive.
 
     Parameters
     ----------
-    stream
-        stream of strings
-    _n
-        number of items
-    _with_ebins
-        are ebins specified
+    fid
+        A stream positioned right after the mesh tally header line.
+    name
+        The mesh tally number from the header line.
 
-    Yields
-    ------
-    pairs value - error
+    Returns
+    -------
+    The mesh tally kind, comment, geometry and energy bins.
     """
-    for _ in range(_n):
-        __line = next(stream).strip()
-        _line = __line[-24:]  # space of minus, 11 chars - value, space or minus, 11 chars error
-        _value = float(_line[:-12])
-        _error = float(_line[-12:])
-        if _value < 0.0 or _error < 0.0:
-            __LOG.warning("Negative values in mesh, line: %s", __line)
-            _value = _error = 0.0
-        yield _value
-        yield _error
+    line: str = next(fid).strip()
+    if line.startswith("This is a"):
+        comment = None
+        kind_str = line.split()[3]
+    else:
+        comment = line
+        # noinspection PyUnresolvedReferences
+        kind_str = _find_words_after(fid, "This", "is", "a")[0]
 
+    if comment:
+        comment = fix_mesh_comment(name, comment)
 
-# noinspection PyTypeChecker
-def iter_meshtal(
-    fid: TextIO,
-    name_select: Callable[[int], bool] | None = None,
-    tally_select: Callable[[FMesh], bool] | None = None,
-) -> Generator[FMesh]:
-    """Iterate fmesh tallies from stream.
+    kind = Kind[kind_str]
+
+    # TODO dvp read "dose function modified" here
+
+    _find_words_after(fid, "Tally", "bin", "boundaries:")
+
+    line = next(fid).lstrip()
+    if line.startswith("Cylinder"):
+        # retrieve cylinder origin and axis
+        part1, part2 = line.split(",")
+        origin = np.fromiter(part1.split()[3:6], dtype=float)
+        axis = np.fromiter(part2.split()[2:5], dtype=float)
+        ibins = np.array(
+            [float(w) for w in _find_words_after(concatv([line], fid), "R", "direction:")],
+        )
+
+        jbins = np.array([float(w) for w in _find_words_after(fid, "Z", "direction:")])
+
+        kbins = np.array(
+            [float(w) for w in _find_words_after(fid, "Theta", "direction", "(revolutions):")],
+        )
+
+        geometry_spec: GeometrySpec = gc.CylinderGeometrySpec(
+            ibins,
+            jbins,
+            kbins,
+            origin=origin,
+            axs=axis,
+        )
+
+        ebins = np.array(
+            [float(w) for w in _find_words_after(fid, "Energy", "bin", "boundaries:")],
+        )
+        _with_ebins = check_ebins(
+            fid,
+            ["Energy", "R", "Z", "Th", "Result", "Rel", "Error"],
+        )
+    else:
+        xbins = np.array(
+            [float(w) for w in _find_words_after(concatv([line], fid), "X", "direction:")],
+        )
+
+        ybins = np.array([float(w) for w in _find_words_after(fid, "Y", "direction:")])
+
+        zbins = np.array([float(w) for w in _find_words_after(fid, "Z", "direction:")])
+
+        geometry_spec = gc.CartesianGeometrySpec(xbins, ybins, zbins)
+
+        ebins = np.array(
+            [float(w) for w in _find_words_after(fid, "Energy", "bin", "boundaries:")],
+        )
+        _with_ebins = check_ebins(
+            fid,
+            ["Energy", "X", "Y", "Z", "Result", "Rel", "Error"],
+        )
+
+    return _MeshHeader(kind, comment, geometry_spec, ebins)
+
+
+def _read_mesh(fid: TextIO, name: int, engine: MeshtalEngine) -> FMesh:
+    """Parse a mesh tally following the line "Mesh Tally Number".
 
     Parameters
     ----------
     fid
-        A stream to read meshes from.
-    name_select
-        A function returning True, if tally name is acceptable,
-        otherwise skips tally reading and parsing
-    tally_select
-        A function returning True, if total tally content is acceptable
+        A stream positioned right after the mesh tally header line.
+    name
+        The mesh tally number from the header line.
+    engine
+        parser engine for value blocks, see :py:data:`MeshtalEngine`
 
-    Yields
-    ------
-    Mesh tallies filtered.
+    Returns
+    -------
+    The parsed mesh tally.
     """
-    try:
-        while True:
-            # Skip first two comment lines ms version and model title
-            # noinspection PyUnresolvedReferences
-            name = int(_find_words_after(fid, "Mesh", "Tally", "Number")[0])
-            if not name_select or name_select(name):
-                line: str = fid.readline().strip()
-                if line.startswith("This is a"):
-                    comment = None
-                    kind_str = line.split()[3]
-                else:
-                    comment = line
-                    # noinspection PyUnresolvedReferences
-                    kind_str = _find_words_after(fid, "This", "is", "a")[0]
-
-                if comment:
-                    comment = fix_mesh_comment(name, comment)
-
-                kind = Kind[kind_str]
-
-                # TODO dvp read "dose function modified" here
-
-                _find_words_after(fid, "Tally", "bin", "boundaries:")
-
-                line = next(fid).lstrip()
-                if line.startswith("Cylinder"):
-                    # retrieve cylinder origin and axis
-                    part1, part2 = line.split(",")
-                    origin = np.fromiter(part1.split()[3:6], dtype=float)
-                    axis = np.fromiter(part2.split()[2:5], dtype=float)
-                    ibins = np.array(
-                        [
-                            float(w)
-                            for w in _find_words_after(concatv([line], fid), "R", "direction:")
-                        ],
-                    )
-
-                    jbins = np.array([float(w) for w in _find_words_after(fid, "Z", "direction:")])
-
-                    kbins = np.array(
-                        [
-                            float(w)
-                            for w in _find_words_after(fid, "Theta", "direction", "(revolutions):")
-                        ],
-                    )
-
-                    geometry_spec: GeometrySpec = gc.CylinderGeometrySpec(
-                        ibins,
-                        jbins,
-                        kbins,
-                        origin=origin,
-                        axs=axis,
-                    )
-
-                    ebins = np.array(
-                        [float(w) for w in _find_words_after(fid, "Energy", "bin", "boundaries:")],
-                    )
-                    _with_ebins = check_ebins(
-                        fid,
-                        ["Energy", "R", "Z", "Th", "Result", "Rel", "Error"],
-                    )
-                else:
-                    xbins = np.array(
-                        [
-                            float(w)
-                            for w in _find_words_after(concatv([line], fid), "X", "direction:")
-                        ],
-                    )
-
-                    ybins = np.array([float(w) for w in _find_words_after(fid, "Y", "direction:")])
-
-                    zbins = np.array([float(w) for w in _find_words_after(fid, "Z", "direction:")])
-
-                    geometry_spec = gc.CartesianGeometrySpec(xbins, ybins, zbins)
-
-                    ebins = np.array(
-                        [float(w) for w in _find_words_after(fid, "Energy", "bin", "boundaries:")],
-                    )
-                    _with_ebins = check_ebins(
-                        fid,
-                        ["Energy", "X", "Y", "Z", "Result", "Rel", "Error"],
-                    )
-
-                spatial_bins_size = geometry_spec.bins_size
-                bins_size = spatial_bins_size * (ebins.size - 1)
-
-                data_items = np.fromiter(_iterate_bins(fid, bins_size), dtype=float)
-                data_items = data_items.reshape(bins_size, 2)
-                shape = (ebins.size - 1, *geometry_spec.bins_shape)
-                data, error = data_items[:, 0].reshape(shape), data_items[:, 1].reshape(shape)
-
-                def _iterate_totals(stream, totals_number):
-                    """Read totals.
-
-                    Parameters
-                    ----------
-                    stream
-                        sequence or stream of strings
-                    totals_number
-                        number of items to read
-
-                    Yields
-                    ------
-                        total values and errors
-                    """
-                    for _ in range(totals_number):
-                        _line = next(stream).split()
-                        # TODO dvp: check for negative values in an MCNP meshtal file
-                        assert _line[0] == "Total"
-                        for w in _line[4:]:
-                            yield float(w)
-
-                if ebins.size > 2:  # Totals are not output if there's only one bin in energy domain
-                    totals_items = np.fromiter(_iterate_totals(fid, spatial_bins_size), dtype=float)
-                    totals_items = totals_items.reshape(spatial_bins_size, 2)
-                    totals_shape = geometry_spec.bins_shape
-                    totals = totals_items[:, 0].reshape(totals_shape)
-                    totals_err = totals_items[:, 1].reshape(totals_shape)
-                else:
-                    totals = None
-                    totals_err = None
-                res = FMesh(
-                    name,
-                    kind,
-                    geometry_spec,
-                    ebins,
-                    data,
-                    error,
-                    totals,
-                    totals_err,
-                    comment=comment,
-                )
-                if not tally_select or tally_select(res):
-                    yield res
-                else:
-                    __LOG.debug("Skipping mesh tally %s", name)
-    except EOFError:
-        pass
+    header = _read_mesh_header(fid, name)
+    spatial_bins_size = header.geometry_spec.bins_size
+    bins_size = spatial_bins_size * (header.ebins.size - 1)
+
+    if engine == "numpy":
+        data_items = _read_value_lines(fid, bins_size)
+    else:
+        items = np.fromiter(_iterate_bins(fid, bins_size), dtype=float).reshape(bins_size, 2)
+        data_items = items[:, 0], items[:, 1]
+
+    def _iterate_totals(stream, totals_number):
+        """Read totals.
+
+        Parameters
+        ----------
+        stream
+            sequence or stream of strings
+        totals_number
+            number of items to read
+
+        Yields
+        ------
+            total values and errors
+        """
+        for _ in range(totals_number):
+            _line = next(stream).split()
+            # TODO dvp: check for negative values in an MCNP meshtal file
+            assert _line[0] == "Total"
+            for w in _line[4:]:
+                yield float(w)
+
+    if header.ebins.size > 2:  # Totals are not output if there's only one bin in energy domain
+        if engine == "numpy":
+            totals_items = _read_value_lines(fid, spatial_bins_size, totals=True)
+        else:
+            items = np.fromiter(_iterate_totals(fid, spatial_bins_size), dtype=float)
+            items = items.reshape(spatial_bins_size, 2)
+            totals_items = items[:, 0], items[:, 1]
+    else:
+        totals_items = None
+    return _make_mesh(name, header, data_items, totals_items)
+
+
+def _make_mesh(
+    name: int,
+    header: _MeshHeader,
+    data_items: tuple[NDArray[np.float64], NDArray[np.float64]],
+    totals_items: tuple[NDArray[np.float64], NDArray[np.float64]] | None,
+) -> FMesh:
+    """Create a mesh tally from parsed parts.
+
+    Parameters
+    ----------
+    name
+        The mesh tally number.
+    header
+        The mesh tally description.
+    data_items
+        values and relative errors, arrays of bins_size
+    totals_items
+        totals over energy and their relative errors, arrays of spatial_bins_size,
+        None if there's only one energy bin
+
+    Returns
+    -------
+    The mesh tally.
+    """
+    geometry_spec = header.geometry_spec
+    shape = (header.ebins.size - 1, *geometry_spec.bins_shape)
+    data, error = (items.reshape(shape) for items in data_items)
+    if totals_items is None:
+        totals = None
+        totals_err = None
+    else:
+        totals, totals_err = (items.reshape(geometry_spec.bins_shape) for items in totals_items)
+    return FMesh(
+        name,
+        header.kind,
+        geometry_spec,
+        header.ebins,
+        data,
+        error,
+        totals,
+        totals_err,
+        comment=header.comment,
+    )
 
 
 def check_ebins(fid: Iterable[str], keys: list[str]) -> bool:
@@ -1316,6 +2654,33 @@ def _next_not_empty_line(f: Iterable[str]) -> list[str] | None:
     return None
 
 
+def _find_next_mesh_name(f: TextIO) -> int:
+    """Skip to the next "Mesh Tally Number" line and read the tally name from it.
+
+    Unlike :py:func:`_find_words_after` doesn't split the lines skipped,
+    so the value lines of the tallies rejected on selection are passed cheaply.
+
+    Parameters
+    ----------
+    f
+        File to scan.
+
+    Returns
+    -------
+    The mesh tally number.
+
+    Raises
+    ------
+    EOFError
+        if there are no more mesh tallies in the file.
+    """
+    for line in f:
+        stripped = line.lstrip()
+        if stripped.startswith(_MESH_TALLY_NUMBER):
+            return int(stripped[len(_MESH_TALLY_NUMBER) :])
+    raise EOFError
+
+
 def _find_words_after(f: TextIO, *keywords: str) -> list[str]:
     """Search for words that follow keywords.
 
@@ -1355,6 +2720,8 @@ def m_2_npz(
     suffix: str = "",
     mesh_file_info=None,
     check_existing_file_strategy=raise_error_when_file_exists_strategy,
+    engine: MeshtalEngine = "numpy",
+    index: MeshtalIndex | None = None,
 ) -> int:
     """Split the tallies from the mesh file into separate npz files.
 
@@ -1374,20 +2741,209 @@ def m_2_npz(
         structure to store meshtal file header info: nps.
     check_existing_file_strategy
         what to do if an output file already exists
+    engine
+        parser engine for value blocks, see :py:data:`MeshtalEngine`
+    index
+        byte offsets of the tallies in the `stream`, see :py:func:`iter_meshtal`
 
     Returns
     -------
     Total number of files created
     """
-    next(stream)  # TODO dvp check if we need to store problem time stamp
-    next(stream)  # TODO dvp check if we need to store problem title
-    line = next(stream)
-    nps = int(float(line.strip().split("=")[1]))
+    nps = _read_nps(stream, index)
     __LOG.info("NPS: %d", nps)
     if mesh_file_info is not None:
         mesh_file_info.nps = nps
+    meshes = iter_meshtal(
+        stream,
+        name_select=name_select,
+        tally_select=tally_select,
+        engine=engine,
+        index=index,
+    )
+    return _save_meshes_2_npz(meshes, prefix, suffix, check_existing_file_strategy)
+
+
+def m_file_2_npz(
+    path: Path,
+    prefix: Path,
+    *,
+    name_select: Callable[[int], bool] | None = None,
+    tally_select: Callable[[FMesh], bool] | None = None,
+    suffix: str = "",
+    mesh_file_info=None,
+    check_existing_file_strategy=raise_error_when_file_exists_strategy,
+    index: MeshtalIndex | None = None,
+    jobs: int = 1,
+) -> int:
+    """Split the tallies from the mesh file into separate npz files using memory mapped reader.
+
+    Parameters
+    ----------
+    path
+        File with MCNP mesh tallies to read
+    prefix
+        Prefix for separate mesh files names
+    name_select
+        Filter fmesh by names (default: no filter)
+    tally_select
+        Filter fmesh by content. (default: no filter)
+    suffix
+        Suffix for separate mesh files names,
+        ends with :py:attr:`FMesh.NPY_DIR_SUFFIX` to save uncompressed .npy directories
+    mesh_file_info
+        structure to store meshtal file header info: nps.
+    check_existing_file_strategy
+        what to do if an output file already exists
+    index
+        byte offsets of the tallies in the file, see :py:func:`iter_meshtal_mmap`
+    jobs
+        number of processes to parse and save the tallies in parallel,
+        0 - use all CPUs, see :py:func:`m_files_2_npz`
+
+    Returns
+    -------
+    Total number of files created
+    """
+    if index is None:
+        index = index_meshtal(path)
+    __LOG.info("NPS: %d", index.nps)
+    if mesh_file_info is not None:
+        mesh_file_info.nps = index.nps
+    if jobs == 1:
+        meshes = iter_meshtal_mmap(path, name_select, tally_select, index=index)
+        return _save_meshes_2_npz(meshes, prefix, suffix, check_existing_file_strategy)
+    tasks = [
+        _NpzTask(path, entry, prefix, suffix, check_existing_file_strategy, tally_select)
+        for entry in index.select(name_select)
+    ]
+    return _run_npz_tasks(tasks, jobs)
+
+
+def m_files_2_npz(
+    sources: Iterable[tuple[Path, Path] | tuple[Path, Path, MeshtalIndex]],
+    *,
+    name_select: Callable[[int], bool] | None = None,
+    tally_select: Callable[[FMesh], bool] | None = None,
+    suffix: str = "",
+    check_existing_file_strategy=raise_error_when_file_exists_strategy,
+    jobs: int = 1,
+) -> int:
+    """Split the tallies from a number of mesh files into separate npz files.
+
+    The tallies of all the files are parsed, compressed and saved in a process pool.
+    Each tally goes to its own file, so the output doesn't depend on the order
+    the tasks are completed.
+
+    Parameters
+    ----------
+    sources
+        pairs of a meshtal file and a prefix for its npz files,
+        or triples with the file index, if it's already built
+    name_select
+        Filter fmesh by names (default: no filter)
+    tally_select
+        Filter fmesh by content. (default: no filter),
+        should be picklable (module level function) if `jobs` is not 1
+    suffix
+        Suffix for separate mesh files names, see :py:func:`m_file_2_npz`
+    check_existing_file_strategy
+        what to do if an output file already exists
+    jobs
+        number of processes, 0 - use all CPUs
+
+    Returns
+    -------
+    Total number of files created
+    """
+    tasks = []
+    for path, prefix, *known_index in sources:
+        index = known_index[0] if known_index else index_meshtal(path)
+        __LOG.info("%s, NPS: %d", path, index.nps)
+        tasks.extend(
+            _NpzTask(path, entry, prefix, suffix, check_existing_file_strategy, tally_select)
+            for entry in index.select(name_select)
+        )
+    return _run_npz_tasks(tasks, jobs)
+
+
+class _NpzTask(NamedTuple):
+    path: Path
+    entry: TallyOffsets
+    prefix: Path
+    suffix: str
+    check_existing_file_strategy: Callable[[Path], Path]
+    tally_select: Callable[[FMesh], bool] | None
+
+
+def _run_npz_tasks(tasks: list[_NpzTask], jobs: int) -> int:
+    """Convert tallies to npz files in a process pool.
+
+    Parameters
+    ----------
+    tasks
+        what to convert
+    jobs
+        number of processes, 0 - use all CPUs
+
+    Returns
+    -------
+    Total number of files created
+    """
+    processes = min(jobs or os.cpu_count() or 1, len(tasks))
+    if processes <= 1:
+        return sum(map(_tally_2_npz, tasks))
+    __LOG.info("Converting %d tallies with %d processes", len(tasks), processes)
+    with Pool(processes=processes) as pool:
+        # Large tallies go one by one, imap keeps the order of results.
+        return sum(pool.imap(_tally_2_npz, tasks))
+
+
+def _tally_2_npz(task: _NpzTask) -> int:
+    """Read a single tally from a meshtal file and save to npz file.
+
+    Parameters
+    ----------
+    task
+        what to convert
+
+    Returns
+    -------
+    Number of files created: 0 or 1
+    """
+    with task.path.open("rb") as fid, mmap.mmap(fid.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        mesh = _read_mesh_from_buffer(mm, task.entry)
+    if task.tally_select and not task.tally_select(mesh):
+        __LOG.debug("Skipping mesh tally %s", mesh.name)
+        return 0
+    return _save_meshes_2_npz([mesh], task.prefix, task.suffix, task.check_existing_file_strategy)
+
+
+def _save_meshes_2_npz(
+    meshes: Iterable[FMesh],
+    prefix: Path,
+    suffix: str,
+    check_existing_file_strategy,
+) -> int:
+    """Log meshes summary and save them to separate npz files.
+
+    Parameters
+    ----------
+    meshes
+        meshes to save
+    prefix
+        Prefix for separate mesh files names
+    suffix
+        Suffix for separate mesh files names, see :py:func:`m_file_2_npz`
+    check_existing_file_strategy
+        what to do if an output file already exists
+
+    Returns
+    -------
+    Total number of files created
+    """
     total = 0  # : ignore[SIM113]
-    for t in iter_meshtal(stream, name_select=name_select, tally_select=tally_select):
+    for t in meshes:
         __LOG.info("Tally: %s", t.name)
         if t.comment:
             __LOG.info("Comment: %s", t.comment)
@@ -1408,12 +2964,52 @@ def m_2_npz(
             non_zero_count,
             100.0 * non_zero_count / t.data.size,
         )
-        t.save_2_npz(prefix / (str(t.name) + suffix), check_existing_file_strategy)
+        t.save(prefix / (str(t.name) + suffix), check_existing_file_strategy)
         total += 1
 
     return total
 
 
+def _write_rows(
+    stream: TextIO,
+    outer: list[str],
+    inner: list[str],
+    values: NDArray,
+    errors: NDArray,
+) -> None:
+    """Write mesh values rows.
+
+    The coordinates columns are formatted once, the values are formatted
+    by chunks of rows with a single %-formatting operation per chunk.
+
+    Parameters
+    ----------
+    stream
+        where to write
+    outer
+        formatted coordinates for the leading axes of `values`
+    inner
+        formatted coordinates for the trailing axes
+    values
+        values to write, the size is ``len(outer) * len(inner)``
+    errors
+        relative errors, the same shape as `values`
+    """
+    outer_array = np.array(outer, dtype=object)
+    inner_array = np.array(inner, dtype=object)
+    row_format = "%s%s %11.5e %11.5e\n"
+    size = values.size
+    for start in range(0, size, _WRITE_CHUNK_ROWS):
+        stop = min(start + _WRITE_CHUNK_ROWS, size)
+        indexes = np.arange(start, stop)
+        args: list[object] = [None] * (4 * (stop - start))
+        args[0::4] = outer_array[indexes // inner_array.size].tolist()
+        args[1::4] = inner_array[indexes % inner_array.size].tolist()
+        args[2::4] = values.flat[start:stop].tolist()
+        args[3::4] = errors.flat[start:stop].tolist()
+        stream.write((row_format * (stop - start)) % tuple(args))
+
+
 def fix_mesh_comment(mesh_no: int, comment: str) -> str:
     """Remove digits from an FMESH comment.
 
@@ -30,12 +30,12 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Final, TextIO, cast
+from typing import TYPE_CHECKING, Final, Self, TextIO, cast
 
 import abc
 import operator
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from functools import reduce
 
 import numpy as np
@@ -43,12 +43,13 @@ import numpy.typing as npt
 
 from numpy import linalg
 
-from mckit_meshes.utils import cartesian_product, print_n
+from mckit_meshes.utils import print_n
 from mckit_meshes.utils._io import format_floats
+from mckit_meshes.utils.rebin import is_monotonically_increasing
 
 if TYPE_CHECKING:
     # noinspection PyCompatibility
-    from collections.abc import Iterable, Sequence
+    from collections.abc import Iterable, Iterator, Sequence
 
     import numpy.typing as npt
 
@@ -57,6 +58,7 @@ if TYPE_CHECKING:
 
 _2PI: Final[float] = 2.0 * np.pi
 _1_TO_2PI: Final[float] = 1 / _2PI
+_THETA_RTOL: Final[float] = 1e-12
 __DEG_2_RAD: Final[float] = np.pi / 180.0
 
 CARTESIAN_BASIS: Final[Bins] = np.eye(3, dtype=float)
@@ -114,15 +116,22 @@ class AbstractGeometrySpecData:
     kbins: Bins
 
     def __post_init__(self) -> None:
-        """Force a caller provided data as numpy arrays.
+        """Force a caller provided data as numpy arrays and check the bins order.
+
+        The bins are checked once on creation, so the rebinning and shrinking
+        methods don't check them again.
 
         Raises
         ------
         TypeError: if any of the fields is not a numpy array.
+        ValueError: if any of the bins is not monotonically increasing.
         """
         for b in self.bins:
             if not isinstance(b, np.ndarray):  # pragma: no cover
                 raise TypeError(f"Expected numpy array, actual {b[0]}...{b[-1]}")
+        for b in (self.ibins, self.jbins, self.kbins):
+            if not is_monotonically_increasing(b):
+                raise ValueError(f"Bins are to be monotonically increasing, actual {b}")
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, AbstractGeometrySpecData):
@@ -171,15 +180,65 @@ class AbstractGeometrySpec(AbstractGeometrySpecData, abc.ABC):
     def get_mean_square_distance_weights(self, point: Bins) -> Bins:
         """Estimate weights as a voxel mean square distance from the point.
 
+        The weights are normalized to max value 1024.
+
         Parameters
         ----------
         point
-            ... from where to compute distance
+            ... from where to compute distance, shape (3,),
+            or array of points with shape (..., 3) to compute the weights for every point
+
+        Returns
+        -------
+        The weights with shape (..., ni, nj, nk).
         """
 
-    @abc.abstractmethod
     def calc_cell_centers(self) -> Bins:
-        """Calculate cell (voxel) centers."""
+        """Calculate cell (voxel) centers.
+
+        Returns
+        -------
+        Global coordinates of the centers with shape (ni, nj, nk, 3).
+        """
+        return self._calc_cell_centers(slice(None))
+
+    def iter_cell_centers(self, slab_size: int = 1) -> Iterator[Bins]:
+        """Calculate cell centers slab by slab along i (X or R) dimension.
+
+        Use this instead of :py:meth:`calc_cell_centers` for meshes,
+        which centers don't fit memory.
+
+        Parameters
+        ----------
+        slab_size
+            number of i bins in a slab
+
+        Yields
+        ------
+        Global coordinates of the centers with shape (slab_size, nj, nk, 3),
+        the last slab can be smaller.
+
+        Raises
+        ------
+        ValueError
+            if `slab_size` is not positive.
+        """
+        if slab_size < 1:
+            msg = f"Slab size is to be positive, {slab_size} is specified"
+            raise ValueError(msg)
+        ni = self.ibins.size - 1
+        for start in range(0, ni, slab_size):
+            yield self._calc_cell_centers(slice(start, start + slab_size))
+
+    @abc.abstractmethod
+    def _calc_cell_centers(self, i_slice: slice) -> Bins:
+        """Calculate cell centers for a slab of i bins.
+
+        Parameters
+        ----------
+        i_slice
+            the slab
+        """
 
     @abc.abstractmethod
     def print_geom(self, io: TextIO, indent: str) -> None:
@@ -195,6 +254,26 @@ class AbstractGeometrySpec(AbstractGeometrySpecData, abc.ABC):
 
     # Generic methods
 
+    def with_bins(self, ibins: Bins, jbins: Bins, kbins: Bins) -> Self:
+        """Create the same kind of specification with other bins.
+
+        The other fields, like cylinder origin and axis, are kept.
+
+        Parameters
+        ----------
+        ibins
+            the new bins along X or R
+        jbins
+            the new bins along Y or Z
+        kbins
+            the new bins along Z or Theta
+
+        Returns
+        -------
+        The new specification.
+        """
+        return replace(self, ibins=ibins, jbins=jbins, kbins=kbins)
+
     @property
     def bins_shape(self) -> tuple[int, int, int]:
         """Shape of data corresponding to spatial bins.
@@ -313,31 +392,38 @@ class CartesianGeometrySpec(AbstractGeometrySpec):
     def print_geom(self, io: TextIO, indent: str) -> None:
         pass  # Defaults will do for cartesian mesh
 
-    def get_mean_square_distance_weights(self, point):
-        ni, nj, nk = self.bins_shape
+    def get_mean_square_distance_weights(self, point: Bins) -> Bins:
+        point = as_float_array(point)
 
-        def calc_sum(bins):
+        def calc_sum(bins, p):
+            bins = bins - p[..., np.newaxis]
             bins_square = np.square(bins)
-            bins_mult = bins[:-1] * bins[1:]
-            return bins_square[:-1] + bins_square[1:] + bins_mult
+            bins_mult = bins[..., :-1] * bins[..., 1:]
+            return bins_square[..., :-1] + bins_square[..., 1:] + bins_mult
 
         x_square, y_square, z_square = (
-            calc_sum(x - px)
-            for x, px in zip((self.ibins, self.jbins, self.kbins), point, strict=False)
+            calc_sum(bins, point[..., n])
+            for n, bins in enumerate((self.ibins, self.jbins, self.kbins))
         )
-        w = np.zeros((ni, nj, nk), dtype=float)
-        for i in range(ni):
-            for j in range(nj):
-                for k in range(nk):
-                    w[i, j, k] = x_square[i] + y_square[j] + z_square[k]
-        w = (1.0 / 3.0) * w
-
-        return w * (1024.0 / np.max(w))
-
-    def calc_cell_centers(self):
-        raise NotImplementedError(
-            f"{self.__class__.__name__} has not implemented method calc_cell_centers",
+        w = np.empty((*point.shape[:-1], *self.bins_shape), dtype=float)
+        np.add(
+            x_square[..., :, np.newaxis, np.newaxis],
+            y_square[..., np.newaxis, :, np.newaxis],
+            out=w,
         )
+        w += z_square[..., np.newaxis, np.newaxis, :]
+        w *= 1.0 / 3.0
+        w *= 1024.0 / np.max(w, axis=(-3, -2, -1), keepdims=True)
+        return w
+
+    def _calc_cell_centers(self, i_slice: slice) -> Bins:
+        x_mids, y_mids, z_mids = (0.5 * (bins[1:] + bins[:-1]) for bins in self.bins)
+        x_mids = x_mids[i_slice]
+        cell_centers = np.empty((x_mids.size, y_mids.size, z_mids.size, 3), dtype=float)
+        cell_centers[..., 0] = x_mids[:, np.newaxis, np.newaxis]
+        cell_centers[..., 1] = y_mids[np.newaxis, :, np.newaxis]
+        cell_centers[..., 2] = z_mids[np.newaxis, np.newaxis, :]
+        return cell_centers
 
 
 @dataclass(eq=False)
@@ -365,14 +451,14 @@ class CylinderGeometrySpec(AbstractGeometrySpec):
         if self.vec is not DEFAULT_VEC and not isinstance(self.vec, np.ndarray):
             raise TypeError(f"Expected vec as numpy array, actual {self.vec}")
 
-        if not (self.theta[0] == 0.0 and self.theta[-1] == 1.0):
+        # MCNP meshes start from zero R and Z and cover a whole revolution,
+        # the parts of them, selected on shrinking, may cross the Theta origin.
+        theta = self.theta
+        if not (0.0 <= theta[0] < 1.0 and theta[-1] - theta[0] <= 1.0 + _THETA_RTOL):
             raise ValueError("Theta is expected in rotations only")
 
-        if not self.r[0] == 0.0:
-            raise ValueError("First R bin of CYL mesh is to be zero")
-
-        if not self.z[0] == 0.0:
-            raise ValueError("First Z bin of CYL mesh is to be zero")
+        if self.r[0] < 0.0:
+            raise ValueError("R bins of CYL mesh are to be non-negative")
 
     @property
     def bins(self) -> tuple[Bins, ...]:
@@ -438,7 +524,6 @@ class CylinderGeometrySpec(AbstractGeometrySpec):
 
     # noinspection SpellCheckingInspection
     def get_mean_square_distance_weights(self, point: np.ndarray) -> np.ndarray:
-        ni, nj, nk = self.bins_shape
         assert self.vec is not None
         # Define synonyms for cylinder coordinates
         r = self.ibins  # radius
@@ -446,12 +531,12 @@ class CylinderGeometrySpec(AbstractGeometrySpec):
         assert phi[-1] == 1.0
         phi = phi * _2PI
         z = self.jbins
-        px, py, pz = (
-            point - self.origin
-        )  # TODO dvp: apply local_coordinates instead of the following
+        # TODO dvp: apply local_coordinates instead of the following
+        point = as_float_array(point)
+        px, py, pz = np.moveaxis(point - self.origin, -1, 0)
         l1_square = px**2 + py**2
         l1 = np.sqrt(l1_square)  # distance to origin from point projection on z=0 plane
-        assert l1 > 0.0
+        assert np.all(l1 > 0.0)
         # Terms of integration of L^2 in cylindrical coordinates
         # r^2
         gamma = np.arcsin(py / l1)
@@ -460,29 +545,29 @@ class CylinderGeometrySpec(AbstractGeometrySpec):
         r_sum = r[1:] + r[:-1]
         r_mult = r[1:] * r[:-1]
         dphi = phi[1:] - phi[:-1]
-        dsins = np.sin(phi - gamma)
-        dsins = dsins[1:] - dsins[:-1]
+        dsins = np.sin(phi - gamma[..., np.newaxis])
+        dsins = dsins[..., 1:] - dsins[..., :-1]
         dsins = dsins / dphi
-        z_minus_pz = z - pz
+        z_minus_pz = z - pz[..., np.newaxis]
         z_minus_pz_square = np.square(z_minus_pz)
         z_sum = (1.0 / 3.0) * (
-            z_minus_pz_square[1:] + z_minus_pz_square[:-1] + z_minus_pz[1:] * z_minus_pz[:-1]
+            z_minus_pz_square[..., 1:]
+            + z_minus_pz_square[..., :-1]
+            + z_minus_pz[..., 1:] * z_minus_pz[..., :-1]
         )
-        w: np.ndarray = np.zeros((ni, nj, nk), dtype=float)
-
-        for i in range(ni):
-            for j in range(nj):
-                for k in range(nk):
-                    a = r_square[i]
-                    b = (-4.0 / 3.0) * l1 * (r_sum[i] - r_mult[i] / r_sum[i]) * dsins[k]
-                    d = z_sum[j]
-                    w[i, j, k] = a + b + d
-        w = w + l1_square
-        return cast("np.ndarray", w * (1024.0 / np.max(w)))
-
-    def calc_cell_centers(self) -> np.ndarray:
+        # (i, k) terms: a + b, then (j) term: d, the axes are (..., i, j, k)
+        b = (-4.0 / 3.0) * l1[..., np.newaxis] * (r_sum - r_mult / r_sum)
+        b = b[..., :, np.newaxis] * dsins[..., np.newaxis, :]
+        w = np.empty((*point.shape[:-1], *self.bins_shape), dtype=float)
+        np.add(r_square[:, np.newaxis, np.newaxis], b[..., :, np.newaxis, :], out=w)
+        w += z_sum[..., np.newaxis, :, np.newaxis]
+        w += l1_square[..., np.newaxis, np.newaxis, np.newaxis]
+        w *= 1024.0 / np.max(w, axis=(-3, -2, -1), keepdims=True)
+        return w
+
+    def _calc_cell_centers(self, i_slice: slice) -> np.ndarray:
         _x0, _y0, _z0 = self.origin
-        r_mids = (self.ibins[1:] + self.ibins[:-1]) * 0.5
+        r_mids = ((self.ibins[1:] + self.ibins[:-1]) * 0.5)[i_slice]
         z_mids = (self.jbins[1:] + self.jbins[:-1]) * 0.5
         t_mids = (self.kbins[1:] + self.kbins[:-1]) * 0.5
         if self.kbins[-1] == 1.0:
@@ -494,16 +579,12 @@ class CylinderGeometrySpec(AbstractGeometrySpec):
         axs = self.axs / linalg.norm(self.axs)
         axs_z = np.dot(axs, NZ)
 
-        def _aggregator(elements):
-            r, z, fi = elements
-            x, y = r * (v1 * np.cos(fi) + v2 * np.sin(fi))[0:2]
-            x += _x0
-            y += _y0
-            z = axs_z * z + _z0
-            return np.array([x, y, z], dtype=float)
-
-        cell_centers: np.ndarray = cartesian_product(r_mids, z_mids, t_mids, aggregator=_aggregator)
-
+        # directions of radius in (x, y) plane for every theta
+        directions = np.outer(np.cos(t_mids), v1[0:2]) + np.outer(np.sin(t_mids), v2[0:2])
+        cell_centers = np.empty((r_mids.size, z_mids.size, t_mids.size, 3), dtype=float)
+        for n, c0 in enumerate((_x0, _y0)):
+            cell_centers[..., n] = r_mids[:, np.newaxis, np.newaxis] * directions[:, n] + c0
+        cell_centers[..., 2] = (axs_z * z_mids + _z0)[:, np.newaxis]
         return cell_centers
 
     def adjust_axs_vec_for_mcnp(self) -> CylinderGeometrySpec:
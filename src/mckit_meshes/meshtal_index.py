@@ -0,0 +1,334 @@
+"""Byte offsets index of mesh tallies in MCNP meshtal files.
+
+The index allows to read only the required tallies from a meshtal file
+seeking directly to their headers instead of scanning the whole file.
+
+The index is built with a raw byte search over a memory mapped file,
+no mesh values are parsed on that. For large files the index is saved
+as a JSON sidecar file next to the meshtal file. The sidecar is reused
+while the meshtal file size and modification time are not changed.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Final, NamedTuple
+
+import json
+import logging
+import mmap
+
+from dataclasses import dataclass, field
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from pathlib import Path
+
+__all__ = [
+    "SIDECAR_MIN_SIZE",
+    "MeshtalIndex",
+    "TallyOffsets",
+    "index_meshtal",
+    "sidecar_path",
+]
+
+__LOG = logging.getLogger("mckit_meshes.meshtal_index")
+
+SIDECAR_MIN_SIZE: Final[int] = 64 * 2**20
+"""Don't save index for smaller files: it's faster to build the index than to load it."""
+
+_FORMAT_VERSION: Final[int] = 1
+_MESH_TALLY_NUMBER: Final[bytes] = b"Mesh Tally Number"
+_BIN_BOUNDARIES: Final[bytes] = b"Tally bin boundaries:"
+_VALUES_TITLE: Final[bytes] = b"Result"
+_TOTAL: Final[bytes] = b"Total"
+
+
+class TallyOffsets(NamedTuple):
+    """Byte offsets of a mesh tally parts in a meshtal file.
+
+    All the offsets point to starts of lines.
+    """
+
+    name: int
+    """Mesh tally number."""
+
+    header: int
+    """Line "Mesh Tally Number ..."."""
+
+    bins: int
+    """Line "Tally bin boundaries:"."""
+
+    values: int
+    """The first line with values (after the values title line)."""
+
+    totals: int
+    """The first line with totals, equals to `end`, if there are no totals."""
+
+    end: int
+    """The end of the tally: the next tally header or the end of file."""
+
+
+def sidecar_path(path: Path) -> Path:
+    """Compute path to index sidecar file for a meshtal file.
+
+    Parameters
+    ----------
+    path
+        meshtal file
+
+    Returns
+    -------
+    Path to the sidecar file.
+    """
+    return path.with_name(path.name + ".idx")
+
+
+@dataclass
+class MeshtalIndex:
+    """Index of mesh tallies in a meshtal file.
+
+    Attributes
+    ----------
+    size
+        the meshtal file size the index is built for
+    mtime_ns
+        ... and modification time
+    nps
+        number of histories from the meshtal file header
+    tallies
+        offsets of the mesh tallies in order of appearance in the file
+    """
+
+    size: int
+    mtime_ns: int
+    nps: int
+    tallies: list[TallyOffsets] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.tallies)
+
+    def __iter__(self) -> Iterator[TallyOffsets]:
+        return iter(self.tallies)
+
+    def __contains__(self, name: object) -> bool:
+        return any(t.name == name for t in self.tallies)
+
+    def __getitem__(self, name: int) -> TallyOffsets:
+        for t in self.tallies:
+            if t.name == name:
+                return t
+        raise KeyError(name)
+
+    @property
+    def names(self) -> list[int]:
+        """Mesh tally numbers in order of appearance in the file."""
+        return [t.name for t in self.tallies]
+
+    def select(self, name_select: Callable[[int], bool] | None = None) -> list[TallyOffsets]:
+        """Select tallies by names.
+
+        Parameters
+        ----------
+        name_select
+            A function returning True, if tally name is acceptable, default - accept all
+
+        Returns
+        -------
+        Offsets of the selected tallies.
+        """
+        if name_select is None:
+            return list(self.tallies)
+        return [t for t in self.tallies if name_select(t.name)]
+
+    def is_valid_for(self, path: Path) -> bool:
+        """Check if the index corresponds to the current state of a meshtal file.
+
+        Parameters
+        ----------
+        path
+            meshtal file
+
+        Returns
+        -------
+        True, if the file size and modification time are the same as on the index creation.
+        """
+        stat = path.stat()
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+    @classmethod
+    def build(cls, path: Path) -> MeshtalIndex:
+        """Scan a meshtal file and collect the tallies offsets.
+
+        Parameters
+        ----------
+        path
+            meshtal file
+
+        Returns
+        -------
+        The new index, without tallies for an empty file.
+        """
+        stat = path.stat()
+        if stat.st_size == 0:  # cannot be memory mapped
+            return cls(stat.st_size, stat.st_mtime_ns, 0, [])
+        with path.open("rb") as fid, mmap.mmap(fid.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            for _ in range(2):  # skip problem time stamp and title
+                pos = _next_line(mm, pos)
+            nps_line = mm[pos : _next_line(mm, pos)]
+            nps = int(float(nps_line.split(b"=")[1]))
+            headers = list(_find_headers(mm, pos))
+            ends = [*headers[1:], mm.size()]
+            tallies = [
+                _scan_tally(mm, header, end) for header, end in zip(headers, ends, strict=True)
+            ]
+        return cls(stat.st_size, stat.st_mtime_ns, nps, tallies)
+
+    def save(self, path: Path) -> None:
+        """Save the index to a sidecar file.
+
+        Parameters
+        ----------
+        path
+            the sidecar file
+        """
+        content = {
+            "format": _FORMAT_VERSION,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "nps": self.nps,
+            "tallies": [list(t) for t in self.tallies],
+        }
+        path.write_text(json.dumps(content), encoding="utf8")
+
+    @classmethod
+    def load(cls, path: Path) -> MeshtalIndex:
+        """Load an index from a sidecar file.
+
+        Parameters
+        ----------
+        path
+            the sidecar file
+
+        Returns
+        -------
+        The loaded index.
+
+        Raises
+        ------
+        ValueError
+            if the sidecar file format is not supported.
+        """
+        content = json.loads(path.read_text(encoding="utf8"))
+        if content.get("format") != _FORMAT_VERSION:
+            msg = f"Unsupported meshtal index format in {path}"
+            raise ValueError(msg)
+        return cls(
+            content["size"],
+            content["mtime_ns"],
+            content["nps"],
+            [TallyOffsets(*t) for t in content["tallies"]],
+        )
+
+
+def index_meshtal(path: Path, *, sidecar_min_size: int = SIDECAR_MIN_SIZE) -> MeshtalIndex:
+    """Load the index from sidecar file, if it's valid, otherwise build and save it.
+
+    Parameters
+    ----------
+    path
+        meshtal file
+    sidecar_min_size
+        save the sidecar file only for meshtal files of this size or larger
+
+    Returns
+    -------
+    The index for the meshtal file.
+    """
+    sidecar = sidecar_path(path)
+    if sidecar.exists():
+        try:
+            index = MeshtalIndex.load(sidecar)
+        except (ValueError, KeyError, TypeError) as ex:
+            __LOG.warning("Ignoring invalid meshtal index %s: %s", sidecar, ex)
+        else:
+            if index.is_valid_for(path):
+                return index
+            __LOG.info("Meshtal index %s is outdated", sidecar)
+    index = MeshtalIndex.build(path)
+    if sidecar_min_size <= index.size:
+        try:
+            index.save(sidecar)
+        except OSError as ex:
+            __LOG.warning("Cannot save meshtal index %s: %s", sidecar, ex)
+    return index
+
+
+def _next_line(mm: mmap.mmap, pos: int) -> int:
+    i = mm.find(b"\n", pos)
+    return mm.size() if i < 0 else i + 1
+
+
+def _line_start(mm: mmap.mmap, pos: int) -> int:
+    return mm.rfind(b"\n", 0, pos) + 1
+
+
+def _find_headers(mm: mmap.mmap, pos: int) -> Iterator[int]:
+    """Find starts of lines beginning with "Mesh Tally Number".
+
+    Parameters
+    ----------
+    mm
+        meshtal file content
+    pos
+        where to start search
+
+    Yields
+    ------
+    offsets of mesh tally headers
+    """
+    while True:
+        found = mm.find(_MESH_TALLY_NUMBER, pos)
+        if found < 0:
+            return
+        start = _line_start(mm, found)
+        if not mm[start:found].strip():
+            yield start
+        pos = found + len(_MESH_TALLY_NUMBER)
+
+
+def _scan_tally(mm: mmap.mmap, header: int, end: int) -> TallyOffsets:
+    """Find parts of a mesh tally.
+
+    Parameters
+    ----------
+    mm
+        meshtal file content
+    header
+        offset of the tally header
+    end
+        offset of the tally end
+
+    Returns
+    -------
+    The tally offsets.
+
+    Raises
+    ------
+    ValueError
+        if the tally parts are not found.
+    """
+    first_line = mm[header : _next_line(mm, header)]
+    name = int(first_line.split()[3])
+    bins = mm.find(_BIN_BOUNDARIES, header, end)
+    if bins < 0:
+        msg = f"Cannot find bin boundaries for mesh tally {name}"
+        raise ValueError(msg)
+    title = mm.find(_VALUES_TITLE, bins, end)
+    if title < 0:
+        msg = f"Cannot find values for mesh tally {name}"
+        raise ValueError(msg)
+    values = _next_line(mm, title)
+    totals = mm.find(_TOTAL, values, end)
+    totals = end if totals < 0 else _line_start(mm, totals)
+    return TallyOffsets(name, header, _line_start(mm, bins), values, totals, end)
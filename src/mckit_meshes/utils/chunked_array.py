@@ -0,0 +1,295 @@
+"""Chunked compressed arrays stored in a local directory.
+
+A simple zarr-like layout, which needs only NumPy and the standard library:
+the directory contains "array.json" with the array shape, chunk shape and dtype,
+and a zlib compressed file for every chunk named by the chunk indexes, like "0.3.1.2".
+Reading a selection decompresses only the chunks the selection touches.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Final
+
+import json
+import operator
+import zlib
+
+from dataclasses import dataclass
+from itertools import product
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+    from pathlib import Path
+    from types import EllipsisType
+
+    from numpy.typing import ArrayLike, NDArray
+
+    AxisKey = int | slice | EllipsisType | Sequence[int] | Sequence[bool] | NDArray[np.generic]
+    """Selection along a single axis."""
+
+    Key = AxisKey | tuple[AxisKey, ...]
+    """Selection key: for a single axis or a number of them."""
+
+__all__ = ["DEFAULT_COMPRESSION_LEVEL", "ChunkedArray"]
+
+DEFAULT_COMPRESSION_LEVEL: Final[int] = 6
+"""Zlib compression level for chunks, 1 - fastest, 9 - best compression."""
+
+_FORMAT_VERSION: Final[int] = 1
+_ARRAY_SPEC: Final[str] = "array.json"
+
+
+@dataclass(frozen=True)
+class ChunkedArray:
+    """Read only chunked array in a directory.
+
+    Supports orthogonal indexing: every axis can be indexed with an integer,
+    a slice or a sequence of integers (or booleans) independently on other axes.
+
+    Attributes
+    ----------
+    path
+        the array directory
+    shape
+        the array shape
+    chunks
+        the chunk shape, the edge chunks can be smaller
+    dtype
+        the array items type
+    """
+
+    path: Path
+    shape: tuple[int, ...]
+    chunks: tuple[int, ...]
+    dtype: np.dtype
+
+    @classmethod
+    def create(
+        cls,
+        path: Path,
+        array: ArrayLike,
+        chunks: tuple[int, ...],
+        *,
+        level: int = DEFAULT_COMPRESSION_LEVEL,
+    ) -> ChunkedArray:
+        """Store an array as chunks in a new directory.
+
+        Parameters
+        ----------
+        path
+            directory to create
+        array
+            what to store
+        chunks
+            the chunk shape, the values are clipped to the array shape
+        level
+            zlib compression level
+
+        Returns
+        -------
+        The stored array.
+
+        Raises
+        ------
+        ValueError
+            if the chunk shape doesn't correspond to the array dimensions.
+        """
+        array = np.asarray(array)
+        if len(chunks) != array.ndim or any(c < 1 for c in chunks):
+            msg = f"Invalid chunks {chunks} for array of shape {array.shape}"
+            raise ValueError(msg)
+        chunks = tuple(min(c, max(n, 1)) for c, n in zip(chunks, array.shape, strict=True))
+        path.mkdir(parents=True, exist_ok=True)
+        result = cls(path, array.shape, chunks, array.dtype)
+        for index in result.iter_chunk_indexes():
+            block = array[result._chunk_slices(index)]
+            result._chunk_path(index).write_bytes(
+                zlib.compress(np.ascontiguousarray(block).tobytes(), level)
+            )
+        spec = {
+            "format": _FORMAT_VERSION,
+            "shape": list(array.shape),
+            "chunks": list(chunks),
+            "dtype": array.dtype.str,
+        }
+        (path / _ARRAY_SPEC).write_text(json.dumps(spec), encoding="utf8")
+        return result
+
+    @classmethod
+    def open(cls, path: Path) -> ChunkedArray:
+        """Open a stored array.
+
+        Parameters
+        ----------
+        path
+            the array directory
+
+        Returns
+        -------
+        The array, no data is read yet.
+
+        Raises
+        ------
+        ValueError
+            if the array format is not supported.
+        """
+        spec = json.loads((path / _ARRAY_SPEC).read_text(encoding="utf8"))
+        if spec.get("format") != _FORMAT_VERSION:
+            msg = f"Unsupported chunked array format in {path}"
+            raise ValueError(msg)
+        return cls(path, tuple(spec["shape"]), tuple(spec["chunks"]), np.dtype(spec["dtype"]))
+
+    @property
+    def ndim(self) -> int:
+        """Number of dimensions."""
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        """Number of items."""
+        return int(np.prod(self.shape))
+
+    def iter_chunk_indexes(self) -> Iterator[tuple[int, ...]]:
+        """Iterate over indexes of all the chunks.
+
+        Returns
+        -------
+        Iterator over chunk indexes in C order.
+        """
+        return product(*(range(-(-n // c)) for n, c in zip(self.shape, self.chunks, strict=True)))
+
+    def read_chunk(self, index: tuple[int, ...]) -> NDArray:
+        """Read and decompress a chunk.
+
+        Parameters
+        ----------
+        index
+            the chunk indexes
+
+        Returns
+        -------
+        The chunk content.
+        """
+        shape = tuple(s.stop - s.start for s in self._chunk_slices(index))
+        raw = zlib.decompress(self._chunk_path(index).read_bytes())
+        return np.frombuffer(raw, dtype=self.dtype).reshape(shape)
+
+    def __getitem__(self, key: Key) -> NDArray:
+        """Read a selection with orthogonal indexing.
+
+        Parameters
+        ----------
+        key
+            integers, slices, sequences of integers or booleans for the axes,
+            ``...`` is expanded to full slices
+
+        Returns
+        -------
+        The selected items, the axes indexed with integers are dropped.
+        """
+        selections, dropped = self._normalize_key(key)
+        result = np.empty(tuple(s.size for s in selections), dtype=self.dtype)
+        chunk_numbers = [s // c for s, c in zip(selections, self.chunks, strict=True)]
+        for index in product(*(np.unique(n) for n in chunk_numbers)):
+            positions = [np.flatnonzero(n == i) for n, i in zip(chunk_numbers, index, strict=True)]
+            local = [
+                s[p] - i * c
+                for s, p, i, c in zip(selections, positions, index, self.chunks, strict=True)
+            ]
+            result[np.ix_(*positions)] = self.read_chunk(index)[np.ix_(*local)]
+        return result.squeeze(axis=dropped) if dropped else result
+
+    def select(self, key: Key) -> NDArray:
+        """Read a selection with NumPy indexing semantics.
+
+        Unlike :py:meth:`__getitem__` a number of index arrays are broadcast together
+        as for :py:class:`numpy.ndarray`. Only the chunks, containing the selected
+        items, are read.
+
+        Parameters
+        ----------
+        key
+            integers, slices or integer arrays for the axes
+
+        Returns
+        -------
+        The same as ``numpy.asarray(self)[key]``.
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        needed = []
+        local_key = []
+        for k, n in zip(key, self.shape, strict=False):
+            if isinstance(k, slice):
+                step = k.step or 1
+                indexes = np.sort(np.arange(n)[k])
+                needed.append(indexes)
+                local_key.append(slice(None, None, 1 if step > 0 else -1))
+            else:
+                indexes = np.asarray(k)
+                indexes = np.where(indexes < 0, indexes + n, indexes)
+                unique = np.unique(indexes)
+                needed.append(unique)
+                local = np.searchsorted(unique, indexes)
+                local_key.append(local.item() if local.ndim == 0 else local)
+        return self[tuple(needed)][tuple(local_key)]
+
+    def __array__(self, dtype=None, copy=None) -> NDArray:
+        result = self[...]
+        return result if dtype is None else result.astype(dtype, copy=False)
+
+    def _normalize_key(self, key: Key) -> tuple[list[NDArray[np.intp]], tuple[int, ...]]:
+        """Convert indexing key to selected indexes along every axis.
+
+        Parameters
+        ----------
+        key
+            see :py:meth:`__getitem__`
+
+        Returns
+        -------
+        Indexes along the axes and the axes indexed with integers.
+
+        Raises
+        ------
+        IndexError
+            if the key is not valid for this array.
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        if any(k is Ellipsis for k in key):
+            i = next(i for i, k in enumerate(key) if k is Ellipsis)
+            key = (*key[:i], *[slice(None)] * (self.ndim - len(key) + 1), *key[i + 1 :])
+        if len(key) > self.ndim:
+            msg = f"Too many indices for array with {self.ndim} dimensions"
+            raise IndexError(msg)
+        key = (*key, *[slice(None)] * (self.ndim - len(key)))
+        selections = []
+        dropped = []
+        for axis, (k, n) in enumerate(zip(key, self.shape, strict=True)):
+            if isinstance(k, slice):
+                selections.append(np.arange(n)[k])
+                continue
+            if np.ndim(k) == 0:
+                indexes = np.array([operator.index(k)])
+                dropped.append(axis)
+            else:
+                indexes = np.asarray(k)
+                if indexes.dtype == bool:
+                    indexes = np.flatnonzero(indexes)
+            if np.any(indexes < -n) or np.any(indexes >= n):
+                msg = f"Index out of bounds for axis {axis} with size {n}"
+                raise IndexError(msg)
+            selections.append(np.where(indexes < 0, indexes + n, indexes).astype(np.intp))
+        return selections, tuple(dropped)
+
+    def _chunk_slices(self, index: tuple[int, ...]) -> tuple[slice, ...]:
+        return tuple(
+            slice(i * c, min((i + 1) * c, n))
+            for i, c, n in zip(index, self.chunks, self.shape, strict=True)
+        )
+
+    def _chunk_path(self, index: tuple[int, ...]) -> Path:
+        return self.path / ".".join(map(str, index))
@@ -0,0 +1,129 @@
+"""Save arrays to npz files with a selectable compression codec.
+
+Npz file is a zip archive of .npy files. Any compression method supported
+by :py:mod:`zipfile` can be used for the archive members, and :py:func:`numpy.load`
+reads such files transparently.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import zipfile
+
+from enum import IntEnum
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from pathlib import Path
+
+    from numpy.typing import ArrayLike
+
+__all__ = ["NpzCodec", "save_npz"]
+
+
+class NpzCodec(IntEnum):
+    """Compression methods for npz files.
+
+    The values are stored in FMesh metadata, don't change them.
+    """
+
+    none = 0
+    """No compression, the fastest to write and read."""
+
+    zlib = 1
+    """Deflate, the same as :py:func:`numpy.savez_compressed`, levels 0..9."""
+
+    bz2 = 2
+    """Denser and slower than zlib, levels 1..9."""
+
+    lzma = 3
+    """The densest and the slowest, the level is not configurable."""
+
+    zstd = 4
+    """Fast and dense, levels 1..22, requires Python 3.14+."""
+
+    @property
+    def zip_compression(self) -> int | None:
+        """Zip compression method, None if not supported by this Python version."""
+        return getattr(zipfile, _ZIP_COMPRESSION[self], None)
+
+    @property
+    def is_available(self) -> bool:
+        """Check if the codec can be used."""
+        return self.zip_compression is not None
+
+    @property
+    def default_level(self) -> int:
+        """Compression level to use, when not specified."""
+        return _DEFAULT_LEVEL[self]
+
+    @classmethod
+    def available(cls) -> list[NpzCodec]:
+        """List the codecs, which can be used.
+
+        Returns
+        -------
+        The codecs supported by this Python version.
+        """
+        return [codec for codec in cls if codec.is_available]
+
+
+_ZIP_COMPRESSION = {
+    NpzCodec.none: "ZIP_STORED",
+    NpzCodec.zlib: "ZIP_DEFLATED",
+    NpzCodec.bz2: "ZIP_BZIP2",
+    NpzCodec.lzma: "ZIP_LZMA",
+    NpzCodec.zstd: "ZIP_ZSTANDARD",
+}
+
+_DEFAULT_LEVEL = {
+    NpzCodec.none: 0,
+    NpzCodec.zlib: 6,
+    NpzCodec.bz2: 9,
+    NpzCodec.lzma: 0,
+    NpzCodec.zstd: 3,
+}
+
+
+def save_npz(
+    path: Path,
+    arrays: Mapping[str, ArrayLike],
+    *,
+    codec: NpzCodec = NpzCodec.zlib,
+    level: int | None = None,
+) -> None:
+    """Save arrays to npz file.
+
+    Unlike :py:func:`numpy.savez` the arrays are never pickled.
+
+    Parameters
+    ----------
+    path
+        the file to write
+    arrays
+        the arrays by names
+    codec
+        compression method
+    level
+        compression level, default - :py:attr:`NpzCodec.default_level`
+
+    Raises
+    ------
+    ValueError
+        if the codec is not available.
+    """
+    compression = codec.zip_compression
+    if compression is None:
+        msg = f"Codec {codec.name} is not available, use one of {NpzCodec.available()}"
+        raise ValueError(msg)
+    if codec in (NpzCodec.none, NpzCodec.lzma):
+        level = None
+    elif level is None:
+        level = codec.default_level
+    with zipfile.ZipFile(path, "w", compression=compression, compresslevel=level) as zf:
+        for key, value in arrays.items():
+            with zf.open(f"{key}.npy", "w", force_zip64=True) as fid:
+                np.lib.format.write_array(fid, np.asanyarray(value), allow_pickle=False)
@@ -4,13 +4,14 @@
 #            for reuse in FMesh.shrink for equivalent grids or alike
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Final, NamedTuple, cast
 
 import collections.abc
 import gc
 import itertools
+import warnings
 
-from multiprocessing import Pool
+from functools import lru_cache
 
 import numpy as np
 
@@ -23,8 +24,11 @@ if TYPE_CHECKING:
 
 
 __all__ = [
+    "OverlapMatrix",
+    "RebinPlan",
     "interpolate",
     "is_monotonically_increasing",
+    "overlap_matrix",
     "rebin_1d",
     "rebin_nd",
     "rebin_spec_composer",
@@ -38,18 +42,36 @@ __revision__ = "$Id$"
 __ZERO = np.array([0.0], dtype=float)
 __EXTERNAL_PROCESS_THRESHOLD = 1000000
 
+_BLOCK_ITEMS: Final = 2**22
+"""Max number of items in a temporary array on applying :py:class:`OverlapMatrix`."""
+
+_PLAN_CACHE_SIZE: Final = 64
+"""Max number of plans kept by :py:meth:`RebinPlan.cached`."""
+
+_PERIOD_RTOL: Final = 1e-12
+"""Relative tolerance on checking that bins don't span more than a period."""
+
 
 def is_monotonically_increasing(a: NDArray) -> bool:
-    if not a.size:
-        return False
-    iterator = iter(a)
-    prev = next(iterator)
-    for val in iterator:
-        if prev < val:
-            prev = val
-        else:
-            return False
-    return True
+    """Check if every item is greater than the previous one.
+
+    Parameters
+    ----------
+    a
+        1-D array to check
+
+    Returns
+    -------
+    False, if the array is empty or not increasing.
+
+    Examples
+    --------
+    >>> is_monotonically_increasing(np.array([0.0, 1.0, 3.0]))
+    True
+    >>> is_monotonically_increasing(np.array([0.0, 1.0, 1.0]))
+    False
+    """
+    return a.size > 0 and bool(np.all(a[1:] > a[:-1]))
 
 
 def set_axis(indices: NDArray, axis: int, a_shape: Sequence[int]) -> NDArray:
@@ -180,10 +202,13 @@ def rebin_nd(
     rebin_spec: Iterable[tuple[NDArray, NDArray, int, bool]],
     *,
     assume_sorted: bool = False,
-    external_process_threshold: int = __EXTERNAL_PROCESS_THRESHOLD,
+    external_process_threshold: int | None = None,
 ) -> NDArray:
     """Rebin an array ``a`` over multidimensional grid.
 
+    The axes are rebinned one after another with :py:class:`OverlapMatrix`
+    in the current process, the temporary arrays are bounded.
+
     Parameters
     ----------
     a
@@ -196,39 +221,336 @@ def rebin_nd(
         If True skip assertion of bins sorting order,
         by default False - asserts the input_file data
     external_process_threshold
-        If size of `a` is greater than that, then the computation
-        is executed in external process, to achieve immediate memory cleanup.
+        Deprecated and ignored, passing it emits :py:class:`DeprecationWarning`.
 
     Returns
     -------
         Rebinned data.
     """
-    if not isinstance(rebin_spec, collections.abc.Iterator):
-        rebin_spec = iter(rebin_spec)
-    try:
-        bins, new_bins, axis, grouped = next(rebin_spec)
-    except StopIteration:
-        return a
+    if external_process_threshold is not None:
+        warnings.warn(
+            "rebin_nd() parameter external_process_threshold is deprecated and ignored",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+    for bins, new_bins, axis, grouped in rebin_spec:
+        matrix = overlap_matrix(bins, new_bins, grouped=grouped, assume_sorted=assume_sorted)
+        a = matrix.apply(a, axis)
+    return a
 
-    if a.size > external_process_threshold:
-        with Pool(processes=1) as pool:
-            recursion_res = pool.apply(
-                rebin_nd, args=(a, rebin_spec), kwds={"assume_sorted": assume_sorted}
-            )
-    else:
-        recursion_res = rebin_nd(a, rebin_spec, assume_sorted=assume_sorted)
 
-    res = rebin_1d(
-        recursion_res, bins, new_bins, axis, grouped=grouped, assume_sorted=assume_sorted
-    )
+class OverlapMatrix(NamedTuple):
+    """Sparse matrix transforming values on old bins to values on new bins along an axis.
+
+    The matrix is stored in compressed rows format: the row `j` (new bin)
+    has nonzero weights ``weights[indptr[j]:indptr[j+1]]`` for old bins
+    ``indices[indptr[j]:indptr[j+1]]``. Every row has at least one item.
+    Create the matrix with :py:func:`overlap_matrix`.
+    """
+
+    indptr: NDArray
+    """Starts of rows in `indices` and `weights`, size - number of new bins + 1."""
+
+    indices: NDArray
+    """Old bins indices."""
+
+    weights: NDArray
+    """The weights of old bins values in new bins values."""
+
+    size: int
+    """Number of old bins."""
+
+    @property
+    def new_size(self) -> int:
+        """Number of new bins."""
+        return self.indptr.size - 1
+
+    def apply(self, a: NDArray, axis: int = 0) -> NDArray:
+        """Rebin array `a` along the `axis`.
+
+        The temporary arrays are limited with :py:data:`_BLOCK_ITEMS`.
+
+        Parameters
+        ----------
+        a
+            the array to rebin
+        axis
+            the axis corresponding to the old bins
+
+        Returns
+        -------
+        The new array with the new bins along the `axis`.
+
+        Raises
+        ------
+        ValueError
+            if the `a` shape doesn't match the matrix.
+        """
+        if a.shape[axis] != self.size:
+            msg = f"The array shape {a.shape} doesn't match {self.size} bins along axis {axis}"
+            raise ValueError(msg)
+        new_shape = list(a.shape)
+        new_shape[axis] = self.new_size
+        result = np.empty(new_shape, dtype=np.result_type(a, self.weights))
+        source = np.moveaxis(a, axis, 0)
+        target = np.moveaxis(result, axis, 0)
+        starts = self.indptr[:-1]
+        if source.ndim == 1:
+            np.add.reduceat(source[self.indices] * self.weights, starts, out=target)
+            return result
+        weights = self.weights.reshape((-1,) + (1,) * (source.ndim - 1))
+        inner = source[0, 0].size
+        block = max(1, _BLOCK_ITEMS // max(1, self.indices.size * inner))
+        for start in range(0, source.shape[1], block):
+            stop = start + block
+            gathered = np.take(source[:, start:stop], self.indices, axis=0)
+            gathered *= weights
+            np.add.reduceat(gathered, starts, axis=0, out=target[:, start:stop])
+        return result
+
+
+def overlap_matrix(
+    bins: NDArray,
+    new_bins: NDArray,
+    *,
+    grouped: bool = False,
+    assume_sorted: bool = False,
+    period: float | None = None,
+) -> OverlapMatrix:
+    """Compute sparse matrix to rebin values from `bins` to `new_bins`.
+
+    The weights are the same as used in :py:func:`rebin_1d`:
+    the overlap lengths of the old and new bins divided by the widths
+    of new bins or, if `grouped`, of old bins.
+
+    On a periodic axis, like Theta of a cylinder mesh, the new bins
+    may cross the end of the old ones and continue from the start.
+
+    Parameters
+    ----------
+    bins
+        the old bins
+    new_bins
+        the new bins, should be within the old ones
+    grouped
+        see :py:func:`rebin_1d`
+    assume_sorted
+        If ``True``, then skip checking of bins sorting order
+    period
+        the axis period, if the axis is periodic,
+        the old bins should span exactly one period
+
+    Returns
+    -------
+    The matrix.
+
+    Raises
+    ------
+    ValueError
+        if the new bins are out of the old ones or the bins are not sorted.
+    """
+    bins = np.asarray(bins, dtype=float)
+    new_bins = np.asarray(new_bins, dtype=float)
+    size = bins.size - 1
+    if period is not None:
+        bins, new_bins = _unwrap_periodic_bins(bins, new_bins, period)
+    if new_bins[0] < bins[0] or bins[-1] < new_bins[-1]:
+        msg = (
+            "Rebinning doesn't provide extrapolation:"
+            f" [{new_bins[0]:g}..{new_bins[-1]:g}] is not in [{bins[0]:g}..{bins[-1]:g}]"
+        )
+        raise ValueError(msg)
+    if not assume_sorted and not (
+        is_monotonically_increasing(bins) and is_monotonically_increasing(new_bins)
+    ):
+        msg = "The bins are to be monotonically increasing"
+        raise ValueError(msg)
+    last_bin = bins.size - 2
+    lows, highs = new_bins[:-1], new_bins[1:]
+    first = np.clip(np.searchsorted(bins, lows, side="right") - 1, 0, last_bin)
+    last = np.clip(np.searchsorted(bins, highs, side="left") - 1, first, last_bin)
+    counts = last - first + 1
+    indptr = np.zeros(counts.size + 1, dtype=np.intp)
+    np.cumsum(counts, out=indptr[1:])
+    rows = np.repeat(np.arange(counts.size), counts)
+    indices = np.arange(indptr[-1]) + np.repeat(first - indptr[:-1], counts)
+    overlaps = np.minimum(bins[indices + 1], highs[rows]) - np.maximum(bins[indices], lows[rows])
+    np.maximum(overlaps, 0.0, out=overlaps)
+    widths = np.diff(bins)[indices] if grouped else np.diff(new_bins)[rows]
+    if size < last_bin + 1:  # periodic bins are unwrapped
+        indices %= size
+    return OverlapMatrix(indptr, indices, overlaps / widths, size)
+
+
+def _check_period(bins: NDArray, period: float) -> None:
+    if not np.isclose(bins[-1] - bins[0], period):
+        msg = f"Bins [{bins[0]:g}..{bins[-1]:g}] are to span exactly one period {period:g}"
+        raise ValueError(msg)
+
+
+def _unwrap_periodic_bins(
+    bins: NDArray, new_bins: NDArray, period: float
+) -> tuple[NDArray, NDArray]:
+    """Shift new bins to start within the old ones and extend the old bins to the next period.
+
+    Returns
+    -------
+    The old bins over two periods and the shifted new bins.
+    """
+    _check_period(bins, period)
+    if new_bins[-1] - new_bins[0] > period * (1.0 + _PERIOD_RTOL):
+        msg = f"New bins [{new_bins[0]:g}..{new_bins[-1]:g}] span more than period {period:g}"
+        raise ValueError(msg)
+    new_bins = new_bins - np.floor((new_bins[0] - bins[0]) / period) * period
+    bins = np.concatenate((bins, bins[1:] + period))
+    # Fix the rounding errors after shifting
+    return bins, np.clip(new_bins, bins[0], bins[-1])
 
-    del recursion_res
-    if a.size > external_process_threshold:
-        n = gc.collect()
-        if n:
-            del gc.garbage[:]
 
-    return res
+class RebinPlan:
+    """Precomputed rebinning from a multidimensional grid to another one.
+
+    The plan keeps :py:class:`OverlapMatrix` for every axis and can be applied
+    to any number of arrays defined on the same grid, for example, to
+    the data, errors and totals of all the tallies sharing the geometry.
+
+    Parameters
+    ----------
+    bins_seq
+        the old bins for every axis
+    new_bins_seq
+        the new bins for every axis
+    grouped_flags
+        see :py:func:`rebin_spec_composer`
+    periods
+        the periods of periodic axes and None for others, see :py:func:`overlap_matrix`
+    assume_sorted
+        If True skip checking of bins sorting order
+
+    Examples
+    --------
+    >>> plan = RebinPlan([np.array([0.0, 1.0, 2.0])], [np.array([0.0, 2.0])])
+    >>> plan.apply(np.array([[1.0, 3.0], [2.0, 4.0]]))
+    array([[2.],
+           [3.]])
+    """
+
+    def __init__(
+        self,
+        bins_seq: Iterable[NDArray],
+        new_bins_seq: Iterable[NDArray],
+        *,
+        grouped_flags: bool | Iterable[bool] | None = None,
+        periods: Iterable[float | None] | None = None,
+        assume_sorted: bool = False,
+    ) -> None:
+        spec = rebin_spec_composer(list(bins_seq), list(new_bins_seq), grouped_flags=grouped_flags)
+        if periods is None:
+            periods = itertools.repeat(None)
+        self.matrices: tuple[OverlapMatrix, ...] = tuple(
+            overlap_matrix(
+                bins, new_bins, grouped=grouped, assume_sorted=assume_sorted, period=period
+            )
+            for (bins, new_bins, _, grouped), period in zip(spec, periods, strict=False)
+        )
+        """The matrices to apply for the axes."""
+
+    @property
+    def ndim(self) -> int:
+        """Number of axes to rebin."""
+        return len(self.matrices)
+
+    @property
+    def new_shape(self) -> tuple[int, ...]:
+        """The shape of rebinned axes."""
+        return tuple(m.new_size for m in self.matrices)
+
+    def apply(self, a: NDArray, axes: Iterable[int] | None = None) -> NDArray:
+        """Rebin an array.
+
+        Parameters
+        ----------
+        a
+            the array to rebin
+        axes
+            the axes of `a` corresponding to the plan axes,
+            default - the last :py:attr:`ndim` axes, so the same plan
+            can be applied to FMesh data (e, x, y, z) and totals (x, y, z)
+
+        Returns
+        -------
+        The rebinned array.
+        """
+        if axes is None:
+            axes = range(a.ndim - self.ndim, a.ndim)
+        for matrix, axis in zip(self.matrices, axes, strict=True):
+            a = matrix.apply(a, axis)
+        return a
+
+    @classmethod
+    def cached(
+        cls,
+        bins_seq: Iterable[NDArray],
+        new_bins_seq: Iterable[NDArray],
+        *,
+        grouped_flags: bool | Iterable[bool] | None = None,
+        periods: Iterable[float | None] | None = None,
+        assume_sorted: bool = False,
+    ) -> RebinPlan:
+        """Get a plan from the cache or create it.
+
+        The plans are cached by the bins values, the bins sorting order is checked
+        only on creating a plan.
+
+        Parameters
+        ----------
+        bins_seq
+            the old bins for every axis
+        new_bins_seq
+            the new bins for every axis
+        grouped_flags
+            see :py:func:`rebin_spec_composer`
+        periods
+            the periods of periodic axes and None for others
+        assume_sorted
+            If True skip checking of bins sorting order,
+            for example, if the bins are validated in a geometry specification
+
+        Returns
+        -------
+        The plan.
+        """
+        bins_key, new_bins_key = _bins_key(bins_seq), _bins_key(new_bins_seq)
+        flags: tuple[bool, ...]
+        if isinstance(grouped_flags, bool):
+            flags = (grouped_flags,) * len(bins_key)
+        elif grouped_flags is None:
+            flags = (False,) * len(bins_key)
+        else:
+            flags = tuple(map(bool, grouped_flags))
+        periods_key = (None,) * len(bins_key) if periods is None else tuple(periods)
+        return _cached_plan(bins_key, new_bins_key, flags, periods_key, assume_sorted)
+
+
+def _bins_key(bins_seq: Iterable[NDArray]) -> tuple[bytes, ...]:
+    return tuple(np.asarray(bins, dtype=float).tobytes() for bins in bins_seq)
+
+
+@lru_cache(maxsize=_PLAN_CACHE_SIZE)
+def _cached_plan(
+    bins_seq: tuple[bytes, ...],
+    new_bins_seq: tuple[bytes, ...],
+    grouped_flags: tuple[bool, ...],
+    periods: tuple[float | None, ...],
+    assume_sorted: bool,  # noqa: FBT001
+) -> RebinPlan:
+    return RebinPlan(
+        (np.frombuffer(bins) for bins in bins_seq),
+        (np.frombuffer(bins) for bins in new_bins_seq),
+        grouped_flags=grouped_flags,
+        periods=periods,
+        assume_sorted=assume_sorted,
+    )
 
 
 def rebin_spec_composer(
@@ -236,7 +558,7 @@ def rebin_spec_composer(
     new_bins_seq,
     axes=None,
     grouped_flags=None,
-) -> Iterable[tuple[NDArray, NDArray, NDArray, NDArray]]:
+) -> Iterable[tuple[NDArray, NDArray, int, bool]]:
     """Compose rebin_spec parameter.
 
     See also :py:func:`mckit_meshes.utils.rebin.rebin_nd` with reasonable defaults
@@ -280,12 +602,18 @@ def shrink_1d(
     axis: int | None = None,
     *,
     assume_sorted: bool = False,
+    period: float | None = None,
 ) -> tuple[np.ndarray, np.ndarray]:
     """Select sub-arrays of a `a` and corresponding `bins` for minimal span.
 
     of bins, which completely covers the range [`low`...`high`]
     both sides included.
 
+    On a periodic axis, like Theta of a cylinder mesh, the range may cross
+    the end of the bins and continue from the start, `high` less than `low`
+    also means crossing. The resulting bins are unwrapped and start
+    within the original ones.
+
     Parameters
     ----------
     a
@@ -303,6 +631,9 @@ def shrink_1d(
     assume_sorted
         If True skip assertion of bins sorting order,
         by default False - asserts the input_file data
+    period
+        the axis period, if the axis is periodic,
+        the bins should span exactly one period
 
     Returns
     -------
@@ -317,6 +648,11 @@ def shrink_1d(
     if axis is None:
         axis = 0
 
+    if period is not None and low is not None and high is not None:
+        return _shrink_periodic_1d(
+            a, bins, low, high, axis, period=period, assume_sorted=assume_sorted
+        )
+
     assert a.shape[axis] == bins.size - 1
     assert assume_sorted or is_monotonically_increasing(bins)
 
@@ -364,6 +700,37 @@ def shrink_1d(
     return new_bins, new_a
 
 
+def _shrink_periodic_1d(
+    a: NDArray,
+    bins: NDArray,
+    low: float,
+    high: float,
+    axis: int,
+    *,
+    period: float,
+    assume_sorted: bool,
+) -> tuple[NDArray, NDArray]:
+    _check_period(bins, period)
+    if high < low:
+        high += period
+    shift = np.floor((low - bins[0]) / period) * period
+    low, high = low - shift, high - shift
+    if high <= bins[-1]:
+        return shrink_1d(a, bins, low, high, axis, assume_sorted=assume_sorted)
+    size = bins.size - 1
+    new_bins, indices = shrink_1d(
+        np.arange(2 * size),
+        np.concatenate((bins, bins[1:] + period)),
+        low,
+        high,
+        assume_sorted=assume_sorted,
+    )
+    if new_bins[-1] - new_bins[0] > period * (1.0 + _PERIOD_RTOL):
+        msg = f"Shrink range [{low:g}..{high:g}] covers bins over more than period {period:g}"
+        raise ValueError(msg)
+    return new_bins, np.take(a, indices % size, axis=axis)
+
+
 def shrink_nd(
     a: np.ndarray,
     trim_spec: Iterable[tuple[np.ndarray, float, float, int]],
@@ -2,28 +2,35 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, NamedTuple, TextIO
+from typing import TYPE_CHECKING, Final, Literal, NamedTuple, TextIO
 
 import sys
-
-from dataclasses import dataclass
+import zipfile
 
 import numpy as np
 
 import mckit_meshes.mesh.geometry_spec as gs
 
 from mckit_meshes.particle_kind import ParticleKind
-from mckit_meshes.utils import format_floats, print_n
+from mckit_meshes.utils import format_floats, print_n, raise_error_when_file_exists_strategy
+from mckit_meshes.utils.npz import NpzCodec, save_npz
 
 if TYPE_CHECKING:
     # noinspection PyCompatibility
-    from collections.abc import Generator, Iterable
+    from collections.abc import Generator, Iterable, Mapping, Sequence
+    from pathlib import Path
 
     from numpy.typing import ArrayLike
 
 GeometrySpec = gs.CartesianGeometrySpec | gs.CylinderGeometrySpec
 Point = np.ndarray
 
+_WRITE_CHUNK_ROWS: Final = 2**15
+"""Rows of weights to format at once on writing WWINP file."""
+
+_READ_CHUNK_SIZE: Final = 2**22
+"""Characters to read and parse at once on reading WWINP file."""
+
 
 def ensure_float_arrays(*arrays: ArrayLike) -> Generator[np.ndarray]:
     yield from (np.asarray(x, dtype=float) for x in arrays)
@@ -37,6 +44,15 @@ class MergeSpec(NamedTuple):
 class WgtMesh:
     """Class represent information from MCNP weight window files."""
 
+    STORAGE_MARK = np.int16(5446)
+    """Signature to be stored in the meta entry of stored arrays."""
+
+    STORAGE_FORMAT = np.int16(1)
+    """Identifies version of format of stored arrays."""
+
+    NPY_DIR_SUFFIX = ".wgtmesh"
+    """Suffix of directories with weights stored uncompressed in separate .npy files."""
+
     def __init__(
         self,
         geometry_spec: GeometrySpec,
@@ -301,40 +317,67 @@ class WgtMesh:
             for j in range(_nc[i]):
                 data1 += [_nfm[i][j], _r[i][j + 1], 1]
             data += produce_strings(data1, "{0:#13.5g}")
-        for p in range(_ni):
-            w = self._weights[p]
-            data += produce_strings(self.energies[p][1:], "{0:#13.5g}")  # omit the first zero
-            data1 = [
-                w[e, i, j, k]
-                for e in range(_ne[p])
-                for k in range(_nfz)
-                for j in range(_nfy)
-                for i in range(_nfx)
-            ]
-            data += produce_strings(data1, "{0:#13.5g}")
         stream.write("".join(data))
+        for p in range(_ni):
+            # omit the first zero
+            stream.write("".join(produce_strings(self.energies[p][1:], "{0:#13.5g}")))
+            # the weights go in Fortran order: i is the fastest index
+            write_columns(stream, np.transpose(self._weights[p], (0, 3, 2, 1)), "%#13.5g")
 
-    @dataclass
     class _Reader:
-        data: list[str]
-        index: int = 0
+        """Read whitespace separated numbers from a text stream by chunks."""
+
+        def __init__(self, stream: TextIO) -> None:
+            self._stream = stream
+            self._buffer = np.empty(0, dtype=float)
+            self._position = 0
+            self._count = 0
 
-        def get(self, items: int) -> list[str]:
-            i = self.index
-            self.index += items
-            return self.data[i : self.index]
+        def _read_chunk(self) -> bool:
+            text = self._stream.read(_READ_CHUNK_SIZE)
+            if not text:
+                return False
+            if not text[-1].isspace():
+                text += self._stream.readline()  # don't split the last number
+            self._buffer = parse_floats(text)
+            self._position = 0
+            return True
+
+        def read_into(self, out: np.ndarray) -> None:
+            """Fill a contiguous array with the next numbers."""
+            flat = out.reshape(-1)
+            filled = 0
+            while filled < flat.size:
+                if self._buffer.size <= self._position and not self._read_chunk():
+                    msg = (
+                        f"Unexpected end of WWINP data: {self._count + flat.size - filled}"
+                        f" values expected, {self._count} found"
+                    )
+                    raise ValueError(msg)
+                items = min(flat.size - filled, self._buffer.size - self._position)
+                flat[filled : filled + items] = self._buffer[
+                    self._position : self._position + items
+                ]
+                filled += items
+                self._position += items
+                self._count += items
+
+        def get(self, items: int) -> np.ndarray:
+            result = np.empty(items, dtype=float)
+            self.read_into(result)
+            return result
 
         def get_floats(self, items: int) -> Iterable[float]:
-            return map(float, self.get(items))
+            return self.get(items).tolist()
 
         def get_ints(self, items: int) -> Iterable[int]:
-            return map(int, self.get(items))
+            return self.get(items).astype(int).tolist()
 
         def get_ints_written_as_floats(self, items: int) -> Iterable[int]:
-            return map(int, self.get_floats(items))
+            return self.get_ints(items)
 
         def skip(self, items: int = 1) -> None:
-            self.index += items
+            self.get(items)
 
     # noinspection SpellCheckingInspection
     @classmethod
@@ -356,7 +399,7 @@ class WgtMesh:
             int(s) for s in f.readline().split()[:4]
         )
 
-        reader = WgtMesh._Reader(f.read().split())
+        reader = WgtMesh._Reader(f)
         sizes_of_energy_bins = tuple(reader.get_ints(number_of_particles))
 
         # cells along axes
@@ -396,32 +439,32 @@ class WgtMesh:
         for p in range(number_of_particles):
             nep = sizes_of_energy_bins[p]
             if nep > 0:
-                ebins = np.fromiter(reader.get_floats(nep), dtype=float)
-                ebins = np.insert(ebins, 0, 0.0)
+                ebins = np.insert(reader.get(nep), 0, 0.0)
                 _e.append(ebins)
-                _wp = np.zeros((nep, _nfx, _nfy, _nfz), dtype=float)
-                _wp_data = np.fromiter(reader.get_floats(_wp.size), dtype=float)
-                for e in range(nep):
-                    for k in range(_nfz):
-                        for j in range(_nfy):
-                            for i in range(_nfx):
-                                cell_index = i + _nfx * (j + _nfy * (k + _nfz * e))
-                                _wp[e, i, j, k] = _wp_data[cell_index]
-                _w.append(_wp)
-                assert np.all(
-                    np.transpose(_wp_data.reshape((nep, _nfz, _nfy, _nfx)), (0, 3, 2, 1)) == _wp,
-                )
+                _wp_data = np.empty((nep, _nfz, _nfy, _nfx), dtype=float)
+                reader.read_into(_wp_data)
+                # WWINP is in Fortran order (i is the fastest index), use a view in (e, i, j, k)
+                _w.append(np.transpose(_wp_data, (0, 3, 2, 1)))
         geometry_spec = make_geometry_spec(_x, _y, _z, origin=origin, axs=axs, vec=vec)
         return cls(geometry_spec, _e, _w)
 
     def get_mean_square_distance_weights(self, point) -> WgtMesh:
+        """Create weights proportional to voxel mean square distance from the point.
+
+        The weights are the same for all the energy bins.
+
+        Parameters
+        ----------
+        point
+            ... from where to compute distance
+
+        Returns
+        -------
+        New weights with the same bins, the arrays are read only views
+        broadcasting the spatial weights over the energy bins.
+        """
         w = self._geometry_spec.get_mean_square_distance_weights(point)
-        _w = []
-        for _e in self.energies:
-            le = len(_e)
-            t = w.reshape((1, *self._geometry_spec.bins_shape))
-            t = np.repeat(t, le, axis=0)
-            _w.append(t)
+        _w = [np.broadcast_to(w, (_e.size - 1, *w.shape)) for _e in self.energies]
         return WgtMesh(
             self._geometry_spec,
             self.energies,
@@ -463,46 +506,43 @@ class WgtMesh:
             w_i = \frac{1} {p_i}
 
 
+        The meshes are added one by one to accumulated sums, see :py:class:`WeightsMerger`.
+
+        The zero weight of a mesh in a voxel means no information, so the mesh is excluded
+        from both the sums for this voxel. The result doesn't depend on the meshes order.
+
         Parameters
         ----------
         merge_specs
-            iterable of pairs (WgtMesh, nps), where `nps` is weighting factor
+            pairs (WgtMesh, nps), where `nps` is weighting factor
 
         Returns
         -------
         MergeSpec: merged weights and total nps (or sum of weighting factors)
         """
-        first = merge_specs[0]
-
-        if not isinstance(first, MergeSpec):
-            first = MergeSpec(*first)  # convert tuple to MergeSpec
-
-        if len(merge_specs) > 1:
-            second = WgtMesh.merge(*merge_specs[1:])
-            merged_weights = []
-            assert first.wm.bins_are_equal(second.wm)
-            for i, weights in enumerate(first.wm.weights):
-                nps_first, probabilities_first = prepare_probabilities_and_nps(first.nps, weights)
-                nps_second, probabilities_second = prepare_probabilities_and_nps(
-                    second.nps,
-                    second.wm.weights[i],
-                )
-                nps = np.array(nps_first + nps_second, dtype=float)
-                combined_probabilities = (
-                    nps_first * probabilities_first + nps_second * probabilities_second
-                ) * reciprocal(nps)
-                merged_weights.append(reciprocal(combined_probabilities))
-            wm = first.wm
-            return MergeSpec(
-                cls(
-                    wm.geometry_spec,
-                    wm.energies,
-                    merged_weights,
-                ),
-                first.nps + second.nps,
-            )
+        return cls.merge_all(merge_specs)
+
+    @classmethod
+    def merge_all(cls, merge_specs: Iterable[MergeSpec | tuple[WgtMesh, int]]) -> MergeSpec:
+        """Combine any number of weight meshes in a single pass.
+
+        The same as :py:meth:`merge`, but `merge_specs` can be a lazy iterable,
+        for example, loading the meshes from files. Only the current mesh and
+        the accumulated sums are kept in memory.
+
+        Parameters
+        ----------
+        merge_specs
+            pairs (WgtMesh, nps), where `nps` is weighting factor
 
-        return first
+        Returns
+        -------
+        MergeSpec: merged weights and total nps (or sum of weighting factors)
+        """
+        merger = WeightsMerger()
+        for wm, nps in merge_specs:
+            merger.add(wm, nps)
+        return merger.result()
 
     def reciprocal(self) -> WgtMesh:
         """Invert weights values.
@@ -599,6 +639,338 @@ class WgtMesh:
                 new_weights.append(self.weights[i])
         return WgtMesh(self._geometry_spec, new_energies, new_weights)
 
+    def save_2_npz(
+        self,
+        filename: Path,
+        check_existing_file_strategy=raise_error_when_file_exists_strategy,
+        *,
+        codec: NpzCodec = NpzCodec.zlib,
+        level: int | None = None,
+    ) -> None:
+        """Write this object to numpy npz file.
+
+        Unlike WWINP text format, the weights are stored with full precision.
+
+        Parameters
+        ----------
+        filename
+            file to save to, the suffix ".npz" is appended, if not present
+        check_existing_file_strategy
+            what to do if an output file already exists
+        codec
+            compression method, see :py:meth:`NpzCodec.available`
+        level
+            compression level, default - :py:attr:`NpzCodec.default_level`
+        """
+        if filename.suffix != ".npz":
+            filename = filename.with_suffix(".npz")
+        check_existing_file_strategy(filename)
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        save_npz(filename, self._storage_arrays(), codec=codec, level=level)
+
+    def save_2_npy_dir(
+        self,
+        dirname: Path,
+        check_existing_file_strategy=raise_error_when_file_exists_strategy,
+    ) -> None:
+        """Write this object to a directory of uncompressed .npy files.
+
+        The directory can be loaded with memory mapping, see :py:meth:`load_npy_dir`.
+        The "meta" file is written the last, so an incomplete directory is not loadable.
+
+        Parameters
+        ----------
+        dirname
+            Directory to save to, the suffix :py:attr:`NPY_DIR_SUFFIX` is appended,
+            if not present.
+        check_existing_file_strategy
+            what to do if the output directory already exists
+        """
+        if dirname.suffix != WgtMesh.NPY_DIR_SUFFIX:
+            dirname = dirname.with_suffix(WgtMesh.NPY_DIR_SUFFIX)
+        check_existing_file_strategy(dirname)
+        dirname.mkdir(parents=True, exist_ok=True)
+        for path in dirname.glob("*.npy"):
+            path.unlink()
+        arrays = self._storage_arrays()
+        meta = arrays.pop("meta")
+        for key, value in arrays.items():
+            np.save(dirname / f"{key}.npy", value)
+        np.save(dirname / "meta.npy", meta)
+
+    def save(
+        self,
+        path: Path,
+        check_existing_file_strategy=raise_error_when_file_exists_strategy,
+        *,
+        codec: NpzCodec = NpzCodec.zlib,
+        level: int | None = None,
+    ) -> None:
+        """Save to npz file, .npy directory or WWINP text file depending on `path` suffix.
+
+        The suffix ".npz" selects npz file, :py:attr:`NPY_DIR_SUFFIX` - .npy directory,
+        any other - WWINP file to be used by MCNP.
+
+        Parameters
+        ----------
+        path
+            where to save
+        check_existing_file_strategy
+            what to do if the output already exists
+        codec
+            see :py:meth:`save_2_npz`, used only for npz files
+        level
+            ... the same
+        """
+        if path.suffix == ".npz":
+            self.save_2_npz(path, check_existing_file_strategy, codec=codec, level=level)
+        elif path.suffix == WgtMesh.NPY_DIR_SUFFIX:
+            self.save_2_npy_dir(path, check_existing_file_strategy)
+        else:
+            check_existing_file_strategy(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("w") as stream:
+                self.write(stream)
+
+    @classmethod
+    def load_npz(cls, path: Path) -> WgtMesh:
+        """Load weights from npz file.
+
+        Parameters
+        ----------
+        path
+            file created with :py:meth:`save_2_npz`
+
+        Returns
+        -------
+        The loaded weights.
+        """
+        with np.load(path) as data:
+            return cls._from_storage(data, path)
+
+    @classmethod
+    def load_npy_dir(cls, dirname: Path, mmap_mode: Literal["r", "c"] | None = "c") -> WgtMesh:
+        """Load weights from a directory of .npy files.
+
+        Parameters
+        ----------
+        dirname
+            directory created with :py:meth:`save_2_npy_dir`
+        mmap_mode
+            mode to map the arrays to memory: "r" - read only, "c" - copy on write,
+            None - load to memory
+
+        Returns
+        -------
+        The loaded weights.
+
+        Raises
+        ------
+        ValueError
+            if the directory doesn't contain "meta" entry.
+        """
+        if not (dirname / "meta.npy").is_file():
+            msg = f"No weights metadata found in {dirname}"
+            raise ValueError(msg)
+        arrays = {f.stem: np.load(f, mmap_mode=mmap_mode) for f in dirname.glob("*.npy")}
+        return cls._from_storage(arrays, dirname)
+
+    @classmethod
+    def load(
+        cls,
+        path: Path,
+        mmap_mode: Literal["r", "c"] | None = "c",
+        *,
+        encoding: str | None = None,
+    ) -> WgtMesh:
+        """Load weights from npz file, .npy directory or WWINP text file.
+
+        Parameters
+        ----------
+        path
+            file or directory to load from
+        mmap_mode
+            see :py:meth:`load_npy_dir`, used only for .npy directories
+        encoding
+            encoding of WWINP text file
+
+        Returns
+        -------
+        The loaded weights.
+        """
+        if path.is_dir():
+            return cls.load_npy_dir(path, mmap_mode)
+        if zipfile.is_zipfile(path):
+            return cls.load_npz(path)
+        with path.open(encoding=encoding) as stream:
+            return cls.read(stream)
+
+    @staticmethod
+    def is_binary_storage(path: Path) -> bool:
+        """Check if weights are stored in npz file or .npy directory.
+
+        Parameters
+        ----------
+        path
+            path to check
+
+        Returns
+        -------
+        False, if `path` is to be loaded as WWINP text file.
+        """
+        return path.is_dir() or zipfile.is_zipfile(path)
+
+    def _storage_arrays(self) -> dict[str, np.ndarray]:
+        """Collect arrays to store this object.
+
+        The weights are stored in WWINP order (e, k, j, i).
+
+        Returns
+        -------
+        The arrays by names.
+        """
+        arrays = {
+            "meta": np.array(
+                [WgtMesh.STORAGE_MARK, WgtMesh.STORAGE_FORMAT, self.count_parts],
+                dtype=np.uint32,
+            ),
+            "ibins": self.ibins,
+            "jbins": self.jbins,
+            "kbins": self.kbins,
+        }
+        if self.is_cylinder:
+            arrays["origin"] = np.asarray(self.origin)
+            arrays["axs"] = np.asarray(self.axs)
+            arrays["vec"] = np.asarray(self.vec)
+        for p, (energies, weights) in enumerate(zip(self.energies, self.weights, strict=True)):
+            arrays[f"e{p}"] = energies
+            arrays[f"w{p}"] = np.transpose(weights, (0, 3, 2, 1))
+        return arrays
+
+    @classmethod
+    def _from_storage(cls, data: Mapping[str, np.ndarray], source: object) -> WgtMesh:
+        """Create WgtMesh object from stored arrays.
+
+        Parameters
+        ----------
+        data
+            the arrays by names
+        source
+            where the arrays are loaded from, for error messages
+
+        Returns
+        -------
+        The loaded object.
+
+        Raises
+        ------
+        ValueError
+            if the arrays are not created with :py:meth:`_storage_arrays`.
+        """
+        meta = data["meta"]
+        if meta[0] != WgtMesh.STORAGE_MARK or meta[1] > WgtMesh.STORAGE_FORMAT:
+            msg = f"Incompatible weights storage format in {source}"
+            raise ValueError(msg)
+        parts = range(int(meta[2]))
+        if "axs" in data:
+            geometry_spec = make_geometry_spec(
+                data["ibins"],
+                data["jbins"],
+                data["kbins"],
+                origin=data["origin"],
+                axs=data["axs"],
+                vec=data["vec"],
+            )
+        else:
+            geometry_spec = make_geometry_spec(data["ibins"], data["jbins"], data["kbins"])
+        return cls(
+            geometry_spec,
+            [data[f"e{p}"] for p in parts],
+            [np.transpose(data[f"w{p}"], (0, 3, 2, 1)) for p in parts],
+        )
+
+
+class WeightsMerger:
+    """Accumulate weight meshes to merge them in a single pass.
+
+    For every particle only the sum of probabilities multiplied by weighting factors
+    and the sum of weighting factors over voxels with nonzero weights are kept.
+    The merged weight is the ratio of these sums, see :py:meth:`WgtMesh.merge`.
+    """
+
+    def __init__(self) -> None:
+        self._geometry_spec: GeometrySpec | None = None
+        self._energies: list[np.ndarray] = []
+        self._probabilities: list[np.ndarray] = []
+        self._nps: list[np.ndarray] = []
+        self.nps = 0
+        """The sum of weighting factors of the added meshes."""
+        self.count = 0
+        """The number of added meshes."""
+
+    def add(self, mesh: WgtMesh, nps: float) -> None:
+        """Add weights to the accumulated sums.
+
+        Parameters
+        ----------
+        mesh
+            weights to add
+        nps
+            weighting factor
+
+        Raises
+        ------
+        ValueError
+            if the mesh bins differ from the bins of the meshes added before.
+        """
+        if self._geometry_spec is None:
+            self._geometry_spec = mesh.geometry_spec
+            self._energies = [e.copy() for e in mesh.energies]
+            self._probabilities = [np.zeros_like(w, dtype=float) for w in mesh.weights]
+            self._nps = [np.zeros_like(w, dtype=float) for w in mesh.weights]
+        elif not (
+            self._geometry_spec == mesh.geometry_spec
+            and len(self._energies) == len(mesh.energies)
+            and all(map(np.array_equal, self._energies, mesh.energies))
+        ):
+            msg = "Cannot merge weight meshes with different bins"
+            raise ValueError(msg)
+        for weights, probabilities, nps_sum in zip(
+            mesh.weights, self._probabilities, self._nps, strict=True
+        ):
+            nonzero = weights != 0.0  # zero weights don't affect the merged result
+            np.add(
+                probabilities,
+                np.divide(nps, weights, where=nonzero, out=np.zeros_like(nps_sum)),
+                out=probabilities,
+            )
+            np.add(nps_sum, nps, out=nps_sum, where=nonzero)
+        self.nps += nps
+        self.count += 1
+
+    def result(self) -> MergeSpec:
+        """Compute the merged weights.
+
+        Returns
+        -------
+        MergeSpec: merged weights and total nps (or sum of weighting factors)
+
+        Raises
+        ------
+        ValueError
+            if nothing is added.
+        """
+        if self._geometry_spec is None:
+            msg = "Nothing to merge"
+            raise ValueError(msg)
+        weights = [
+            np.divide(
+                nps_sum, probabilities, where=probabilities != 0.0, out=np.zeros_like(nps_sum)
+            )
+            for probabilities, nps_sum in zip(self._probabilities, self._nps, strict=True)
+        ]
+        return MergeSpec(WgtMesh(self._geometry_spec, self._energies, weights), self.nps)
+
 
 def reciprocal(a: np.ndarray, zero_index: np.ndarray | None = None) -> np.ndarray:
     if a.dtype != float:
@@ -644,7 +1016,68 @@ def produce_strings(stream, format_spec) -> list[str]:
     return data
 
 
-def parse_coordinates(inp: list[str]) -> np.ndarray:
+def write_columns(
+    stream: TextIO,
+    values: np.ndarray,
+    format_spec: str,
+    columns: int = 6,
+) -> None:
+    """Write array values in rows of fixed number of columns.
+
+    The output is the same as from :py:func:`produce_strings`: every row starts
+    with a new line, and there's no new line after the last row.
+    The values are formatted by chunks with a single %-formatting operation per chunk.
+
+    Parameters
+    ----------
+    stream
+        where to write
+    values
+        the values to write in C order
+    format_spec
+        %-format for one value
+    columns
+        number of values in a row
+    """
+    row = "\n" + format_spec * columns
+    size = values.size
+    chunk_size = columns * _WRITE_CHUNK_ROWS
+    for start in range(0, size, chunk_size):
+        stop = min(start + chunk_size, size)
+        full_rows, rest = divmod(stop - start, columns)
+        template = row * full_rows
+        if rest:
+            template += "\n" + format_spec * rest
+        stream.write(template % tuple(values.flat[start:stop].tolist()))
+
+
+def parse_floats(text: str) -> np.ndarray:
+    """Parse whitespace separated floats in bulk.
+
+    Parameters
+    ----------
+    text
+        the numbers to parse
+
+    Returns
+    -------
+    The parsed numbers.
+
+    Raises
+    ------
+    ValueError
+        if the text contains not a number.
+    """
+    if text.isspace():
+        return np.empty(0, dtype=float)  # np.fromstring returns [-1.0] on that
+    try:
+        return np.fromstring(text, dtype=float, sep=" ")
+    except ValueError as ex:
+        msg = "Cannot parse WWINP numeric data"
+        raise ValueError(msg) from ex
+
+
+def parse_coordinates(inp: Sequence[str] | Sequence[float] | np.ndarray) -> np.ndarray:
     def iter_over_coarse_mesh() -> Generator[tuple[float, int], None, None]:
         is_first = True
         i = 0
@@ -0,0 +1,309 @@
+"""Cache of parsed WWINP files.
+
+Parsing a large text WWINP file takes much longer than loading the same
+weights from binary files. The cache stores every parsed file as a directory
+of .npy files, which are loaded as memory maps.
+
+The cache entries are addressed by the content hash of WWINP file, so a copy of
+a file in another location uses the same entry. To avoid hashing on every
+access, the hash is remembered for a source file path and reused while
+the file size and modification time are not changed.
+
+The total size of the entries is limited, the least recently used entries
+are removed on exceeding the limit.
+
+The cache is opt-in: set the environment variable :py:data:`CACHE_DIR_ENV`
+to a cache directory to use it in the command line tools.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Final
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from mckit_meshes.utils import ignore_existing_file_strategy
+from mckit_meshes.wgtmesh import WgtMesh
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+__all__ = [
+    "CACHE_DIR_ENV",
+    "CACHE_MAX_SIZE_ENV",
+    "DEFAULT_MAX_SIZE",
+    "WwinpCache",
+    "load_wwinp",
+]
+
+__LOG = logging.getLogger("mckit_meshes.wwinp_cache")
+
+CACHE_DIR_ENV: Final[str] = "MCKIT_MESHES_WWINP_CACHE"
+"""Environment variable to specify the cache directory."""
+
+CACHE_MAX_SIZE_ENV: Final[str] = "MCKIT_MESHES_WWINP_CACHE_MAX_SIZE"
+"""Environment variable to specify the cache size limit in MiB."""
+
+DEFAULT_MAX_SIZE: Final[int] = 4 * 2**30
+"""Default cache size limit in bytes."""
+
+_ENTRIES: Final[str] = "entries"
+_SOURCES: Final[str] = "sources"
+_META: Final[str] = "meta.npy"
+
+
+@dataclass(frozen=True)
+class WwinpCache:
+    """Directory with parsed WWINP files.
+
+    Attributes
+    ----------
+    path
+        the cache directory
+    max_size
+        the cache size limit in bytes
+    """
+
+    path: Path
+    max_size: int = DEFAULT_MAX_SIZE
+
+    @classmethod
+    def from_env(cls) -> WwinpCache | None:
+        """Create cache specified with the environment variables.
+
+        See :py:data:`CACHE_DIR_ENV` and :py:data:`CACHE_MAX_SIZE_ENV`.
+
+        Returns
+        -------
+        The cache or None, if the cache directory is not specified.
+        """
+        path = os.environ.get(CACHE_DIR_ENV)
+        if not path:
+            return None
+        max_size = os.environ.get(CACHE_MAX_SIZE_ENV)
+        if max_size:
+            return cls(Path(path), int(max_size) * 2**20)
+        return cls(Path(path))
+
+    def load(self, source: Path, encoding: str | None = None) -> WgtMesh:
+        """Load parsed WWINP file from the cache, parse and cache it, if not present.
+
+        Parameters
+        ----------
+        source
+            WWINP file
+        encoding
+            the file encoding
+
+        Returns
+        -------
+        The weights, the arrays are copy on write memory maps.
+        """
+        key = self.content_hash(source)
+        entry = self._entry_path(key)
+        mesh = _try_load_entry(entry, source)
+        if mesh is not None:
+            return mesh
+        with source.open(encoding=encoding) as fid:
+            mesh = WgtMesh.read(fid)
+        try:
+            self.put(key, mesh)
+        except OSError as ex:
+            _warn("Cannot cache %s: %s", source, ex)
+        return mesh
+
+    def contains(self, source: Path) -> bool:
+        """Check if a WWINP file is parsed and stored in the cache.
+
+        Parameters
+        ----------
+        source
+            WWINP file
+
+        Returns
+        -------
+        True, if the file can be loaded without parsing.
+        """
+        return (self._entry_path(self.content_hash(source)) / _META).is_file()
+
+    def content_hash(self, source: Path) -> str:
+        """Compute content hash of a file or reuse the one computed before.
+
+        Parameters
+        ----------
+        source
+            the file
+
+        Returns
+        -------
+        The hash as a hex string.
+        """
+        source = source.resolve()
+        stat = source.stat()
+        record_path = self.path / _SOURCES / f"{_hash_str(str(source))}.json"
+        try:
+            record = json.loads(record_path.read_text(encoding="utf8"))
+        except (OSError, ValueError):
+            record = None
+        if (
+            isinstance(record, dict)
+            and record.get("path") == str(source)
+            and record.get("size") == stat.st_size
+            and record.get("mtime_ns") == stat.st_mtime_ns
+        ):
+            return str(record["hash"])
+        with source.open("rb") as fid:
+            key = hashlib.file_digest(fid, _new_hash).hexdigest()
+        record = {
+            "path": str(source),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": key,
+        }
+        try:
+            record_path.parent.mkdir(parents=True, exist_ok=True)
+            record_path.write_text(json.dumps(record), encoding="utf8")
+        except OSError as ex:
+            _warn("Cannot save WWINP hash for %s: %s", source, ex)
+        return key
+
+    def put(self, key: str, mesh: WgtMesh) -> None:
+        """Store weights in the cache and remove the least recently used entries.
+
+        Parameters
+        ----------
+        key
+            content hash of the source file
+        mesh
+            the weights
+        """
+        entry = self._entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        work = Path(
+            tempfile.mkdtemp(dir=entry.parent, prefix=".tmp-", suffix=WgtMesh.NPY_DIR_SUFFIX)
+        )
+        try:
+            mesh.save_2_npy_dir(work, ignore_existing_file_strategy)
+            if entry.exists():
+                shutil.rmtree(entry)
+            work.rename(entry)
+        finally:
+            if work.exists():
+                shutil.rmtree(work, ignore_errors=True)
+        self.evict(keep=entry)
+
+    def evict(self, keep: Path | None = None) -> None:
+        """Remove the least recently used entries to fit the cache size limit.
+
+        Parameters
+        ----------
+        keep
+            the entry not to remove
+        """
+        entries = sorted(self._iter_entries(), key=lambda e: e[1])  # by access time
+        total = sum(size for _, _, size in entries)
+        for entry, _, size in entries:
+            if total <= self.max_size:
+                break
+            if entry == keep:
+                continue
+            _remove_entry(entry)
+            total -= size
+
+    def clear(self) -> None:
+        """Remove all the cache content."""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    @property
+    def size(self) -> int:
+        """Total size of the entries in bytes."""
+        return sum(size for _, _, size in self._iter_entries())
+
+    def _entry_path(self, key: str) -> Path:
+        return self.path / _ENTRIES / key
+
+    def _iter_entries(self) -> Iterator[tuple[Path, int, int]]:
+        """Iterate over complete entries.
+
+        Yields
+        ------
+        The entry paths, last access times and sizes.
+        """
+        entries = self.path / _ENTRIES
+        if not entries.is_dir():
+            return
+        for entry in entries.iterdir():
+            meta = entry / _META
+            if meta.is_file():
+                size = sum(f.stat().st_size for f in entry.iterdir())
+                yield entry, meta.stat().st_mtime_ns, size
+
+
+def load_wwinp(
+    path: Path,
+    *,
+    encoding: str | None = None,
+    cache: WwinpCache | None = None,
+) -> WgtMesh:
+    """Load WWINP file using the cache, if it's configured.
+
+    The weights stored in binary format, see :py:meth:`WgtMesh.save`,
+    are loaded directly.
+
+    Parameters
+    ----------
+    path
+        WWINP file, npz file or .npy directory
+    encoding
+        the file encoding
+    cache
+        the cache to use, default - :py:meth:`WwinpCache.from_env`
+
+    Returns
+    -------
+    The loaded weights.
+    """
+    if cache is None:
+        cache = WwinpCache.from_env()
+    if cache is None or WgtMesh.is_binary_storage(path):
+        return WgtMesh.load(path, encoding=encoding)
+    return cache.load(path, encoding)
+
+
+def _try_load_entry(entry: Path, source: Path) -> WgtMesh | None:
+    if not (entry / _META).is_file():
+        return None
+    try:
+        mesh = WgtMesh.load_npy_dir(entry, "c")
+    except (OSError, ValueError, KeyError) as ex:
+        __LOG.warning("Ignoring invalid WWINP cache entry %s: %s", entry, ex)
+        return None
+    os.utime(entry / _META)  # mark as recently used
+    __LOG.debug("Loaded %s from WWINP cache", source)
+    return mesh
+
+
+def _remove_entry(entry: Path) -> None:
+    shutil.rmtree(entry, ignore_errors=True)
+    __LOG.debug("Removed WWINP cache entry %s", entry)
+
+
+def _warn(msg: str, *args: object) -> None:
+    # Module level: the logger name would be mangled in the class methods.
+    __LOG.warning(msg, *args)
+
+
+def _new_hash() -> hashlib.blake2b:
+    return hashlib.blake2b(digest_size=20)
+
+
+def _hash_str(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf8"), digest_size=20).hexdigest()
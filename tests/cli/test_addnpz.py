@@ -58,3 +58,17 @@ def test_add_with_override_specified(cyclopts_runner, data):
         ["add", "--override", str(m1), str(m2)],
     )
     assert out.stat().st_size > 0
+
+
+def test_add_npy_directories(cyclopts_runner, data):
+    m1 = data / "1004.npz"
+    m2 = data / "2004.npz"
+    d1, d2 = Path.cwd() / "1004.fmesh", Path.cwd() / "2004.fmesh"
+    FMesh.load_npz(m1).save_2_npy_dir(d1)
+    FMesh.load_npz(m2).save_2_npy_dir(d2)
+    out = Path.cwd() / "sum.fmesh"
+    cyclopts_runner(mckit_meshes, ["add", "-o", str(out), str(d1), str(m2)])
+    assert out.is_dir()
+    mesh_out = FMesh.load(out)
+    assert np.all(FMesh.load_npz(m1).data + FMesh.load_npz(m2).data == mesh_out.data)
+    assert FMesh.load(d1) == FMesh.load_npz(m1), "Shouldn't change the inputs"
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+from typing import Self
+
 import shutil
 import textwrap
 
 from pathlib import Path
 
+import pytest
+
+from numpy.testing import assert_allclose
+
 from mckit_meshes.__main__ import app as mckit_meshes
+from mckit_meshes.cli import merge_weights
+from mckit_meshes.utils import ignore_existing_file_strategy
 from mckit_meshes.wgtmesh import WgtMesh
+from mckit_meshes.wwinp_cache import CACHE_DIR_ENV, WwinpCache
 
 
 def test_help(cyclopts_runner):
@@ -44,3 +53,130 @@ def test_happy_path(cyclopts_runner, weights_in_cylinder_geometry, eliot_file_tr
         with out.open() as fid:
             wgt_mesh = WgtMesh.read(fid)
             assert wgt_mesh.is_cylinder
+
+
+def test_binary_input_and_output(cyclopts_runner, weights_in_cylinder_geometry, eliot_file_trace):
+    with eliot_file_trace("test.log"):
+        with weights_in_cylinder_geometry.open() as fid:
+            weights = WgtMesh.read(fid)
+        _input1 = Path("wwinp1.npz")
+        _input2 = Path("wwinp2" + WgtMesh.NPY_DIR_SUFFIX)
+        weights.save(_input1)
+        weights.save(_input2)
+        merge_spec = Path("merge-spec.txt")
+        merge_spec.write_text(f"{_input1.stem} 1000\n{_input2.stem} 2000\n")
+        out = Path("merged.npz")
+        args = ["merge-weights", "--out", str(out), "--merge-spec", str(merge_spec)]
+        cyclopts_runner(mckit_meshes, [*args, str(_input1), str(_input2)])
+        merged = WgtMesh.load(out)
+        assert merged.bins_are_equal(weights)
+        for actual, expected in zip(merged.weights, weights.weights, strict=True):
+            assert_allclose(actual, expected)
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_parallel_loading(cyclopts_runner, weights_in_cylinder_geometry, eliot_file_trace, jobs):
+    with eliot_file_trace("test.log"):
+        inputs = [f"wwinp{i}" for i in range(3)]
+        for _input in inputs:
+            shutil.copy(weights_in_cylinder_geometry, _input)
+        merge_spec = Path("merge-spec.txt")
+        merge_spec.write_text(
+            "".join(f"{_input} {1000 * (i + 1)}\n" for i, _input in enumerate(inputs))
+        )
+        out = Path("merged.wgtmesh")
+        args = ["merge-weights", "--out", str(out), "--merge-spec", str(merge_spec)]
+        cyclopts_runner(mckit_meshes, [*args, "--jobs", jobs, *inputs])
+        merged = WgtMesh.load(out)
+        with weights_in_cylinder_geometry.open() as fid:
+            weights = WgtMesh.read(fid)
+        for actual, expected in zip(merged.weights, weights.weights, strict=True):
+            assert_allclose(actual, expected)
+        assert Path("merged.merge_spec.csv").read_text().split() == ["merged", "6000"]
+
+
+class _InlinePool:
+    """Runs tasks on getting results and counts outstanding tasks."""
+
+    def __init__(self, processes: int) -> None:
+        self.processes = processes
+        self.submitted: list[Path] = []
+        self.outstanding = self.max_outstanding = 0
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+    def apply_async(self, func, args):
+        self.submitted.append(args[0])
+        self.outstanding += 1
+        self.max_outstanding = max(self.max_outstanding, self.outstanding)
+        pool = self
+
+        class Result:
+            def get(self):
+                pool.outstanding -= 1
+                return func(*args)
+
+        return Result()
+
+
+@pytest.fixture
+def inline_pool(monkeypatch):
+    pools = []
+
+    def create(processes):
+        pools.append(_InlinePool(processes))
+        return pools[-1]
+
+    monkeypatch.setattr(merge_weights, "Pool", create)
+    return pools
+
+
+@pytest.fixture
+def merge_inputs(tmp_path, weights_in_cylinder_geometry):
+    with weights_in_cylinder_geometry.open() as fid:
+        mesh = WgtMesh.read(fid)
+    files = []
+    for i in range(5):
+        path = tmp_path / f"wwinp{i}"
+        shutil.copy(weights_in_cylinder_geometry, path)
+        files.append(path)
+    binary = tmp_path / f"binary{WgtMesh.NPY_DIR_SUFFIX}"
+    mesh.save(binary, ignore_existing_file_strategy)
+    files.insert(2, binary)
+    return mesh, files, {f.stem: 1000 * (i + 1) for i, f in enumerate(files)}
+
+
+def test_loading_keeps_bounded_number_of_tasks(monkeypatch, inline_pool, merge_inputs):
+    monkeypatch.delenv(CACHE_DIR_ENV, raising=False)
+    mesh, files, descriptor = merge_inputs
+    specs = list(merge_weights.create_working_merge_spec(descriptor, files, jobs=2))
+    assert [spec.nps for spec in specs] == [descriptor[f.stem] for f in files]
+    assert all(spec.wm == mesh for spec in specs)
+    (pool,) = inline_pool
+    assert pool.submitted == [f for f in files if f.suffix != WgtMesh.NPY_DIR_SUFFIX]
+    assert pool.max_outstanding == pool.processes == 2
+
+
+def test_loading_with_cache(monkeypatch, tmp_path, inline_pool, merge_inputs):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+    mesh, files, descriptor = merge_inputs
+    monkeypatch.setattr(merge_weights, "_load", _fail_on_parsing(merge_weights._load))
+    specs = list(merge_weights.create_working_merge_spec(descriptor, files, jobs=2))
+    assert all(spec.wm == mesh for spec in specs)
+    list(merge_weights.create_working_merge_spec(descriptor, files, jobs=2))
+    first, second = inline_pool
+    assert first.submitted, "The copies of a file are parsed once"
+    assert not second.submitted, "Should load cached files without the workers"
+
+
+def _fail_on_parsing(load):
+    def _load(path):
+        cache = WwinpCache.from_env()
+        assert WgtMesh.is_binary_storage(path) or cache.contains(path), "Parsed in parent"
+        return load(path)
+
+    return _load
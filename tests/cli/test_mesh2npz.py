@@ -8,7 +8,9 @@ import pytest
 
 from cyclopts import ValidationError
 
+from mckit_meshes import fmesh
 from mckit_meshes.__main__ import app
+from mckit_meshes.cli import mesh2npz
 from mckit_meshes.fmesh import FMesh
 
 
@@ -110,3 +112,45 @@ def test_long_mesh_number(cyclopts_runner, data, eliot_file_trace):
         assert mesh.name == 2035224, (
             "Should correctly save and load the 2035224 mesh id, which requires 32 bit"
         )
+
+
+def test_selected_tallies(cyclopts_runner, data):
+    prefix = Path.cwd()
+    args = ["mesh2npz", "--prefix", str(prefix), "--tally", "2035224", str(data / "2035224.m")]
+    cyclopts_runner(app, args)
+    assert (prefix / "2035224.npz").exists()
+    assert not (prefix / "2035124.npz").exists(), "Should convert only the selected tally"
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_empty_mesh_tally_file(cyclopts_runner, jobs):
+    tmp = Path.cwd()
+    (tmp / "empty.m").touch()
+    prefix = tmp / "npz"
+    args = ["mesh2npz", "--jobs", jobs, "--prefix", str(prefix), "empty.m"]
+    cyclopts_runner(app, args)
+    assert not list(prefix.rglob("*.npz")), "Empty meshtal file should be skipped"
+
+
+def test_parallel(cyclopts_runner, data, monkeypatch):
+    indexed = []
+    index_meshtal = fmesh.index_meshtal
+
+    def _index_meshtal(path, *args, **kwargs):
+        indexed.append(path)
+        return index_meshtal(path, *args, **kwargs)
+
+    monkeypatch.setattr(mesh2npz, "index_meshtal", _index_meshtal)
+    monkeypatch.setattr(fmesh, "index_meshtal", _index_meshtal)
+    tmp = Path.cwd()
+    for name in ["2.m", "2035224.m"]:
+        shutil.copy(data / name, tmp / name)
+    prefix = tmp / "npz"
+    args = ["mesh2npz", "--jobs", "2", "--prefix", str(prefix), "2.m", "2035224.m"]
+    cyclopts_runner(app, args)
+    expected = {"2": [1004, 2004], "2035224": [2035124, 2035224]}
+    for stem, names in expected.items():
+        for name in names:
+            mesh = FMesh.load_npz(prefix / stem / f"{name}.npz")
+            assert mesh.name == name
+    assert len(indexed) == 2, "Every file should be indexed once"
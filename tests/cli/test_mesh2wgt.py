@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pytest
+
 from mckit_meshes.__main__ import app as mckit_meshes
 from mckit_meshes.wgtmesh import WgtMesh
 
@@ -23,3 +25,10 @@ def test_happy_path(cyclopts_runner, data, eliot_file_trace):
         with wgt_path.open() as fid:
             wgt_mesh = WgtMesh.read(fid)
             assert not wgt_mesh.is_cylinder
+
+
+def test_missing_mesh(cyclopts_runner, data):
+    """Check if absent mesh number is reported."""
+    args = ["mesh2wgt", str(data / "2035224.m"), "--mesh", "1"]
+    with pytest.raises(ValueError, match="Mesh 1 is not found"):
+        cyclopts_runner(mckit_meshes, args)
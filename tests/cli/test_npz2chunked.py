@@ -0,0 +1,27 @@
+"""Tests for npz2chunked CLI module."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from mckit_meshes.__main__ import app as mckit_meshes
+from mckit_meshes.fmesh import ChunkedFMesh, FMesh
+
+
+def test_help(cyclopts_runner):
+    out = cyclopts_runner(mckit_meshes, ["npz2chunked", "--help"])
+    assert "Usage: " in out
+
+
+def test_with_prefix(cyclopts_runner, data):
+    source = data / "1004.npz"
+    cyclopts_runner(
+        mckit_meshes,
+        ["npz2chunked", "--prefix", "out", "--chunks", "1", "2", "2", "2", str(source)],
+    )
+    output_path = Path("out", "1004.chunks")
+    assert ChunkedFMesh.is_chunked_dir(output_path)
+    assert ChunkedFMesh(output_path).data.chunks == (1, 2, 2, 2)
+    assert FMesh.load(output_path) == FMesh.load_npz(source)
+    cyclopts_runner(mckit_meshes, ["npz2vtk", "--prefix", "vtk", str(output_path)])
+    assert Path("vtk", "1004.vtr").exists()
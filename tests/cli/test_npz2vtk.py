@@ -82,3 +82,13 @@ def test_glob_inputs(cyclopts_runner, data):
 def test_absent_npz_files(cyclopts_runner, eliot_mem_trace):
     cyclopts_runner(mckit_meshes, ["npz2vtk"])
     eliot_mem_trace.check_message("message_type", "WARNING")
+
+
+def test_npy_directory(cyclopts_runner, data):
+    cyclopts_runner(
+        mckit_meshes, ["mesh2npz", "--uncompressed", "--prefix", "npy", str(data / "1.m")]
+    )
+    source = Path("npy", "1004.fmesh")
+    assert source.is_dir()
+    cyclopts_runner(mckit_meshes, ["npz2vtk", "--prefix", "vtk", str(source)])
+    assert Path("vtk", "1004.vtr").exists()
@@ -149,7 +149,7 @@ def test_surrounds_point_cylinder(point, expected, local):
 def test_eq():
     gc1 = CartesianGeometrySpec(a(1, 2, 3), a(4, 5, 6), a(7, 8, 9))
     gc2 = CartesianGeometrySpec(a(1, 2, 3), a(4, 5, 6), a(7, 8, 9))
-    gc3 = CartesianGeometrySpec(a(1, 2, 3), a(4, 5, 6), a(7, 8, 2))
+    gc3 = CartesianGeometrySpec(a(1, 2, 3), a(4, 5, 6), a(7, 8, 10))
     assert gc1 == gc2
     assert gc1 != gc3
 
@@ -159,6 +159,53 @@ def test_ne_obj() -> None:
     assert cartesian != object()
 
 
+def _normalized(w: np.ndarray) -> np.ndarray:
+    return w * (1024.0 / w.max())
+
+
+def test_cartesian_mean_square_distance_weights():
+    spec = CartesianGeometrySpec(a(-2, 0, 1, 5), a(0, 2, 3), a(-1, 4))
+    point = a(0.5, -1, 2)
+    expected = np.zeros(spec.bins_shape)
+    for (i, j, k), _ in np.ndenumerate(expected):
+        for n, (bins, idx) in enumerate(zip(spec.bins, (i, j, k), strict=True)):
+            lo, hi = bins[idx] - point[n], bins[idx + 1] - point[n]
+            expected[i, j, k] += (lo * lo + lo * hi + hi * hi) / 3.0
+    assert_array_almost_equal(spec.get_mean_square_distance_weights(point), _normalized(expected))
+
+
+def test_cylinder_mean_square_distance_weights():
+    spec = CylinderGeometrySpec(a(0, 1, 3), a(0, 2, 5), a(0, 0.25, 1), origin=a(1, -1, 2))
+    point = a(4, 1, 3)
+    # midpoint quadrature of L^2 over voxel volume, r dr dphi dz
+    n = 40
+    expected = np.zeros(spec.bins_shape)
+    for (i, j, k), _ in np.ndenumerate(expected):
+        r, z, t = (
+            np.linspace(bins[idx], bins[idx + 1], 2 * n + 1)[1::2]
+            for bins, idx in zip((spec.r, spec.z, spec.theta), (i, j, k), strict=True)
+        )
+        r, z, t = np.meshgrid(r, z, 2 * np.pi * t, indexing="ij")
+        x = spec.origin[0] + r * np.cos(t) - point[0]
+        y = spec.origin[1] + r * np.sin(t) - point[1]
+        z = spec.origin[2] + z - point[2]
+        expected[i, j, k] = np.average(x * x + y * y + z * z, weights=r)
+    actual = spec.get_mean_square_distance_weights(point)
+    np.testing.assert_allclose(actual, _normalized(expected), rtol=1e-3)
+
+
+def test_mean_square_distance_weights_for_many_points(cartesian, cylinder):
+    points = a(10, 20, 30, 5, 1, -2, 7, 7, 7).reshape(3, 3)
+    for spec in (cartesian, cylinder):
+        actual = spec.get_mean_square_distance_weights(points)
+        assert actual.shape == (3, *spec.bins_shape)
+        for point, weights in zip(points, actual, strict=True):
+            assert_array_equal(weights, spec.get_mean_square_distance_weights(point))
+        assert_array_equal(
+            spec.get_mean_square_distance_weights(points.reshape(3, 1, 3)), actual[:, np.newaxis]
+        )
+
+
 def test_cylinder_mesh_trivial_constructor():
     origin = np.array([0.0, 0.0, -15.0])
     r = np.array([0.0, 1.0])
@@ -171,6 +218,34 @@ def test_cylinder_mesh_trivial_constructor():
     assert_almost_equal(cc, np.array([[[[-0.4667888, 0.1791876, -14.5]]]], dtype=float))
 
 
+def test_cartesian_calc_cell_centers(cartesian):
+    cc = cartesian.calc_cell_centers()
+    assert cc.shape == (*cartesian.bins_shape, 3)
+    assert_array_equal(cc[1, 0, 1], a(2.5, 4.5, 8.5))
+    assert_array_equal(cc[0, 1, 0], a(1.5, 5.5, 7.5))
+
+
+def test_cylinder_calc_cell_centers(cylinder):
+    cc = cylinder.calc_cell_centers()
+    assert cc.shape == (*cylinder.bins_shape, 3)
+    # r=2.5, z=5.5, theta=0.75 rotation (-Y direction) shifted by origin (1, 0, 0)
+    assert_almost_equal(cc[2, 2, 1], a(1, -2.5, 5.5))
+    assert_almost_equal(cc[0, 0, 0], a(1, 0.5, 2))
+
+
+@pytest.mark.parametrize("slab_size", [1, 2, 3, 10])
+def test_iter_cell_centers(cartesian, cylinder, slab_size):
+    for spec in (cartesian, cylinder):
+        slabs = list(spec.iter_cell_centers(slab_size))
+        assert all(slab.shape[0] <= slab_size for slab in slabs)
+        assert_array_equal(np.concatenate(slabs), spec.calc_cell_centers())
+
+
+def test_iter_cell_centers_with_wrong_slab_size(cartesian):
+    with pytest.raises(ValueError, match="Slab size"):
+        next(cartesian.iter_cell_centers(0))
+
+
 def test_adjust_axs_vec_for_mcnp():
     origin = np.array([0.0, 0.0, -15.0])
     r = np.array([0.0, 30.0])
@@ -251,3 +326,22 @@ def test_print_specification(cartesian, cylinder):
         "        kints=2\n"
     )
     assert actual == expected
+
+
+def test_with_bins(cartesian, cylinder):
+    actual = cartesian.with_bins(a(1, 3), a(4, 6), a(7, 9))
+    assert actual == CartesianGeometrySpec(a(1, 3), a(4, 6), a(7, 9))
+    actual = cylinder.with_bins(a(1, 3), a(4, 6), a(0.75, 1.25))
+    assert isinstance(actual, CylinderGeometrySpec)
+    assert_array_equal(actual.origin, cylinder.origin)
+    assert_array_equal(actual.theta, a(0.75, 1.25))
+    with pytest.raises(ValueError, match="rotations only"):
+        cylinder.with_bins(a(0, 1), a(0, 1), a(0.5, 1.75))
+    with pytest.raises(ValueError, match="non-negative"):
+        cylinder.with_bins(a(-1, 1), a(0, 1), a(0, 1))
+
+
+@pytest.mark.parametrize("kbins", [a(7, 8, 2), a(7, 8, 8), a()])
+def test_cartesian_constructor_with_unsorted_bins(kbins):
+    with pytest.raises(ValueError, match="monotonically increasing"):
+        CartesianGeometrySpec(a(1, 2, 3), a(4, 5, 6), kbins)
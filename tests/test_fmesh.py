@@ -7,10 +7,22 @@ from pathlib import Path
 import numpy as np
 import pytest
 
-from numpy.testing import assert_almost_equal, assert_array_equal
-
-from mckit_meshes.fmesh import FMesh, iter_meshtal, m_2_npz, merge_tallies, read_meshtal
-from mckit_meshes.mesh.geometry_spec import CartesianGeometrySpec
+from numpy.testing import assert_allclose, assert_almost_equal, assert_array_equal
+
+from mckit_meshes.fmesh import (
+    ChunkedFMesh,
+    FMesh,
+    iter_fmesh_headers,
+    iter_meshtal,
+    iter_meshtal_mmap,
+    m_2_npz,
+    m_file_2_npz,
+    merge_tallies,
+    npz_2_chunked,
+    read_meshtal,
+)
+from mckit_meshes.mesh.geometry_spec import CartesianGeometrySpec, CylinderGeometrySpec
+from mckit_meshes.utils.npz import NpzCodec
 from mckit_meshes.utils.testing import a
 
 
@@ -408,6 +420,24 @@ def test_rebin(
     assert_almost_equal(expected_rel_error, new_mesh.totals_err)
 
 
+@pytest.mark.parametrize("jobs", [1, 2, 0])
+def test_rebin_in_threads(jobs):
+    rng = np.random.default_rng(0)
+    shape = (3, 4, 5, 6)
+    mesh = FMesh(
+        14,
+        1,
+        CartesianGeometrySpec(np.linspace(0, 4, 5), np.linspace(-5, 5, 6), np.linspace(10, 16, 7)),
+        a(0, 1, 2, 3),
+        rng.uniform(1, 2, shape),
+        rng.uniform(0.01, 0.1, shape),
+    )
+    new_bins = a(0.5, 2, 4), a(-4, 0, 1, 5), a(10, 11.5, 16)
+    expected = mesh.rebin_single(*new_bins)
+    actual = mesh.rebin(*new_bins, extra_process_threshold=1, jobs=jobs)
+    assert actual == expected
+
+
 @pytest.mark.parametrize(
     "msg,emin,emax,xmin,xmax,ymin,ymax,zmin,zmax,expected_mesh",
     [
@@ -486,3 +516,377 @@ def test_reading_mfile_with_negative(data):
         assert m2.name == 1355214, "reads files with negative values OK"
         assert m1.data[0, 0, 0, 0] == 0.0, "Should convert entries with negative values to zeroes"
         assert m1.errors[0, 0, 0, 0] == 0.0, "Should convert entries with negative values to zeroes"
+
+
+@pytest.mark.parametrize("engine", ["numpy", "python"])
+def test_reading_mfile_with_negative_by_engine(data, engine, caplog):
+    with (data / "with_negatives.m").open() as fid:
+        m1, _ = iter_meshtal(fid, engine=engine)
+    assert m1.data[0, 0, 0, 0] == 0.0
+    assert m1.errors[0, 0, 0, 0] == 0.0
+    assert "Negative values in mesh" in caplog.text
+
+
+@pytest.mark.parametrize("mesh_file", ["1.m", "2.m", "2035224.m", "with_negatives.m"])
+def test_engines_are_equivalent(data, mesh_file):
+    with (data / mesh_file).open() as fid:
+        expected = read_meshtal(fid, engine="python")
+    with (data / mesh_file).open() as fid:
+        actual = read_meshtal(fid, engine="numpy")
+    assert actual == expected
+
+
+def test_numpy_engine_fails_on_truncated_values(tmp_path):
+    tf = tmp_path / "truncated.m"
+    tf.write_text(_TEXT[: _TEXT.index("  8.000e+00    0.500")])
+    with tf.open() as fid, pytest.raises(FMesh.FMeshError, match="Expected 6 lines"):
+        read_meshtal(fid, engine="numpy")
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "  6.000e+00    0.500     2.500     4.500 1.00000e+01 1.00000e-01",
+        "  8.000e+00    1.500     2.500     4.500 6.00000e+01 3.00000e-01",
+    ],
+)
+def test_truncated_value_line_is_rejected(tmp_path, line):
+    tf = tmp_path / "truncated.m"
+    tf.write_text(_TEXT.replace(line, "  5.00000E+00"))
+    with tf.open() as fid, pytest.raises(FMesh.FMeshError, match="Too short line"):
+        read_meshtal(fid, engine="numpy")
+    with pytest.raises(FMesh.FMeshError, match="Too short line"):
+        list(iter_meshtal_mmap(tf))
+
+
+def test_rejected_tallies_are_skipped_without_parsing(data, tmp_path):
+    text = (data / "2.m").read_text()
+    corrupted = text.replace("7.500     7.500     7.500 4.78002E-04", "7.500 garbage", 1)
+    assert corrupted != text
+    tf = tmp_path / "corrupted.m"
+    tf.write_text(corrupted)
+    with tf.open() as fid:
+        actual = read_meshtal(fid, lambda name: name == 2004)
+    with (data / "2.m").open() as fid:
+        expected = read_meshtal(fid, lambda name: name == 2004)
+    assert [m.name for m in actual] == [2004]
+    assert actual == expected
+
+
+@pytest.mark.parametrize("mesh_file", ["1.m", "2.m", "2035224.m", "with_negatives.m"])
+def test_mmap_reader(data, mesh_file):
+    with (data / mesh_file).open() as fid:
+        expected = read_meshtal(fid)
+    actual = list(iter_meshtal_mmap(data / mesh_file))
+    assert actual == expected
+
+
+def test_mmap_reader_on_empty_file(tmp_path):
+    path = tmp_path / "empty.m"
+    path.touch()
+    with path.open() as fid:
+        assert list(iter_meshtal(fid)) == []
+    assert list(iter_meshtal_mmap(path)) == []
+
+
+def test_mmap_reader_fails_on_truncated_values(tmp_path):
+    tf = tmp_path / "truncated.m"
+    tf.write_text(_TEXT[: _TEXT.index("  8.000e+00    0.500")])
+    with pytest.raises(FMesh.FMeshError, match="Expected 6 lines"):
+        list(iter_meshtal_mmap(tf))
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_m_file_2_npz(data, tmp_path, jobs):
+    with (data / "2.m").open() as fid:
+        expected = read_meshtal(fid)
+    assert m_file_2_npz(data / "2.m", tmp_path, jobs=jobs) == 2
+    actual = [FMesh.load_npz(tmp_path / f"{m.name}.npz") for m in expected]
+    assert actual == expected
+
+
+@pytest.mark.parametrize("mesh_file", ["2.m", "with_negatives.m"])
+def test_decoding_by_small_chunks(data, mesh_file, monkeypatch):
+    with (data / mesh_file).open() as fid:
+        expected = read_meshtal(fid, engine="python")
+    monkeypatch.setattr("mckit_meshes.fmesh._DECODE_CHUNK_SIZE", 50)
+    monkeypatch.setattr("mckit_meshes.fmesh._READ_CHUNK_LINES", 7)
+    with (data / mesh_file).open() as fid:
+        assert read_meshtal(fid) == expected
+    assert list(iter_meshtal_mmap(data / mesh_file)) == expected
+
+
+def test_mmap_reader_to_npy_files(tmp_path):
+    tf = tmp_path / "test.m"
+    tf.write_text(_TEXT)
+    with tf.open() as fid:
+        expected = read_meshtal(fid)
+    npy_dir = tmp_path / "npy"
+    npy_dir.mkdir()
+    (actual,) = iter_meshtal_mmap(tf, npy_dir=npy_dir)
+    (expected,) = expected
+    for part in ["data", "errors", "totals", "totals_err"]:
+        path = npy_dir / f"{expected.name}-{part}.npy"
+        assert path.exists()
+        assert_array_equal(getattr(actual, part), getattr(expected, part))
+        assert_array_equal(np.load(path), getattr(expected, part))
+
+
+@pytest.mark.parametrize("mesh_file", ["2.m", "2035224.m"])
+def test_npy_dir(data, tmp_path, mesh_file):
+    with (data / mesh_file).open() as fid:
+        meshes = read_meshtal(fid)
+    for expected in meshes:
+        path = tmp_path / str(expected.name)
+        expected.save_2_npy_dir(path)
+        path = path.with_suffix(FMesh.NPY_DIR_SUFFIX)
+        assert (path / "meta.npy").exists()
+        actual = FMesh.load(path)
+        assert isinstance(actual.data.base, np.memmap), "Should be mapped to memory"
+        assert actual == expected
+        assert FMesh.load_npy_dir(path, mmap_mode=None) == expected
+        with pytest.raises(FileExistsError):
+            expected.save_2_npy_dir(path)
+
+
+def test_npy_dir_without_meta(tmp_path):
+    with pytest.raises(FMesh.FMeshError, match="No FMesh metadata"):
+        FMesh.load_npy_dir(tmp_path)
+
+
+def test_save_selects_format_by_suffix(data, tmp_path):
+    mesh = FMesh.load_npz(data / "1004.npz")
+    mesh.save(tmp_path / "a.fmesh")
+    mesh.save(tmp_path / "b")
+    assert (tmp_path / "a.fmesh").is_dir()
+    assert (tmp_path / "b.npz").is_file()
+    assert FMesh.load(tmp_path / "a.fmesh") == FMesh.load(tmp_path / "b.npz")
+
+
+@pytest.fixture
+def multigroup_mesh():
+    rng = np.random.default_rng(2024)
+    geometry_spec = CartesianGeometrySpec(
+        np.linspace(0, 5, 6), np.linspace(-3, 3, 7), np.linspace(10, 17, 8)
+    )
+    ebins = a(0, 1, 2, 5)
+    shape = (ebins.size - 1, *geometry_spec.bins_shape)
+    return FMesh(
+        1004, 1, geometry_spec, ebins, rng.random(shape), rng.random(shape), comment="test"
+    )
+
+
+@pytest.fixture
+def cylinder_mesh():
+    rng = np.random.default_rng(2025)
+    geometry_spec = CylinderGeometrySpec(
+        a(0, 1, 2, 4), a(0, 1, 3), np.linspace(0, 1, 5), origin=a(1, 2, 3)
+    )
+    ebins = a(0, 1, 2)
+    shape = (ebins.size - 1, *geometry_spec.bins_shape)
+    return FMesh(2004, 1, geometry_spec, ebins, rng.random(shape), rng.random(shape))
+
+
+def volume_integrals(mesh):
+    """Integrate data over volume, Theta in revolutions."""
+    r, z, theta = mesh.ibins, mesh.jbins, mesh.kbins
+    volumes = np.multiply.outer(np.multiply.outer(np.diff(r**2), np.diff(z)), np.diff(theta))
+    return (mesh.data * volumes).sum(axis=(1, 2, 3))
+
+
+@pytest.mark.parametrize(
+    "new_r,new_z,new_theta",
+    [
+        (a(0, 4), a(0, 3), a(0, 1)),
+        (a(0, 1.5, 4), a(0, 2, 3), a(0.375, 0.625, 1.375)),
+        (a(0.5, 3), a(1, 2), a(0.875, 1.125)),
+    ],
+)
+@pytest.mark.parametrize("threads", [False, True])
+def test_rebin_cylinder(cylinder_mesh, new_r, new_z, new_theta, threads):
+    if threads:
+        actual = cylinder_mesh.rebin(new_r, new_z, new_theta, extra_process_threshold=1, jobs=2)
+    else:
+        actual = cylinder_mesh.rebin_single(new_r, new_z, new_theta)
+    assert actual.is_cylinder
+    assert_array_equal(actual.origin, cylinder_mesh.origin)
+    assert_array_equal(actual.kbins, new_theta)
+    assert actual.data.shape == (2, new_r.size - 1, new_z.size - 1, new_theta.size - 1)
+    if new_r[0] == 0 and new_z[0] == 0 and new_theta[-1] - new_theta[0] == 1:
+        assert_allclose(volume_integrals(actual), volume_integrals(cylinder_mesh), rtol=1e-12)
+
+
+def test_rebin_cylinder_averages_over_annular_volumes(cylinder_mesh):
+    actual = cylinder_mesh.rebin_single(a(0, 2), a(0, 1), a(0, 0.25))
+    data = cylinder_mesh.data[:, :2, 0, 0]
+    assert_allclose(actual.data[:, 0, 0, 0], (data[:, 0] * 1 + data[:, 1] * 3) / 4, rtol=1e-12)
+
+
+@pytest.mark.parametrize(
+    "theta_range,expected_theta,expected_indices",
+    [
+        ((0.6, 0.9), a(0.5, 0.75, 1), [2, 3]),
+        ((0.8, 0.1), a(0.75, 1, 1.25), [3, 0]),
+        ((0.6, 1.3), a(0.5, 0.75, 1, 1.25, 1.5), [2, 3, 0, 1]),
+    ],
+)
+def test_shrink_cylinder(tmp_path, cylinder_mesh, theta_range, expected_theta, expected_indices):
+    zmin, zmax = theta_range
+    kwargs = {"xmin": 1.5, "ymax": 0.5, "zmin": zmin, "zmax": zmax, "new_name": 5}
+    actual = cylinder_mesh.shrink(**kwargs)
+    assert actual.is_cylinder
+    assert_array_equal(actual.origin, cylinder_mesh.origin)
+    assert_array_equal(actual.ibins, a(1, 2, 4))
+    assert_array_equal(actual.jbins, a(0, 1))
+    assert_allclose(actual.kbins, expected_theta)
+    key = (slice(None), slice(1, None), slice(0, 1), expected_indices)
+    assert_array_equal(actual.data, cylinder_mesh.data[key])
+    assert_array_equal(actual.errors, cylinder_mesh.errors[key])
+    assert_array_equal(actual.totals, cylinder_mesh.totals[key[1:]])
+    path = tmp_path / "2004.chunks"
+    cylinder_mesh.save_2_chunked(path, chunks=(1, 2, 1, 3))
+    chunked = ChunkedFMesh(path).shrink(**kwargs)
+    for part in ["e", "ibins", "jbins", "kbins", "data", "errors", "totals", "totals_err"]:
+        assert_array_equal(getattr(chunked, part), getattr(actual, part))
+
+
+@pytest.mark.parametrize("rebin_method", ["rebin", "rebin_single"])
+def test_rebin_fails_on_unsorted_bins(multigroup_mesh, rebin_method):
+    with pytest.raises(ValueError, match="monotonically increasing"):
+        getattr(multigroup_mesh, rebin_method)(a(0, 3, 2), a(-3, 3), a(10, 17))
+
+
+def test_chunked_storage(tmp_path, multigroup_mesh):
+    path = tmp_path / "1004.chunks"
+    multigroup_mesh.save_2_chunked(path, chunks=(1, 2, 3, 4))
+    assert ChunkedFMesh.is_chunked_dir(path)
+    actual = ChunkedFMesh(path)
+    assert actual.name == multigroup_mesh.name
+    assert actual.comment == "test"
+    loaded = FMesh.load(path)
+    for part in ["data", "errors", "totals", "totals_err"]:
+        assert_array_equal(getattr(loaded, part), getattr(multigroup_mesh, part))
+    expected_spectrum = multigroup_mesh.get_spectrum(2.5, 0.5, 12.5)
+    for actual_item, expected_item in zip(
+        actual.get_spectrum(2.5, 0.5, 12.5), expected_spectrum, strict=True
+    ):
+        assert_array_equal(actual_item, expected_item)
+    assert actual.get_spectrum(-1, 0, 12) is None
+    for kwargs in [{}, {"x": 1.5}, {"x": [0.5, 4.5], "y": [-2.5, 2.5]}, {"z": [16.5, 10.5]}]:
+        for actual_item, expected_item in zip(
+            actual.get_totals(**kwargs), multigroup_mesh.get_totals(**kwargs), strict=True
+        ):
+            assert_array_equal(actual_item, expected_item)
+    shrunk = actual.shrink(emin=1, xmin=1.5, xmax=3.5, zmax=12.5, new_name=5)
+    expected = multigroup_mesh.shrink(emin=1, xmin=1.5, xmax=3.5, zmax=12.5, new_name=5)
+    assert shrunk.name == 5
+    for part in ["e", "ibins", "jbins", "kbins", "data", "errors", "totals", "totals_err"]:
+        assert_array_equal(getattr(shrunk, part), getattr(expected, part))
+
+
+def test_npz_2_chunked(tmp_path, data):
+    out = npz_2_chunked(data / "1004.npz", tmp_path / "1004")
+    assert out == tmp_path / "1004.chunks"
+    assert FMesh.load(out) == FMesh.load_npz(data / "1004.npz")
+    with pytest.raises(FileExistsError):
+        npz_2_chunked(data / "1004.npz", out)
+
+
+@pytest.mark.parametrize("suffix", [".npz", ".fmesh", ".chunks"])
+def test_lazy_load(tmp_path, multigroup_mesh, suffix):
+    path = tmp_path / f"1004{suffix}"
+    multigroup_mesh.save(path)
+    header = FMesh.load_header(path)
+    assert header.name == 1004
+    assert header.comment == "test"
+    assert header.data_shape == multigroup_mesh.data.shape
+    mesh = FMesh.load(path, lazy=True)
+    assert not mesh.is_loaded
+    assert mesh.is_equal_by_mesh(multigroup_mesh)
+    assert repr(mesh) == repr(multigroup_mesh)
+    assert not mesh.is_loaded, "Geometry and repr should not load values"
+    assert_array_equal(mesh.totals, multigroup_mesh.totals)
+    assert mesh.is_loaded
+    for part in ["data", "errors", "totals_err"]:
+        assert_array_equal(getattr(mesh, part), getattr(multigroup_mesh, part))
+
+
+def test_lazy_load_npz(data):
+    mesh = FMesh.load_npz(data / "1004.npz", lazy=True)
+    assert not mesh.is_loaded
+    assert mesh == FMesh.load_npz(data / "1004.npz")
+    assert mesh.is_loaded
+
+
+def test_load_header_validates_values_shape(tmp_path, multigroup_mesh):
+    path = tmp_path / "bad.npz"
+    arrays = multigroup_mesh._storage_arrays()
+    arrays["data"] = arrays["data"][:, 1:]
+    np.savez(path, **arrays)
+    with pytest.raises(FMesh.FMeshError, match="doesn't correspond to bins"):
+        FMesh.load_header(path)
+    del arrays["data"]
+    np.savez(path, **arrays)
+    with pytest.raises(FMesh.FMeshError, match="Cannot read FMesh"):
+        FMesh.load_header(path)
+
+
+def test_iter_fmesh_headers(tmp_path, data, caplog):
+    invalid = tmp_path / "invalid.npz"
+    invalid.write_text("not a mesh")
+    paths = [data / "1004.npz", invalid, data / "2004.npz"]
+    actual = list(iter_fmesh_headers(paths, skip_invalid=True))
+    assert [(p, h.name) for p, h in actual] == [(paths[0], 1004), (paths[2], 2004)]
+    assert "Skipping" in caplog.text
+    with pytest.raises(FMesh.FMeshError):
+        list(iter_fmesh_headers(paths))
+
+
+@pytest.mark.parametrize("codec", NpzCodec.available())
+@pytest.mark.parametrize("errors_dtype", [np.float64, np.float16])
+def test_save_2_npz_with_codec(tmp_path, multigroup_mesh, codec, errors_dtype):
+    path = tmp_path / "1004.npz"
+    multigroup_mesh.save_2_npz(path, codec=codec, level=1, errors_dtype=errors_dtype)
+    with np.load(path) as stored:
+        meta = stored["meta"]
+        assert stored["errors"].dtype == errors_dtype
+    assert meta[1] == FMesh.NPZ_FORMAT
+    assert meta[4] == codec
+    assert meta[6] == np.dtype(errors_dtype).itemsize
+    actual = FMesh.load_npz(path)
+    assert actual.errors.dtype == np.float64
+    assert_array_equal(actual.data, multigroup_mesh.data)
+    assert_array_equal(actual.totals, multigroup_mesh.totals)
+    for part in ["errors", "totals_err"]:
+        assert_almost_equal(getattr(actual, part), getattr(multigroup_mesh, part), decimal=3)
+
+
+def test_save_2_npz_with_invalid_errors_dtype(tmp_path, multigroup_mesh):
+    with pytest.raises(ValueError, match="only as floats"):
+        multigroup_mesh.save_2_npz(tmp_path / "1004.npz", errors_dtype=np.int32)
+
+
+@pytest.mark.parametrize("chunk_rows", [7, 2**16])
+def test_save_2_mcnp_mesh_with_totals(tmp_path, multigroup_mesh, monkeypatch, chunk_rows):
+    monkeypatch.setattr("mckit_meshes.fmesh._WRITE_CHUNK_ROWS", chunk_rows)
+    path = tmp_path / "multigroup.m"
+    with path.open("w") as fid:
+        fid.write("timestamp\nproblem title\n")
+        fid.write("Number of histories used for normalizing tallies =      1000.00\n\n")
+        multigroup_mesh.save_2_mcnp_mesh(fid)
+    text = path.read_text()
+    assert text.count("   Total   ") == multigroup_mesh.totals.size
+    with path.open() as fid:
+        (actual,) = read_meshtal(fid)
+    assert actual.is_equal_by_mesh(multigroup_mesh)
+    for part in ["data", "errors", "totals", "totals_err"]:
+        assert_allclose(getattr(actual, part), getattr(multigroup_mesh, part), rtol=1e-5)
+    with path.open() as fid:
+        assert read_meshtal(fid) == [actual], "Meshes with totals should be comparable"
+
+
+def test_total_by_energy_with_totals(multigroup_mesh):
+    actual = multigroup_mesh.total_by_energy(new_name=1)
+    assert_array_equal(actual.e, [0, 5])
+    assert_array_equal(actual.data[0], multigroup_mesh.totals)
+    assert_array_equal(actual.errors[0], multigroup_mesh.totals_err)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import os
+import shutil
+
+import pytest
+
+from mckit_meshes.fmesh import read_meshtal
+from mckit_meshes.meshtal_index import MeshtalIndex, index_meshtal, sidecar_path
+
+
+@pytest.fixture
+def meshtal(data, tmp_path):
+    path = tmp_path / "2.m"
+    shutil.copy(data / "2.m", path)
+    return path
+
+
+def test_build(data):
+    path = data / "2.m"
+    index = MeshtalIndex.build(path)
+    assert index.names == [1004, 2004]
+    assert index.nps == 323318560
+    assert 1004 in index
+    assert 3004 not in index
+    content = path.read_bytes()
+    for entry in index:
+        assert content[entry.header :].lstrip().startswith(b"Mesh Tally Number")
+        assert content[entry.bins :].lstrip().startswith(b"Tally bin boundaries:")
+        assert entry.header < entry.bins < entry.values <= entry.totals <= entry.end
+    assert index.tallies[-1].end == len(content)
+    with pytest.raises(KeyError):
+        index[3004]
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.m"
+    path.touch()
+    index = index_meshtal(path)
+    assert index.names == []
+    assert index.nps == 0
+    assert not list(index)
+
+
+@pytest.mark.parametrize("file_name, name", [("1.m", 1004), ("2035224.m", 2035224)])
+def test_read_with_index(data, file_name, name):
+    path = data / file_name
+    index = MeshtalIndex.build(path)
+    with path.open() as fid:
+        expected = read_meshtal(fid)
+    with path.open() as fid:
+        actual = read_meshtal(fid, index=index)
+    assert actual == expected
+    with path.open() as fid:
+        selected = read_meshtal(fid, lambda n: n == name, index=index)
+    assert [m.name for m in selected] == [name]
+    assert selected[0] == next(m for m in expected if m.name == name)
+
+
+def test_sidecar_is_saved_and_reused(meshtal):
+    sidecar = sidecar_path(meshtal)
+    index_meshtal(meshtal)
+    assert not sidecar.exists(), "Shouldn't save sidecar for small files by default"
+    index = index_meshtal(meshtal, sidecar_min_size=0)
+    assert sidecar.exists()
+    assert MeshtalIndex.load(sidecar) == index
+    assert index_meshtal(meshtal, sidecar_min_size=0) == index
+
+
+def test_outdated_sidecar_is_rebuilt(meshtal):
+    sidecar = sidecar_path(meshtal)
+    index = index_meshtal(meshtal, sidecar_min_size=0)
+    stat = meshtal.stat()
+    os.utime(meshtal, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert not index.is_valid_for(meshtal)
+    actual = index_meshtal(meshtal, sidecar_min_size=0)
+    assert actual.mtime_ns == meshtal.stat().st_mtime_ns
+    assert actual.tallies == index.tallies
+    assert MeshtalIndex.load(sidecar) == actual
+
+
+def test_invalid_sidecar_is_ignored(meshtal):
+    sidecar = sidecar_path(meshtal)
+    sidecar.write_text('{"format": 0}', encoding="utf8")
+    with pytest.raises(ValueError, match="Unsupported meshtal index format"):
+        MeshtalIndex.load(sidecar)
+    index = index_meshtal(meshtal)
+    assert index.names == [1004, 2004]
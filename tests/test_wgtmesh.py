@@ -12,7 +12,12 @@ from operator import mul
 import numpy as np
 import pytest
 
-from numpy.testing import assert_almost_equal, assert_array_almost_equal, assert_array_equal
+from numpy.testing import (
+    assert_allclose,
+    assert_almost_equal,
+    assert_array_almost_equal,
+    assert_array_equal,
+)
 
 from mckit_meshes import wgtmesh
 from mckit_meshes.utils.testing import a
@@ -126,6 +131,87 @@ def test_read_write(tmpdir, wwinp):
     assert wwinp == m2
 
 
+@pytest.mark.parametrize("suffix", [".npz", WgtMesh.NPY_DIR_SUFFIX, ".wwinp"])
+def test_save_load(tmp_path, wwinp, suffix):
+    path = tmp_path / f"weights{suffix}"
+    wwinp.save(path)
+    actual = WgtMesh.load(path)
+    assert actual == wwinp
+    assert actual.is_cylinder
+    assert_array_equal(actual.axs, wwinp.axs)
+    assert_array_equal(actual.vec, wwinp.vec)
+    assert WgtMesh.is_binary_storage(path) == (suffix != ".wwinp")
+
+
+@pytest.mark.parametrize("suffix", [".npz", WgtMesh.NPY_DIR_SUFFIX])
+def test_save_load_keeps_full_precision(tmp_path, weights_eijk, suffix):
+    expected = weights_eijk(1.0 / 3.0)
+    path = tmp_path / f"weights{suffix}"
+    expected.save(path)
+    actual = WgtMesh.load(path)
+    for actual_weights, expected_weights in zip(actual.weights, expected.weights, strict=True):
+        assert_array_equal(actual_weights, expected_weights)
+    assert not actual.is_cylinder
+
+
+def test_save_fails_on_existing_file(tmp_path, wwinp):
+    path = tmp_path / "weights.npz"
+    wwinp.save(path)
+    with pytest.raises(FileExistsError):
+        wwinp.save(path)
+
+
+def test_loaded_npy_dir_is_copy_on_write(tmp_path, wwinp):
+    path = tmp_path / f"weights{WgtMesh.NPY_DIR_SUFFIX}"
+    wwinp.save_2_npy_dir(path)
+    WgtMesh.load(path).weights[0][...] = 1.0
+    assert WgtMesh.load(path) == wwinp
+
+
+def test_load_npy_dir_fails_without_meta(tmp_path):
+    with pytest.raises(ValueError, match="No weights metadata"):
+        WgtMesh.load_npy_dir(tmp_path)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100])
+def test_read_by_small_chunks(data, wwinp, monkeypatch, chunk_size):
+    monkeypatch.setattr("mckit_meshes.wgtmesh._READ_CHUNK_SIZE", chunk_size)
+    with (data / "wwinp").open() as stream:
+        assert WgtMesh.read(stream) == wwinp
+
+
+def test_read_fails_on_truncated_weights(data):
+    text = (data / "wwinp").read_text()
+    with pytest.raises(ValueError, match="Unexpected end of WWINP data"):
+        WgtMesh.read(io.StringIO(text[: len(text) // 2].rsplit(maxsplit=1)[0]))
+
+
+def test_read_fails_on_invalid_number(data):
+    text = (data / "wwinp").read_text()
+    with pytest.raises(ValueError, match="Cannot parse WWINP"):
+        WgtMesh.read(io.StringIO(text.replace("0.0000", "x.0000", 1)))
+
+
+@pytest.mark.parametrize("size", [0, 1, 6, 7, 23, 24])
+@pytest.mark.parametrize("chunk_rows", [1, 2, 2**15])
+def test_write_columns(monkeypatch, size, chunk_rows):
+    monkeypatch.setattr("mckit_meshes.wgtmesh._WRITE_CHUNK_ROWS", chunk_rows)
+    values = np.geomspace(1e-30, 1e30, size).reshape(1, -1)
+    values[:, ::5] = 0.0
+    stream = io.StringIO()
+    wgtmesh.write_columns(stream, values, "%#13.5g")
+    expected = "".join(wgtmesh.produce_strings(values.ravel(), "{0:#13.5g}"))
+    assert stream.getvalue() == expected
+
+
+def test_write_weights_in_fortran_order(weights_eijk):
+    m = weights_eijk(1.0)
+    stream = io.StringIO()
+    m.write(stream)
+    stream.seek(0)
+    assert WgtMesh.read(stream) == m
+
+
 @pytest.mark.parametrize(
     "text,expected",
     [
@@ -213,6 +299,17 @@ def test_prepare_probabilities_and_nps(nps: int, weights: np.ndarray, expected:
         assert_array_equal(_a, _b)
 
 
+def test_get_mean_square_distance_weights(wwinp):
+    point = np.array([800.0, 100.0, 0.0])
+    actual = wwinp.get_mean_square_distance_weights(point)
+    assert actual.bins_are_equal(wwinp)
+    expected = wwinp.geometry_spec.get_mean_square_distance_weights(point)
+    for weights, energies in zip(actual.weights, wwinp.energies, strict=True):
+        assert weights.shape == (energies.size - 1, *expected.shape)
+        assert weights.strides[0] == 0, "Should be a view"
+        assert_array_equal(weights[-1], expected)
+
+
 def test_merge(weights_eijk) -> None:
     am = weights_eijk(0.0)
 
@@ -231,6 +328,52 @@ def test_merge(weights_eijk) -> None:
     assert actual.nps == 12
 
 
+def test_merge_all_from_generator(weights_eijk) -> None:
+    factors = [1, 2, 3, 4, 5]
+    offsets = [0.5, 1.0, 10.0, 100.0, 1000.0]
+
+    def load():
+        for offset, nps in zip(offsets, factors, strict=True):
+            yield weights_eijk(offset), nps
+
+    actual = WgtMesh.merge_all(load())
+    assert actual.nps == sum(factors)
+    probabilities = sum(
+        nps / weights_eijk(offset).weights[0] for offset, nps in zip(offsets, factors, strict=True)
+    )
+    assert_array_almost_equal(actual.wm.weights[0], sum(factors) / probabilities)
+
+
+def test_merge_ignores_zero_weights(weights_ijk) -> None:
+    am = weights_ijk(1.0)
+    zero_voxel = (0, 0, 0, 0)
+    bm = weights_ijk(3.0)
+    bm.weights[0][zero_voxel] = 0.0
+    actual = WgtMesh.merge((am, 1), (bm, 1))
+    assert actual.wm.weights[0][zero_voxel] == am.weights[0][zero_voxel]
+    actual = WgtMesh.merge((bm, 1), (bm, 1))
+    assert actual.wm.weights[0][zero_voxel] == 0.0
+
+
+@pytest.mark.parametrize("order", [(0, 1, 2), (1, 2, 0), (2, 0, 1)])
+def test_merge_three_meshes_with_zero_weights(weights_ijk, order) -> None:
+    meshes = [weights_ijk(1.0), weights_ijk(0.0), weights_ijk(2.0)]
+    actual = WgtMesh.merge(*((meshes[i], 1) for i in order))
+    # nps sum 2 over the nonzero voxels divided by probabilities sum 1/1 + 1/2
+    assert_allclose(actual.wm.weights[0], 4.0 / 3.0, rtol=1e-15)
+    assert actual.nps == 3
+
+
+def test_merge_fails_on_different_bins(weights_ijk, weights_eijk) -> None:
+    with pytest.raises(ValueError, match="different bins"):
+        WgtMesh.merge((weights_ijk(1.0), 1), (weights_eijk(1.0), 1))
+
+
+def test_merge_nothing() -> None:
+    with pytest.raises(ValueError, match="Nothing to merge"):
+        WgtMesh.merge_all([])
+
+
 def my_assert_array_equal(actual, expected):
     for i, (ai, ei) in enumerate(zip(actual, expected, strict=False)):
         with suppress(ValueError):
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from numpy.testing import assert_allclose
+
+from mckit_meshes.wgtmesh import WgtMesh, make_geometry_spec
+from mckit_meshes.wwinp_cache import CACHE_DIR_ENV, CACHE_MAX_SIZE_ENV, WwinpCache, load_wwinp
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def write_doubled(mesh: WgtMesh, path: Path) -> None:
+    doubled = WgtMesh(mesh._geometry_spec, mesh.energies, [2.0 * w for w in mesh.weights])
+    with path.open("w") as stream:
+        doubled.write(stream)
+
+
+@pytest.fixture
+def wwinp(data) -> WgtMesh:
+    with (data / "wwinp").open() as stream:
+        return WgtMesh.read(stream)
+
+
+@pytest.fixture
+def source(data, tmp_path):
+    path = tmp_path / "wwinp"
+    shutil.copy(data / "wwinp", path)
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path) -> WwinpCache:
+    return WwinpCache(tmp_path / "cache")
+
+
+@pytest.fixture
+def count_reads(monkeypatch):
+    reads = []
+    read = WgtMesh.read
+
+    def _read(stream):
+        reads.append(stream)
+        return read(stream)
+
+    monkeypatch.setattr(WgtMesh, "read", _read)
+    return reads
+
+
+def test_load_from_cache(cache, source, wwinp, count_reads):
+    assert cache.load(source) == wwinp
+    assert len(count_reads) == 1
+    actual = cache.load(source)
+    assert len(count_reads) == 1, "Should not parse the cached file"
+    assert actual == wwinp
+    assert cache.size > 0
+
+
+def test_cached_weights_are_writable(cache, source, wwinp):
+    cache.load(source)
+    actual = cache.load(source)
+    actual.weights[0][...] = 1.0
+    assert cache.load(source) == wwinp, "Cache entry should not be changed"
+
+
+def test_modified_file_is_parsed_again(cache, source, wwinp, count_reads):
+    cache.load(source)
+    write_doubled(wwinp, source)
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    actual = cache.load(source)
+    assert len(count_reads) == 2
+    assert_allclose(actual.weights[0], 2.0 * wwinp.weights[0], rtol=1e-4)
+
+
+def test_copy_uses_the_same_entry(cache, source, tmp_path, count_reads):
+    cache.load(source)
+    copy = tmp_path / "copy"
+    shutil.copy(source, copy)
+    cache.load(copy)
+    assert len(count_reads) == 1
+
+
+def test_cylinder_mesh(cache, tmp_path):
+    ibins = np.array([0.0, 1.0, 2.0])
+    jbins = np.array([0.0, 3.0])
+    kbins = np.array([0.0, 0.5, 1.0])
+    gs = make_geometry_spec(
+        ibins, jbins, kbins, origin=np.zeros(3), axs=np.array([0, 0, 1]), vec=np.array([1, 0, 0])
+    )
+    w = np.arange(1, 5, dtype=float).reshape(1, 2, 1, 2)
+    expected = WgtMesh(gs, [np.array([0.0, 20.0])], [w])
+    path = tmp_path / "wwinp-cyl"
+    with path.open("w") as stream:
+        expected.write(stream)
+    cache.load(path)
+    assert cache.load(path) == expected
+
+
+def test_eviction(tmp_path, source, wwinp, count_reads):
+    cache = WwinpCache(tmp_path / "cache", max_size=1)
+    cache.load(source)
+    assert cache.size > 0, "The last entry is kept even if it exceeds the limit"
+    other = tmp_path / "other"
+    write_doubled(wwinp, other)
+    cache.load(other)
+    cache.load(other)
+    assert len(count_reads) == 2
+    cache.load(source)
+    assert len(count_reads) == 3, "The least recently used entry should be removed"
+
+
+def test_invalid_entry_is_ignored(cache, source, wwinp, count_reads):
+    cache.load(source)
+    entry = cache._entry_path(cache.content_hash(source))
+    (entry / "w0.npy").write_bytes(b"garbage")
+    assert cache.load(source) == wwinp
+    assert len(count_reads) == 2
+
+
+def test_load_wwinp_without_cache(monkeypatch, source, wwinp):
+    monkeypatch.delenv(CACHE_DIR_ENV, raising=False)
+    assert WwinpCache.from_env() is None
+    assert load_wwinp(source) == wwinp
+
+
+def test_load_wwinp_with_cache_from_env(monkeypatch, tmp_path, source, wwinp, count_reads):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+    monkeypatch.setenv(CACHE_MAX_SIZE_ENV, "16")
+    cache = WwinpCache.from_env()
+    assert cache == WwinpCache(tmp_path / "cache", 16 * 2**20)
+    assert load_wwinp(source) == wwinp
+    assert load_wwinp(source) == wwinp
+    assert len(count_reads) == 1
+    cache.clear()
+    assert cache.size == 0
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from numpy.testing import assert_array_equal
+
+from mckit_meshes.utils.chunked_array import ChunkedArray
+
+
+@pytest.fixture
+def array():
+    return np.arange(5 * 7 * 4, dtype=float).reshape(5, 7, 4)
+
+
+@pytest.fixture
+def chunked(tmp_path, array):
+    return ChunkedArray.create(tmp_path / "a", array, (2, 3, 4))
+
+
+def test_create_and_open(tmp_path, chunked, array):
+    assert chunked.shape == array.shape
+    assert chunked.chunks == (2, 3, 4)
+    assert len(list(chunked.iter_chunk_indexes())) == 3 * 3 * 1
+    opened = ChunkedArray.open(tmp_path / "a")
+    assert opened == chunked
+    assert_array_equal(np.asarray(opened), array)
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        ...,
+        0,
+        -1,
+        (slice(1, 4), 2),
+        (slice(None, None, -2), slice(1, 6, 2), 3),
+        (..., 1),
+        (1, 6, 3),
+    ],
+)
+def test_basic_indexing(chunked, array, key):
+    assert_array_equal(chunked[key], array[key])
+
+
+def test_orthogonal_indexing(chunked, array):
+    actual = chunked[[4, 0, 4], :, [True, False, True, False]]
+    expected = array[np.ix_([4, 0, 4], np.arange(7), [0, 2])]
+    assert_array_equal(actual, expected)
+    assert_array_equal(chunked[[1, 3], 2, [0, 3]], array[np.ix_([1, 3], [2], [0, 3])][:, 0, :])
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        (np.array([0, 4]), np.array([1, 6]), slice(None)),
+        (slice(1, 3), np.array([[0], [6]]), np.array([1, 3])),
+        (2, slice(None, None, -1), 0),
+        (np.array(-1), slice(2, 5), np.array([3, 0, 3])),
+    ],
+)
+def test_select_as_numpy(chunked, array, key):
+    assert_array_equal(chunked.select(key), array[key])
+
+
+def test_only_touched_chunks_are_read(chunked, mocker):
+    spy = mocker.spy(ChunkedArray, "read_chunk")
+    chunked[0, 0:3, :]
+    assert spy.call_count == 1
+
+
+def test_index_errors(chunked):
+    with pytest.raises(IndexError):
+        chunked[5]
+    with pytest.raises(IndexError):
+        chunked[0, 0, 0, 0]
+
+
+def test_invalid_chunks(tmp_path, array):
+    with pytest.raises(ValueError, match="Invalid chunks"):
+        ChunkedArray.create(tmp_path / "b", array, (1, 1))
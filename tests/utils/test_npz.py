@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import zipfile
+
+import numpy as np
+import pytest
+
+from numpy.testing import assert_array_equal
+
+from mckit_meshes.utils.npz import NpzCodec, save_npz
+
+
+@pytest.mark.parametrize("codec", NpzCodec.available())
+def test_save_npz(tmp_path, codec):
+    path = tmp_path / "a.npz"
+    arrays = {"a": np.arange(1000.0), "b": np.array("comment")}
+    save_npz(path, arrays, codec=codec)
+    with zipfile.ZipFile(path) as zf:
+        assert {info.compress_type for info in zf.infolist()} == {codec.zip_compression}
+    with np.load(path) as loaded:
+        assert sorted(loaded.files) == ["a", "b"]
+        assert_array_equal(loaded["a"], arrays["a"])
+        assert loaded["b"].item() == "comment"
+
+
+def test_save_npz_without_pickles(tmp_path):
+    with pytest.raises(ValueError, match="pickle"):
+        save_npz(tmp_path / "a.npz", {"a": None})
+
+
+@pytest.mark.skipif(NpzCodec.zstd.is_available, reason="zstd is available")
+def test_unavailable_codec(tmp_path):
+    with pytest.raises(ValueError, match="zstd is not available"):
+        save_npz(tmp_path / "a.npz", {"a": np.zeros(1)}, codec=NpzCodec.zstd)
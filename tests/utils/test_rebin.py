@@ -5,10 +5,14 @@ import sys
 import numpy as np
 import pytest
 
-from numpy.testing import assert_array_equal
+from numpy.testing import assert_allclose, assert_array_equal
 
+from mckit_meshes.utils import rebin
 from mckit_meshes.utils.rebin import (
+    RebinPlan,
     interpolate,
+    is_monotonically_increasing,
+    overlap_matrix,
     rebin_1d,
     rebin_nd,
     rebin_spec_composer,
@@ -430,5 +434,135 @@ def test_rebin_nd(data, rebin_spec, rebinned_data):
     ],
 )
 def test_rebin_nd_in_external_process(data, rebin_spec, rebinned_data):
-    actual_rebinned_data = rebin_nd(data, rebin_spec, external_process_threshold=1)
+    with pytest.warns(DeprecationWarning, match="external_process_threshold"):
+        actual_rebinned_data = rebin_nd(data, rebin_spec, external_process_threshold=1)
     assert_array_equal(rebinned_data, actual_rebinned_data)
+
+
+def test_overlap_matrix():
+    matrix = overlap_matrix(a(0, 1, 2, 4), a(0.5, 1, 3, 4))
+    assert matrix.size == 3
+    assert matrix.new_size == 3
+    assert_array_equal(matrix.indptr, [0, 1, 3, 4])
+    assert_array_equal(matrix.indices, [0, 1, 2, 2])
+    assert_array_equal(matrix.weights, [1.0, 0.5, 0.5, 1.0])
+    grouped = overlap_matrix(a(0, 1, 2, 4), a(0.5, 1, 3, 4), grouped=True)
+    assert_array_equal(grouped.weights, [0.5, 1.0, 0.5, 0.5])
+
+
+@pytest.mark.parametrize("grouped", [False, True])
+@pytest.mark.parametrize("axis", [0, 1, 2])
+@pytest.mark.parametrize("block_items", [1, 50, 2**22])
+def test_overlap_matrix_apply_is_equivalent_to_rebin_1d(monkeypatch, grouped, axis, block_items):
+    monkeypatch.setattr(rebin, "_BLOCK_ITEMS", block_items)
+    rng = np.random.default_rng(axis)
+    data = rng.uniform(size=(4, 5, 6))
+    bins = np.linspace(0.0, 10.0, data.shape[axis] + 1)
+    new_bins = np.sort(np.r_[rng.uniform(0.0, 10.0, 7), 0.5, bins[-1]])
+    expected = rebin_1d(data, bins, new_bins, axis, grouped=grouped)
+    actual = overlap_matrix(bins, new_bins, grouped=grouped).apply(data, axis)
+    assert_allclose(actual, expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize(
+    "bins,new_bins,msg",
+    [
+        (a(0, 1, 2), a(-1, 1), "extrapolation"),
+        (a(0, 1, 2), a(1, 3), "extrapolation"),
+        (a(0, 2, 1, 2), a(0, 1), "monotonically"),
+    ],
+)
+def test_overlap_matrix_fails_on_wrong_bins(bins, new_bins, msg):
+    with pytest.raises(ValueError, match=msg):
+        overlap_matrix(bins, new_bins)
+
+
+def test_overlap_matrix_apply_fails_on_wrong_shape():
+    with pytest.raises(ValueError, match="doesn't match"):
+        overlap_matrix(a(0, 1, 2), a(0, 2)).apply(np.ones((3, 3)), axis=1)
+
+
+@pytest.mark.parametrize("grouped", [False, True, [True, False]])
+def test_rebin_plan(grouped):
+    bins = [np.linspace(0.0, 4.0, 5), np.linspace(0.0, 3.0, 4)]
+    new_bins = [a(0.5, 1.5, 4.0), a(0.0, 0.2, 2.9)]
+    plan = RebinPlan(bins, new_bins, grouped_flags=grouped)
+    assert plan.ndim == 2
+    assert plan.new_shape == (2, 2)
+    data = np.arange(2 * 4 * 3, dtype=float).reshape(2, 4, 3)
+    expected = rebin_nd(data, rebin_spec_composer(bins, new_bins, [1, 2], grouped))
+    assert_array_equal(plan.apply(data), expected)
+    assert_array_equal(plan.apply(data[0]), expected[0])
+    transposed = np.transpose(data, (1, 0, 2))
+    assert_array_equal(plan.apply(transposed, axes=[0, 2]), np.transpose(expected, (1, 0, 2)))
+
+
+def test_rebin_plan_cached():
+    bins = [np.linspace(0.0, 4.0, 5)]
+    plan = RebinPlan.cached(bins, [a(0, 2, 4)])
+    assert RebinPlan.cached([np.linspace(0.0, 4.0, 5)], [a(0, 2, 4)], grouped_flags=False) is plan
+    assert RebinPlan.cached(bins, [a(0, 2, 4)], grouped_flags=True) is not plan
+    assert RebinPlan.cached(bins, [a(0, 1, 4)]) is not plan
+    assert_array_equal(plan.apply(a(1, 3, 5, 7)), a(2, 6))
+
+
+def test_overlap_matrix_on_periodic_axis():
+    bins = a(0, 0.25, 0.5, 0.75, 1)
+    matrix = overlap_matrix(bins, a(0.875, 1.125, 1.25), period=1.0)
+    assert matrix.size == 4
+    assert_array_equal(matrix.indices, [3, 0, 0])
+    assert_array_equal(matrix.weights, [0.5, 0.5, 1.0])
+    data = a(1, 2, 3, 4)
+    assert_array_equal(matrix.apply(data), a(2.5, 1))
+    shifted = overlap_matrix(bins, a(-0.125, 0.125, 0.25), period=1.0)
+    assert_array_equal(shifted.apply(data), a(2.5, 1))
+
+
+@pytest.mark.parametrize(
+    "bins,new_bins,msg",
+    [
+        (a(0, 0.5, 0.75), a(0.5, 1), "exactly one period"),
+        (a(0, 0.5, 1), a(0.5, 1, 1.75), "more than period"),
+    ],
+)
+def test_overlap_matrix_on_periodic_axis_fails_on_wrong_bins(bins, new_bins, msg):
+    with pytest.raises(ValueError, match=msg):
+        overlap_matrix(bins, new_bins, period=1.0)
+
+
+def test_rebin_plan_with_periods():
+    bins = [a(0, 1, 2), a(0, 0.5, 1)]
+    plan = RebinPlan(bins, [a(0, 2), a(0.75, 1.25)], periods=[None, 1.0])
+    assert_array_equal(plan.apply(a(1, 2, 3, 4).reshape(2, 2)), [[2.5]])
+    assert RebinPlan.cached(bins, [a(0, 2), a(0.75, 1.25)], periods=[None, 1.0]).new_shape == (1, 1)
+
+
+@pytest.mark.parametrize(
+    "left,right,expected_bins,expected_indices",
+    [
+        (0.6, 0.9, a(0.5, 0.75, 1), [2, 3]),
+        (0.9, 0.1, a(0.75, 1, 1.25), [3, 0]),
+        (0.9, 1.3, a(0.75, 1, 1.25, 1.5), [3, 0, 1]),
+        (1.6, 2.3, a(0.5, 0.75, 1, 1.25, 1.5), [2, 3, 0, 1]),
+        (0.6, None, a(0.5, 0.75, 1), [2, 3]),
+    ],
+)
+def test_shrink_1d_on_periodic_axis(left, right, expected_bins, expected_indices):
+    bins = a(0, 0.25, 0.5, 0.75, 1)
+    data = np.arange(8).reshape(2, 4)
+    actual_bins, actual_data = shrink_1d(data, bins, left, right, axis=1, period=1.0)
+    assert_allclose(actual_bins, expected_bins)
+    assert_array_equal(actual_data, data[:, expected_indices])
+
+
+def test_shrink_1d_on_periodic_axis_fails_on_range_over_period():
+    with pytest.raises(ValueError, match="more than period"):
+        shrink_1d(np.arange(2), a(0, 0.5, 1), 0.25, 1.2, period=1.0)
+
+
+@pytest.mark.parametrize(
+    "bins,expected",
+    [(a(), False), (a(1), True), (a(1, 2, 4), True), (a(1, 2, 2), False), (a(2, 1), False)],
+)
+def test_is_monotonically_increasing(bins, expected):
+    assert is_monotonically_increasing(bins) is expected